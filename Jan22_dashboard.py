@@ -1,36 +1,59 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
 import plotly.express as px
-import glob
 
-# Load the dataset
-df = pd.read_csv("clean_withSMP500_withForestFunds_Jan22.csv")
+from correlation import cluster_order, load_portfolio_correlation, load_portfolio_overlap
+from holdings import load_holdings_index
+from leaderboard import leaderboard_html, load_rank_matrix, rank_history
+from portfolios import CURRENCY_SYMBOLS
+from price_store import available_currencies, load_portfolio_values_in
+from quotes import QUOTE_SOURCES, quote_service, start_quote_service, stop_quote_service
+from sql_store import query
+from table_view import render_paginated_table
+from warmup import record_render, warm_up
 
-# Convert the 'Day' column to datetime
-df['Day'] = pd.to_datetime(df['Day'])
+# Preload the shared data cache and precomputed metrics (once per worker process)
+warm_up()
 
 # Streamlit page configuration
 st.set_page_config(page_title="Portfolio Performance Dashboard", layout="wide")
 
+# Load the dataset (parsed once and shared between reruns) in the display currency
+currency = st.sidebar.selectbox("Display currency", available_currencies())
+df = load_portfolio_values_in(currency)
+
+
+# Live quotes are polled by one service per server process, shared by every session;
+# it only changes when someone picks another source
+def switch_quote_source():
+    stop_quote_service()
+    if st.session_state['quote_source'] != 'Off':
+        start_quote_service(st.session_state['quote_source'])
+
+
+quote_options = ['Off', *QUOTE_SOURCES]
+running = quote_service()
+st.sidebar.selectbox("Live quotes", quote_options, index=quote_options.index(running.name) if running else 0,
+                     key='quote_source', on_change=switch_quote_source,
+                     help="Marks every portfolio to market from the latest quotes; Replay cycles through recent closes")
+
 # Title
 st.title("Portfolio Performance Simulation")
 
-# Show the raw data
-st.subheader("Portfolio Data Overview (Dec 9 - Jan 22)")
-st.dataframe(df)
-
 # Multi-select filter for portfolio columns
 portfolio_columns = df.columns[1:]  # Exclude the date column
 selected_portfolios = st.multiselect("Select portfolios to visualize", portfolio_columns, default=portfolio_columns)
 
+# Show the raw data, one page at a time, for the selected portfolios
+st.subheader("Portfolio Data Overview (Dec 9 - Jan 22)")
+render_paginated_table(selected_portfolios, currency=currency)
+
 # Prepare data for Plotly Express by melting the DataFrame
 df_melted = df.melt(id_vars=['Day'], value_vars=selected_portfolios, var_name='Portfolio', value_name='Value')
 
 # Create an interactive line plot using Plotly Express
 fig = px.line(df_melted, x='Day', y='Value', color='Portfolio', 
               title="Portfolio Performance Over Time",
-              labels={'Day': 'Date', 'Value': 'Portfolio Value', 'Portfolio': 'Portfolio'},
+              labels={'Day': 'Date', 'Value': f'Portfolio Value ({currency})', 'Portfolio': 'Portfolio'},
               markers=True)
 
 
@@ -38,7 +61,7 @@ fig = px.line(df_melted, x='Day', y='Value', color='Portfolio',
 fig.update_layout(hovermode="x unified", legend_title="Portfolio Names")
 
 # Show the chart in Streamlit
-st.plotly_chart(fig, use_container_width=True)
+st.plotly_chart(fig, width='stretch')
 
 # ----------------------------------------
 # Additional Insights
@@ -62,40 +85,38 @@ least_volatile = volatility.idxmin()
 # Show final rankings as a poll-style display with centered alignment and a box
 st.subheader("Portfolio Rankings for now...")
 
-# Sort portfolios from highest to lowest value
-ranked_portfolios = final_values.sort_values(ascending=False)
-
-# Define styling and emojis for top 3 ranks
-medal_emojis = ["🥇", "🥈", "🥉"]
-colors = ["#FFD700", "#C0C0C0", "#CD7F32"]  # Gold, Silver, Bronze colors
+# Only the visible top slice is ranked and rendered; movement is relative to the previous day
+n_visible = st.number_input("Portfolios to show", min_value=1, max_value=len(final_values), value=min(10, len(final_values)))
+previous_ranks = load_rank_matrix()[-2] if len(df) > 1 else None
+rankings_html = leaderboard_html(final_values.index, final_values.to_numpy(dtype=float), n_visible, previous_ranks,
+                                 currency)
 
-# Create HTML content for rankings
-rankings_html = "<div style='text-align: center; border: 2px solid #ddd; padding: 20px; width: 50%; margin: auto; background-color: #f9f9f9; border-radius: 10px;'>"
+# Display rankings in Streamlit
+st.markdown(rankings_html, unsafe_allow_html=True)
 
-for idx, (portfolio, value) in enumerate(ranked_portfolios.items(), start=1):
-    portfolio_name = portfolio.title()
-    formatted_value = f"${value:,.2f}"
 
-    if idx <= 3:
-        rankings_html += (
-            f"<p style='font-size:28px; font-weight:bold; color:{colors[idx-1]}; margin: 10px 0;'>"
-            f"{medal_emojis[idx-1]} {portfolio_name} - {formatted_value}</p>"
-        )
-    else:
-        rankings_html += (
-            f"<p style='font-size:22px; font-weight:bold; color:#333; margin: 5px 0;'>"
-            f"{idx}. {portfolio_name} - {formatted_value}</p>"
-        )
+# Live leaderboard from the quote service, refreshed on its own without rerunning the page;
+# movement is relative to the ranking at the last close. Live values are in the base currency.
+@st.fragment(run_every=5)
+def live_leaderboard():
+    service = quote_service()
+    snapshot = service.current_values() if service is not None else None
+    if snapshot is None:
+        return
+    timestamp, values = snapshot
+    st.subheader("Live Rankings")
+    close_ranks = rank_history(service.close_values[None, :])[0]
+    st.markdown(leaderboard_html(values.index, values.to_numpy(), n_visible, close_ranks), unsafe_allow_html=True)
+    st.caption(f"Marked to market at {timestamp:%Y-%m-%d %H:%M:%S} UTC ({service.name})")
 
-rankings_html += "</div>"
 
-# Display rankings in Streamlit
-st.markdown(rankings_html, unsafe_allow_html=True)
+live_leaderboard()
 
-# Insights Display
+# Insights Display (amounts in the display currency)
+symbol = CURRENCY_SYMBOLS.get(currency, f"{currency} ")
 st.markdown(f"""
-- 🏆 **Best Performer:** {best_performer.title()} with a final value of **{final_values[best_performer]:,.2f}**, growing by **{highest_growth:,.2f}**.
-- 📉 **Worst Performer:** {worst_performer.title()} with a final value of **{final_values[worst_performer]:,.2f}**, losing **{highest_loss:,.2f}**.
+- 🏆 **Best Performer:** {best_performer.title()} with a final value of **{symbol}{final_values[best_performer]:,.2f}**, growing by **{symbol}{highest_growth:,.2f}**.
+- 📉 **Worst Performer:** {worst_performer.title()} with a final value of **{symbol}{final_values[worst_performer]:,.2f}**, losing **{symbol}{highest_loss:,.2f}**.
 - 📊 **Most Volatile Portfolio:** {most_volatile.title()} with a standard deviation of **{volatility[most_volatile]:.2%}**.
 - 🛡️ **Least Volatile Portfolio:** {least_volatile.title()} with a standard deviation of **{volatility[least_volatile]:.2%}**.
 """)
@@ -107,6 +128,34 @@ fig_volatility = px.bar(volatility, x=volatility.index, y=volatility.values,
                         )
 st.plotly_chart(fig_volatility)
 
+# ----------------------------------------
+# Correlation and Overlap
+# ----------------------------------------
+
+st.subheader("🔗 Portfolio Correlation and Overlap")
+col1, col2 = st.columns(2)
+
+# Heatmaps are ordered so that similar portfolios sit next to each other
+with col1:
+    corr_names, corr = load_portfolio_correlation()
+    corr_order = cluster_order(corr)
+    corr_labels = [corr_names[i] for i in corr_order]
+    fig_corr = px.imshow(corr[corr_order][:, corr_order], x=corr_labels, y=corr_labels,
+                         zmin=-1, zmax=1, color_continuous_scale='RdBu_r', text_auto='.2f',
+                         title="Daily Return Correlation")
+    st.plotly_chart(fig_corr, width='stretch')
+
+with col2:
+    overlap_names, overlap = load_portfolio_overlap()
+    overlap_order = cluster_order(overlap)
+    overlap_labels = [overlap_names[i] for i in overlap_order]
+    fig_overlap = px.imshow(overlap[overlap_order][:, overlap_order], x=overlap_labels, y=overlap_labels,
+                            zmin=0, zmax=1, color_continuous_scale='Blues', text_auto='.2f',
+                            title="Holding Overlap")
+    st.plotly_chart(fig_overlap, width='stretch')
+
+st.caption("Correlation uses daily returns of every portfolio and benchmark; overlap is the cosine similarity of the allocation weights (1 = identical, 0 = nothing in common).")
+
 ###################################################################################
 
 # Title
@@ -115,44 +164,33 @@ st.title("Portfolio Competition Insights")
 # Most Popular Stocks Section
 st.subheader("🏅 Most Popular Stocks Across Portfolios")
 
-popular_stocks = {
-    "AAPL (Apple Inc.)": 5,
-    "MSFT (Microsoft Corp.)": 4,
-    "NVDA (NVIDIA Corp.)": 4,
-    "TGT (Target Corp.)": 3,
-    "LLY (Eli Lilly & Co.)": 3
-}
+# Derived from the registered allocations rather than typed by hand
+holdings = load_holdings_index()
+popular_df = holdings.popularity().head(5)
+st.table(popular_df.style.format({'Average Weight': '{:.1%}'}).set_properties(**{'text-align': 'left'}).set_table_styles(
+    [{'selector': 'th', 'props': [('text-align', 'center')]}]
+))
 
-popular_df = pd.DataFrame(list(popular_stocks.items()), columns=["Stock", "Number of Portfolios"])
-st.table(popular_df.style.set_properties(**{'text-align': 'left'}).set_table_styles(
+# Concentration and overlap of each portfolio
+st.subheader("🧩 Portfolio Concentration and Overlap")
+concentration_df = holdings.concentration()
+st.table(concentration_df.style.format({
+    'Concentration (HHI)': '{:.3f}', 'Effective Holdings': '{:.1f}', 'Shared Weight': '{:.1%}'
+}).set_properties(**{'text-align': 'left'}).set_table_styles(
     [{'selector': 'th', 'props': [('text-align', 'center')]}]
 ))
+st.caption("Effective holdings is 1 / HHI; shared weight is the part of a portfolio invested in stocks that other portfolios also hold.")
 
 #######################
 
-# Load the CSV file containing stock prices since the competition started
-stock_prices = pd.read_csv("all_stock_prices_since_competition_start.csv")
-
-# Calculate stock performance over the competition period
-stock_prices.set_index("Date", inplace=True)
-stock_performance = (stock_prices.iloc[-1] - stock_prices.iloc[0]) / stock_prices.iloc[0] * 100
-
-# Identify top 5 best-performing stocks
-best_performing_stocks = stock_performance.nlargest(5)
-best_stocks_dict = best_performing_stocks.to_dict()
-
-# Identify top 5 worst-performing stocks
-worst_performing_stocks = stock_performance.nsmallest(5)
-worst_stocks_dict = worst_performing_stocks.to_dict()
+# Stock performance over the competition period, computed by the SQL views over
+# the consolidated price store
+best_stocks_df = query("SELECT * FROM best_stocks")
+worst_stocks_df = query("SELECT * FROM worst_stocks")
 
 # Best Performing Stocks Section
 st.subheader("🚀 Best Performing Stocks During Competition")
 
-best_stocks_df = pd.DataFrame(
-    list(best_stocks_dict.items()), 
-    columns=["Stock", "Performance Change (%)"]
-)
-
 st.table(best_stocks_df.style.set_properties(**{'text-align': 'left'}).set_table_styles(
     [{'selector': 'th', 'props': [('text-align', 'center')]}]
 ))
@@ -160,11 +198,6 @@ st.table(best_stocks_df.style.set_properties(**{'text-align': 'left'}).set_table
 # Worst Performing Stocks Section
 st.subheader("📉 Worst Performing Stocks During Competition")
 
-worst_stocks_df = pd.DataFrame(
-    list(worst_stocks_dict.items()), 
-    columns=["Stock", "Performance Change (%)"]
-)
-
 st.table(worst_stocks_df.style.set_properties(**{'text-align': 'left'}).set_table_styles(
     [{'selector': 'th', 'props': [('text-align', 'center')]}]
 ))
@@ -174,10 +207,14 @@ st.subheader("🔍 Key Observations")
 st.markdown(f"""
 - **{best_stocks_df.iloc[0]['Stock']}** was the best-performing stock with a growth of **{best_stocks_df.iloc[0]['Performance Change (%)']:.2f}%**.
 - **{worst_stocks_df.iloc[0]['Stock']}** faced the biggest losses with a decline of **{worst_stocks_df.iloc[0]['Performance Change (%)']:.2f}%**.
-- **AAPL** and **MSFT** were the most popular stocks, appearing in multiple portfolios.
+- **{popular_df.iloc[0]['Stock']}** and **{popular_df.iloc[1]['Stock']}** were the most popular stocks, appearing in multiple portfolios.
 - **The recent U.S. elections, with Donald Trump being selected, have influenced market trends, particularly in sectors such as energy, defense, and financials.**
 - **The holiday season likely contributed to fluctuations in consumer retail stocks, such as Target (TGT) and Amazon (AMZN), as spending patterns shifted.**
 """)
 
 # Footer
 st.caption("Data collected from competition portfolios and analyzed using Yahoo Finance data.")
+
+# Report how quickly this worker served its first page
+first_render = record_render()
+st.caption(f"Worker warm-up {warm_up():.2f}s · first render {first_render:.2f}s after start")
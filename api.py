@@ -0,0 +1,389 @@
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from leaderboard import load_rank_matrix
+from ledger import ledger_files, load_valuations
+from portfolio_data import PORTFOLIO_VALUES_FILE, file_version
+from portfolio_metrics import portfolio_summary
+from portfolios import BASE_CURRENCY
+from price_store import ADJUSTMENTS, FX_RATES_FILE, load_portfolio_values_in, load_price_matrix, price_files
+from risk import portfolio_risk
+from warmup import warm_up
+
+logger = logging.getLogger(__name__)
+
+ARROW_MEDIA_TYPE = 'application/vnd.apache.arrow.stream'
+JSON_MEDIA_TYPE = 'application/json'
+
+# Bodies smaller than this are not worth compressing
+GZIP_MIN_SIZE = 1024
+
+# Rendered responses kept in memory, keyed by (path, query, format, data version)
+RESPONSE_CACHE_SIZE = 1024
+
+
+class NotFound(Exception):
+    pass
+
+
+class BadRequest(Exception):
+    pass
+
+
+def _data_files():
+    return sorted({PORTFOLIO_VALUES_FILE, FX_RATES_FILE, *price_files(), *ledger_files()})
+
+
+# Version of all the data behind the API; responses are rebuilt only when it changes
+def _data_version():
+    return tuple(file_version(path) for path in _data_files())
+
+
+def _param(query, name, default=None):
+    return query.get(name, [default])[-1]
+
+
+def _list_param(query, name):
+    value = _param(query, name)
+    return [item for item in value.split(',') if item] if value else None
+
+
+def _float_param(query, name, default):
+    try:
+        return float(_param(query, name, default))
+    except ValueError:
+        raise BadRequest(f"{name} must be a number")
+
+
+def _adjustment_param(query):
+    adjustment = _param(query, 'adjustment', 'split')
+    if adjustment not in ADJUSTMENTS:
+        raise BadRequest(f"adjustment must be one of {', '.join(ADJUSTMENTS)}")
+    return adjustment
+
+
+def _date_window(frame, date_column, query):
+    start, end = _param(query, 'start'), _param(query, 'end')
+    dates = frame[date_column] if date_column in frame else frame.index.to_series()
+    mask = np.ones(len(frame), dtype=bool)
+    try:
+        if start:
+            mask &= (dates >= pd.Timestamp(start)).to_numpy()
+        if end:
+            mask &= (dates <= pd.Timestamp(end)).to_numpy()
+    except ValueError:
+        raise BadRequest("start and end must be dates (YYYY-MM-DD)")
+    return frame[mask]
+
+
+def _select(frame, columns, keep=()):
+    if columns is None:
+        return frame
+    unknown = [column for column in columns if column not in frame.columns]
+    if unknown:
+        raise NotFound(f"Unknown columns: {', '.join(unknown)}")
+    return frame[[*keep, *columns]]
+
+
+# ----------------------------------------
+# Endpoints: each returns a DataFrame
+# ----------------------------------------
+
+# Daily values of the selected portfolios (all by default) in a currency
+def portfolio_values(query):
+    try:
+        df = load_portfolio_values_in(_param(query, 'currency', BASE_CURRENCY))
+    except ValueError as error:
+        raise BadRequest(str(error))
+    df = _select(df, _list_param(query, 'portfolios'), keep=['Day'])
+    return _date_window(df, 'Day', query)
+
+
+# Daily values of the selected portfolios replayed from their ledgers, with prices
+# adjusted for splits ('split') or with dividends reinvested ('total')
+def portfolio_valuations(query):
+    try:
+        df = load_valuations(_adjustment_param(query), _param(query, 'currency', BASE_CURRENCY))
+    except ValueError as error:
+        raise BadRequest(str(error))
+    df = _select(df.rename_axis('Day').reset_index(), _list_param(query, 'portfolios'), keep=['Day'])
+    return _date_window(df, 'Day', query)
+
+
+# Ranking of every portfolio on a day (the latest by default); 1 is the highest value
+def rankings(query):
+    df = load_portfolio_values_in()
+    rank_matrix = load_rank_matrix()
+    day = _param(query, 'day')
+    row = len(df) - 1
+    if day:
+        try:
+            day = pd.Timestamp(day)
+        except ValueError:
+            raise BadRequest("day must be a date (YYYY-MM-DD)")
+        row = int(np.searchsorted(df['Day'].to_numpy(), day.to_datetime64(), side='right')) - 1
+        if row < 0:
+            raise NotFound(f"No rankings on or before {day:%Y-%m-%d}")
+    ranking = pd.DataFrame({
+        'Portfolio': df.columns[1:],
+        'Value': df.iloc[row, 1:].to_numpy(dtype=float),
+        'Rank': rank_matrix[row],
+        'Previous Rank': rank_matrix[row - 1] if row > 0 else rank_matrix[row],
+    })
+    return ranking.sort_values(['Rank', 'Portfolio'], kind='stable').reset_index(drop=True)
+
+
+# Daily returns of the selected tickers (all by default) from the aligned price matrix
+def stock_returns(query):
+    prices = load_price_matrix(_adjustment_param(query))
+    returns = prices.pct_change(fill_method=None).iloc[1:]
+    returns = _select(returns, _list_param(query, 'tickers'))
+    return _date_window(returns, 'Date', query).reset_index()
+
+
+# Summary metrics of every portfolio
+def metrics(query):
+    df = load_portfolio_values_in()
+    days = df['Day'].to_numpy()
+    rows = []
+    for portfolio in df.columns[1:]:
+        values = df[portfolio].to_numpy(dtype=float)
+        summary = portfolio_summary(days, values)
+        rows.append({
+            'Portfolio': portfolio,
+            'Initial Value': summary['initial_value'],
+            'Current Value': summary['current_value'],
+            'Growth (%)': summary['growth'],
+            'Volatility': np.std(values[1:] / values[:-1] - 1, ddof=1),
+            'Best Day': summary['best_day'],
+            'Best Change': summary['best_change'],
+            'Worst Day': summary['worst_day'],
+            'Worst Change': summary['worst_change'],
+        })
+    return pd.DataFrame(rows)
+
+
+# VaR and expected shortfall of every portfolio
+def risk(query):
+    confidence = _float_param(query, 'confidence', 0.95)
+    horizon = int(_float_param(query, 'horizon', 1))
+    if not 0.5 <= confidence < 1 or horizon < 1:
+        raise BadRequest("confidence must be in [0.5, 1) and horizon at least 1")
+    days = len(load_price_matrix())
+    if horizon >= days:
+        raise BadRequest(f"horizon must be shorter than the {days}-day price history")
+    return portfolio_risk(confidence, horizon).reset_index(names='Portfolio')
+
+
+ROUTES = {
+    '/portfolios/values': portfolio_values,
+    '/portfolios/valuations': portfolio_valuations,
+    '/rankings': rankings,
+    '/stocks/returns': stock_returns,
+    '/metrics': metrics,
+    '/risk': risk,
+}
+
+
+# ----------------------------------------
+# Encoding
+# ----------------------------------------
+
+# Column-oriented JSON: {"columns": [...], "data": {column: [values]}}; dates are
+# ISO strings and missing values are null
+def _to_json(frame):
+    data = {}
+    for column in frame.columns:
+        series = frame[column]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            values = series.dt.strftime('%Y-%m-%d').tolist()
+        else:
+            values = series.astype(object).where(series.notna(), None).tolist()
+        data[str(column)] = values
+    return json.dumps({'columns': [str(column) for column in frame.columns], 'data': data},
+                      separators=(',', ':')).encode()
+
+
+def _to_arrow(frame):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+# A rendered response: body, its gzip form (when worth it) and a strong ETag
+class Rendered:
+    def __init__(self, body, media_type):
+        self.body = body
+        self.media_type = media_type
+        self.etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        self.gzipped = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_SIZE else None
+
+
+# Shared by the event loop and the worker threads rendering cold responses; the
+# lock covers only the bookkeeping, never the rendering
+_responses = OrderedDict()
+_responses_lock = threading.Lock()
+
+
+def _cached_response(key):
+    with _responses_lock:
+        rendered = _responses.get(key)
+        if rendered is not None:
+            _responses.move_to_end(key)
+        return rendered
+
+
+def _render(path, query_string, media_type, version):
+    key = (path, query_string, media_type, version)
+    rendered = _cached_response(key)
+    if rendered is not None:
+        return rendered
+
+    frame = ROUTES[path](parse_qs(query_string))
+    body = _to_arrow(frame) if media_type == ARROW_MEDIA_TYPE else _to_json(frame)
+    rendered = Rendered(body, media_type)
+    with _responses_lock:
+        _responses[key] = rendered
+        if len(_responses) > RESPONSE_CACHE_SIZE:
+            _responses.popitem(last=False)
+    return rendered
+
+
+# ----------------------------------------
+# HTTP
+# ----------------------------------------
+
+REASONS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 406: 'Not Acceptable', 500: 'Internal Server Error'}
+
+
+def _response(status, headers=(), body=b'', head=False):
+    lines = [f"HTTP/1.1 {status} {REASONS[status]}", f"Content-Length: {len(body)}", *headers]
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode() + (b'' if head else body)
+
+
+def _error(status, message, head=False):
+    body = json.dumps({'error': message}).encode()
+    return _response(status, [f"Content-Type: {JSON_MEDIA_TYPE}"], body, head)
+
+
+def _media_type(accept):
+    if ARROW_MEDIA_TYPE in accept:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            return None
+        return ARROW_MEDIA_TYPE
+    return JSON_MEDIA_TYPE
+
+
+async def _handle_request(method, target, headers):
+    head = method == 'HEAD'
+    if method not in ('GET', 'HEAD'):
+        return _error(405, "Only GET and HEAD are supported")
+
+    url = urlsplit(target)
+    path = unquote(url.path).rstrip('/') or '/'
+    if path == '/health':
+        return _response(200, ["Content-Type: text/plain"], b'ok', head)
+    if path not in ROUTES:
+        return _error(404, f"Unknown endpoint {path}; available: {', '.join(ROUTES)}", head)
+
+    media_type = _media_type(headers.get('accept', ''))
+    if media_type is None:
+        return _error(406, "Arrow responses require the pyarrow package", head)
+
+    version = _data_version()
+    try:
+        key = (path, url.query, media_type, version)
+        rendered = _cached_response(key)
+        if rendered is None:
+            # Cold responses are computed off the event loop; cached ones are served inline
+            rendered = await asyncio.to_thread(_render, path, url.query, media_type, version)
+    except BadRequest as error:
+        return _error(400, str(error), head)
+    except NotFound as error:
+        return _error(404, str(error), head)
+
+    common = [f"ETag: {rendered.etag}", "Cache-Control: no-cache", "Vary: Accept, Accept-Encoding"]
+    if rendered.etag in (tag.strip() for tag in headers.get('if-none-match', '').split(',')):
+        return _response(304, common, head=True)
+
+    body = rendered.body
+    if rendered.gzipped is not None and 'gzip' in headers.get('accept-encoding', ''):
+        body = rendered.gzipped
+        common.append("Content-Encoding: gzip")
+    return _response(200, [f"Content-Type: {rendered.media_type}", *common], body, head)
+
+
+# One connection; requests are served in order while the client keeps it alive
+async def _serve_connection(reader, writer):
+    try:
+        while True:
+            try:
+                request = await reader.readuntil(b'\r\n\r\n')
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                break
+
+            request_line, *header_lines = request.decode('latin-1').split('\r\n')
+            try:
+                method, target, protocol = request_line.split(' ')
+            except ValueError:
+                writer.write(_error(400, "Malformed request line"))
+                break
+            headers = {}
+            for line in header_lines:
+                name, _, value = line.partition(':')
+                if name:
+                    headers[name.strip().lower()] = value.strip()
+
+            try:
+                response = await _handle_request(method, target, headers)
+            except Exception:
+                logger.exception("Error serving %s", target)
+                response = _error(500, "Internal server error")
+            writer.write(response)
+            await writer.drain()
+
+            keep_alive = protocol == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+            if not keep_alive:
+                break
+    finally:
+        writer.close()
+
+
+async def serve(host='127.0.0.1', port=8000):
+    server = await asyncio.start_server(_serve_connection, host, port)
+    logger.info("Serving the portfolio API on http://%s:%d", host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve portfolio values and metrics over HTTP.")
+    parser.add_argument('--host', default='127.0.0.1', help="Interface to listen on")
+    parser.add_argument('--port', type=int, default=8000, help="Port to listen on")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    # Same data layer and caches as the dashboard, loaded before the first request
+    warm_up()
+    asyncio.run(serve(args.host, args.port))
+
+
+if __name__ == '__main__':
+    main()
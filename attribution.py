@@ -0,0 +1,71 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from portfolio_data import file_version, load_stock_values, participant_file
+
+
+# Dollar and percentage contribution of each holding to the portfolio's change
+# between two dates (inclusive), cached per (participant, window)
+@lru_cache(maxsize=256)
+def _attribution(participant, version, start_day, end_day):
+    stock_values = load_stock_values(participant)
+    dates = stock_values['Date'].to_numpy()
+    start = np.searchsorted(dates, np.datetime64(start_day), side='left')
+    end = np.searchsorted(dates, np.datetime64(end_day), side='right') - 1
+    start, end = min(start, len(dates) - 1), max(end, 0)
+
+    values = stock_values.iloc[:, 2:].to_numpy(dtype=float)
+    start_values, end_values = values[start], values[end]
+    contribution = end_values - start_values
+
+    contributions = pd.DataFrame({
+        'Stock': stock_values.columns[2:],
+        'Start Value': start_values,
+        'End Value': end_values,
+        'Contribution ($)': contribution,
+        'Contribution (%)': contribution / start_values.sum() * 100,
+    })
+    return contributions.sort_values('Contribution ($)', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def attribution(participant, start_day, end_day):
+    version = file_version(participant_file(participant, 'stock_daily_returns'))
+    return _attribution(participant, version, str(start_day), str(end_day))
+
+
+# First and last date available for attribution
+def attribution_bounds(participant):
+    dates = load_stock_values(participant)['Date']
+    return dates.iloc[0].date(), dates.iloc[-1].date()
+
+
+# Bar chart of each holding's contribution, green for gains and red for losses
+def contribution_bar(contributions, title):
+    import plotly.express as px
+
+    fig = px.bar(contributions, x='Stock', y='Contribution ($)',
+                 color=np.where(contributions['Contribution ($)'] >= 0, 'Gain', 'Loss'),
+                 color_discrete_map={'Gain': 'green', 'Loss': 'red'},
+                 hover_data={'Contribution (%)': ':.2f'},
+                 title=title, labels={'color': ''})
+    return fig
+
+
+# Waterfall from the starting portfolio value, through each holding's contribution, to the end value
+def contribution_waterfall(contributions, title):
+    import plotly.graph_objects as go
+
+    start_value = contributions['Start Value'].sum()
+    end_value = contributions['End Value'].sum()
+    fig = go.Figure(go.Waterfall(
+        x=['Start', *contributions['Stock'], 'End'],
+        y=[start_value, *contributions['Contribution ($)'], end_value],
+        measure=['absolute'] + ['relative'] * len(contributions) + ['total'],
+        increasing={'marker': {'color': 'green'}},
+        decreasing={'marker': {'color': 'red'}},
+        totals={'marker': {'color': 'steelblue'}},
+    ))
+    fig.update_layout(title=title, yaxis_title='Portfolio Value ($)', showlegend=False)
+    return fig
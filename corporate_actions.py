@@ -0,0 +1,54 @@
+from functools import lru_cache
+
+import numpy as np
+
+from portfolio_data import file_version
+from validation import read_validated
+
+# Splits and cash dividends of the tickers in the stored price history. 'Value' is the
+# split ratio (10 for 10:1, 1/12 for a 1-for-12 reverse split) or the cash per share,
+# in the same units as the stored prices on that date. 'In Source' marks events the
+# stored history already reflects (e.g. NVDA's and AVGO's prices are split-adjusted
+# upstream), so they are not applied again.
+CORPORATE_ACTIONS_FILE = "corporate_actions.csv"
+
+
+@lru_cache(maxsize=2)
+def _read_corporate_actions(path, version):
+    actions = read_validated(path, 'corporate_actions')
+    actions['In Source'] = actions['In Source'].astype(bool)
+    return actions
+
+
+def load_corporate_actions(path=CORPORATE_ACTIONS_FILE):
+    return _read_corporate_actions(path, file_version(path))
+
+
+# (dates x tickers) multipliers that back-adjust raw prices for every event: a split
+# scales all earlier prices by 1 / ratio and, for total-return series, a dividend
+# scales them by 1 - dividend / previous close. Each event is scattered onto the day
+# before it takes effect and the factors are one reverse cumulative product. With
+# in_source the factors are those of the events the stored history already reflects.
+def adjustment_factors(prices, actions, total_return=False, in_source=False):
+    raw = prices.to_numpy(dtype=float)
+    actions = actions[(actions['In Source'] == in_source) & actions['Ticker'].isin(prices.columns)]
+    if not total_return:
+        actions = actions[actions['Action'] == 'split']
+
+    rows = np.searchsorted(prices.index.to_numpy(), actions['Date'].to_numpy()) - 1
+    columns = prices.columns.get_indexer(actions['Ticker'])
+    values = actions['Value'].to_numpy(dtype=float)
+    inside = (rows >= 0) & (rows < len(raw) - 1)
+    rows, columns, values = rows[inside], columns[inside], values[inside]
+    is_split = actions['Action'].to_numpy()[inside] == 'split'
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        factors = np.where(is_split, 1 / values, 1 - values / raw[rows, columns])
+    # A dividend before the ticker has a price leaves the history unchanged
+    factors = np.where(np.isfinite(factors) & (factors > 0), factors, 1)
+
+    log_factors = np.zeros(raw.shape)
+    np.add.at(log_factors, (rows, columns), np.log(factors))
+    cumulative = np.exp(np.cumsum(log_factors[::-1], axis=0)[::-1])
+    cumulative.setflags(write=False)
+    return cumulative
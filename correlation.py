@@ -0,0 +1,73 @@
+from functools import lru_cache
+
+import numpy as np
+
+from holdings import load_holdings_index
+from portfolio_data import PORTFOLIO_VALUES_FILE, file_version, load_portfolio_values
+
+# Number of columns multiplied at a time; bounds the size of each intermediate product
+BLOCK_SIZE = 512
+
+
+# Gram matrix (columns x columns) of a 2-D array, filled block by block into a
+# preallocated result. Only the upper triangle is multiplied; it is mirrored below.
+def blocked_gram(matrix, block_size=BLOCK_SIZE):
+    n = matrix.shape[1]
+    out = np.empty((n, n))
+    for i in range(0, n, block_size):
+        left = matrix[:, i:i + block_size]
+        for j in range(i, n, block_size):
+            block = left.T @ matrix[:, j:j + block_size]
+            out[i:i + block_size, j:j + block_size] = block
+            out[j:j + block_size, i:i + block_size] = block.T
+    return out
+
+
+# Pearson correlation between the columns of a (days x series) returns matrix
+def correlation_matrix(returns, block_size=BLOCK_SIZE):
+    centered = returns - returns.mean(axis=0)
+    norms = np.linalg.norm(centered, axis=0)
+    standardized = centered / np.where(norms > 0, norms, np.nan)
+    return blocked_gram(standardized, block_size)
+
+
+# Holding overlap between portfolios: cosine similarity of their allocation weight
+# vectors (1 = identical allocations, 0 = no stock in common)
+def overlap_matrix(weights, block_size=BLOCK_SIZE):
+    norms = np.linalg.norm(weights, axis=1)
+    normalized = weights / np.where(norms > 0, norms, np.nan)[:, None]
+    return blocked_gram(normalized.T, block_size)
+
+
+# Order that places similar series next to each other (spectral seriation on the
+# Fiedler vector of the similarity graph), used to cluster the heatmaps
+def cluster_order(similarity):
+    affinity = np.nan_to_num((similarity + 1) / 2)
+    laplacian = np.diag(affinity.sum(axis=1)) - affinity
+    _, vectors = np.linalg.eigh(laplacian)
+    fiedler = vectors[:, 1] if len(affinity) > 1 else np.zeros(len(affinity))
+    return np.argsort(fiedler, kind='stable')
+
+
+# Daily return correlation of every portfolio and benchmark, computed once per file version
+@lru_cache(maxsize=4)
+def _portfolio_correlation(path, version):
+    df = load_portfolio_values(path)
+    values = df.iloc[:, 1:].to_numpy(dtype=float)
+    returns = values[1:] / values[:-1] - 1
+    corr = correlation_matrix(returns)
+    corr.setflags(write=False)
+    return list(df.columns[1:]), corr
+
+
+def load_portfolio_correlation(path=PORTFOLIO_VALUES_FILE):
+    return _portfolio_correlation(path, file_version(path))
+
+
+# Allocation overlap between the registered portfolios
+@lru_cache(maxsize=1)
+def load_portfolio_overlap():
+    holdings = load_holdings_index()
+    overlap = overlap_matrix(holdings.weights)
+    overlap.setflags(write=False)
+    return holdings.portfolios, overlap
@@ -0,0 +1,130 @@
+import argparse
+import html
+import importlib.util
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+from leaderboard import competition_ranks
+from portfolio_data import PORTFOLIO_VALUES_FILE, file_version, load_portfolio_values, load_stock_values, participant_file
+from portfolio_metrics import holding_volatility, portfolio_summary
+from portfolios import BENCHMARKS
+from warmup import warm_up
+
+BENCHMARK = 'SMP-500'
+
+
+# Daily-return volatility of every portfolio and its rank (1 = most volatile),
+# computed once per version of the portfolio values
+@lru_cache(maxsize=1)
+def _volatility_ranking(version):
+    df = load_portfolio_values()
+    values = df.iloc[:, 1:].to_numpy(dtype=float)
+    volatility = np.std(values[1:] / values[:-1] - 1, axis=0, ddof=1)
+    return dict(zip(df.columns[1:], zip(volatility, competition_ranks(volatility)))), len(volatility)
+
+
+def _has_holdings(participant):
+    try:
+        file_version(participant_file(participant, 'stock_daily_returns'))
+        return True
+    except FileNotFoundError:
+        return False
+
+
+# Render one participant's report to <output_dir>/<participant>.html (and PNG charts)
+def build_report(participant, output_dir, png=False):
+    import plotly.express as px
+
+    from attribution import attribution, attribution_bounds, contribution_waterfall
+
+    df = load_portfolio_values()
+    summary = portfolio_summary(df['Day'].to_numpy(), df[participant].to_numpy())
+    volatility_by_portfolio, n_portfolios = _volatility_ranking(file_version(PORTFOLIO_VALUES_FILE))
+    volatility, volatility_rank = volatility_by_portfolio[participant]
+    name = participant.title()
+
+    figures = {}
+    figures['performance'] = px.line(df, x='Day', y=[participant, BENCHMARK],
+                                     labels={'value': 'Portfolio Value ($)'},
+                                     title=f"{name}'s Portfolio vs S&P 500")
+    if _has_holdings(participant):
+        contributions = attribution(participant, *attribution_bounds(participant))
+        figures['waterfall'] = contribution_waterfall(contributions, "From Starting to Ending Portfolio Value")
+
+        stock_values = load_stock_values(participant)
+        stocks, stock_volatility = holding_volatility(stock_values.columns[2:], stock_values.iloc[:, 2:].to_numpy())
+        figures['volatility'] = px.bar(x=stocks, y=stock_volatility, title="Stock Volatility Comparison",
+                                       labels={'x': 'Stock', 'y': 'Volatility (Standard Deviation)'})
+
+    best_day = str(summary['best_day'])[:10]
+    worst_day = str(summary['worst_day'])[:10]
+    metrics_html = (
+        f"<ul>"
+        f"<li><b>Starting Value:</b> ${summary['initial_value']:,.2f}</li>"
+        f"<li><b>Current Value:</b> ${summary['current_value']:,.2f}</li>"
+        f"<li><b>Growth:</b> {summary['growth']:.2f}%</li>"
+        f"<li><b>Best Day:</b> {best_day} with an increase of ${summary['best_change']:,.2f}</li>"
+        f"<li><b>Worst Day:</b> {worst_day} with a decrease of ${summary['worst_change']:,.2f}</li>"
+        f"<li><b>Volatility:</b> {volatility:.2%} daily, ranked {volatility_rank} of {n_portfolios} (1 = most volatile)</li>"
+        f"</ul>"
+    )
+
+    # plotly.js is loaded once per page from the CDN to keep reports small
+    charts_html = "".join(
+        fig.to_html(full_html=False, include_plotlyjs='cdn' if i == 0 else False)
+        for i, fig in enumerate(figures.values())
+    )
+    report_path = os.path.join(output_dir, f"{participant.lower()}.html")
+    with open(report_path, 'w', encoding='utf-8') as f:
+        f.write(
+            f"<html><head><meta charset='utf-8'><title>{html.escape(name)}'s Portfolio Report</title></head><body>"
+            f"<h1>{html.escape(name)}'s Portfolio Report</h1>{metrics_html}{charts_html}</body></html>"
+        )
+
+    if png:
+        for chart, fig in figures.items():
+            fig.write_image(os.path.join(output_dir, f"{participant.lower()}_{chart}.png"))
+
+    return report_path
+
+
+def _build_report_task(task):
+    return build_report(*task)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a static report for every registered portfolio.")
+    parser.add_argument('--output-dir', default='reports', help="Directory the reports are written to")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Number of worker processes")
+    parser.add_argument('--png', action='store_true', help="Also export PNG charts (requires kaleido)")
+    parser.add_argument('participants', nargs='*', help="Portfolios to report on (default: all but the benchmarks)")
+    args = parser.parse_args()
+
+    if args.png and importlib.util.find_spec('kaleido') is None:
+        parser.error("--png requires the kaleido package")
+
+    # Load the shared data once in the parent; forked workers inherit the warm caches
+    warm_up()
+    _volatility_ranking(file_version(PORTFOLIO_VALUES_FILE))
+    df = load_portfolio_values()
+    participants = args.participants or [column for column in df.columns[1:] if column not in BENCHMARKS]
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    tasks = [(participant, args.output_dir, args.png) for participant in participants]
+    chunksize = max(1, len(tasks) // (args.workers * 4))
+    context = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=context) as executor:
+        for report_path in executor.map(_build_report_task, tasks, chunksize=chunksize):
+            print(report_path)
+
+    print(f"Generated {len(tasks)} reports in {time.perf_counter() - start:.1f}s using {args.workers} workers")
+
+
+if __name__ == '__main__':
+    main()
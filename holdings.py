@@ -0,0 +1,69 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from portfolios import ALLOCATIONS
+
+
+# Index of who holds what, built once from the registered allocations.
+# Ticker and portfolio lookups are dictionary hits; aggregate metrics are
+# computed on the dense (portfolios x tickers) weight matrix.
+class HoldingsIndex:
+    def __init__(self, allocations):
+        self.portfolios = list(allocations)
+        self.tickers = sorted({ticker for weights in allocations.values() for ticker in weights})
+        self.portfolio_index = {portfolio: i for i, portfolio in enumerate(self.portfolios)}
+        self.ticker_index = {ticker: j for j, ticker in enumerate(self.tickers)}
+
+        self.weights = np.zeros((len(self.portfolios), len(self.tickers)))
+        for portfolio, weights in allocations.items():
+            for ticker, weight in weights.items():
+                self.weights[self.portfolio_index[portfolio], self.ticker_index[ticker]] = weight
+        self.weights.setflags(write=False)
+
+        # ticker -> ((portfolio, weight), ...), largest position first
+        self.holders = {}
+        for j, ticker in enumerate(self.tickers):
+            column = self.weights[:, j]
+            rows = np.nonzero(column)[0]
+            rows = rows[np.argsort(-column[rows], kind='stable')]
+            self.holders[ticker] = tuple((self.portfolios[i], column[i]) for i in rows)
+
+    # Portfolios holding a ticker, with their weights
+    def holders_of(self, ticker):
+        return self.holders.get(ticker, ())
+
+    # Other portfolios holding a ticker, as a table for the participant pages
+    def other_holders(self, ticker, portfolio):
+        rows = [(holder.title(), weight) for holder, weight in self.holders_of(ticker) if holder != portfolio]
+        return pd.DataFrame(rows, columns=['Portfolio', 'Weight'])
+
+    # Number of portfolios holding each ticker and the weight they put in it
+    def popularity(self):
+        held = self.weights > 0
+        popularity_df = pd.DataFrame({
+            'Stock': self.tickers,
+            'Number of Portfolios': held.sum(axis=0),
+            'Average Weight': self.weights.sum(axis=0) / np.maximum(held.sum(axis=0), 1),
+        })
+        return popularity_df.sort_values(['Number of Portfolios', 'Average Weight'],
+                                         ascending=False, kind='stable').reset_index(drop=True)
+
+    # Per-portfolio concentration (Herfindahl index and effective number of holdings)
+    # and overlap (share of the portfolio in stocks that at least one other portfolio holds)
+    def concentration(self):
+        hhi = (self.weights ** 2).sum(axis=1)
+        shared = (self.weights > 0).sum(axis=0) > 1
+        return pd.DataFrame({
+            'Portfolio': [portfolio.title() for portfolio in self.portfolios],
+            'Holdings': (self.weights > 0).sum(axis=1),
+            'Concentration (HHI)': hhi,
+            'Effective Holdings': 1 / hhi,
+            'Shared Weight': self.weights[:, shared].sum(axis=1),
+        })
+
+
+@lru_cache(maxsize=1)
+def load_holdings_index():
+    return HoldingsIndex(ALLOCATIONS)
@@ -0,0 +1,186 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from ledger import ledger_files, load_ledgers
+from lineage import is_current, write_lineage
+from portfolio_data import file_version
+from price_store import load_price_matrix
+
+# Minute bars are stored one file per trading day, e.g. intraday/minute/2025-01-21.csv,
+# with columns Datetime, Ticker, Open, High, Low, Close, Volume (exchange local time).
+# The hourly and daily levels are materialized next to them by resample_intraday(),
+# each with a lineage record of the files it was resampled from.
+INTRADAY_DIR = "intraday"
+LEVELS = {'minute': None, 'hour': 'h', 'day': 'D'}
+
+# Rows read from a minute file at a time; bounds memory however large a day is
+CHUNK_SIZE = 200_000
+
+# Spans (in days) up to which a level is fine enough to chart without too many points
+LEVEL_SPANS = {'minute': 2, 'hour': 45}
+
+OHLC_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def _minute_dir(directory):
+    return os.path.join(directory, 'minute')
+
+
+def _level_file(directory, level):
+    return os.path.join(directory, f"{level}.csv")
+
+
+# Minute files in day order, with their versions
+def minute_files(directory=INTRADAY_DIR):
+    minute_dir = _minute_dir(directory)
+    if not os.path.isdir(minute_dir):
+        return ()
+    names = sorted(name for name in os.listdir(minute_dir) if name.endswith('.csv'))
+    return tuple((os.path.join(minute_dir, name), file_version(os.path.join(minute_dir, name))) for name in names)
+
+
+# OHLCV bars of every ticker aggregated into buckets of `freq`, indexed by (Ticker, Bucket).
+# First and Last are the times of the bucket's opening and closing bars, so partial
+# aggregates of chunks can be merged whatever order the rows were stored in.
+def _ohlc(bars, freq):
+    bars = bars.sort_values('Datetime', kind='stable')
+    grouped = bars.groupby([bars['Ticker'], bars['Datetime'].dt.floor(freq).rename('Bucket')], sort=True)
+    return grouped.agg(Open=('Open', 'first'), High=('High', 'max'), Low=('Low', 'min'),
+                       Close=('Close', 'last'), Volume=('Volume', 'sum'),
+                       First=('Datetime', 'min'), Last=('Datetime', 'max'))
+
+
+def _merge_partials(partials):
+    combined = pd.concat(partials).reset_index()
+    by_first = combined.sort_values('First', kind='stable').groupby(['Ticker', 'Bucket'], sort=True)
+    by_last = combined.sort_values('Last', kind='stable').groupby(['Ticker', 'Bucket'], sort=True)
+    return pd.DataFrame({
+        'Open': by_first['Open'].first(),
+        'High': by_first['High'].max(),
+        'Low': by_first['Low'].min(),
+        'Close': by_last['Close'].last(),
+        'Volume': by_first['Volume'].sum(),
+        'First': by_first['First'].first(),
+        'Last': by_last['Last'].last(),
+    })
+
+
+# Resample every minute file into hourly bars, and the hourly bars into daily bars.
+# Each day is processed chunk by chunk, so only one chunk of minute bars and the
+# (60x smaller) hourly bars are ever in memory. The levels are written once and
+# reused while their lineage matches the content of the minute files.
+def resample_intraday(directory=INTRADAY_DIR):
+    sources = minute_files(directory)
+    if not sources:
+        return False
+    hour_file, day_file = _level_file(directory, 'hour'), _level_file(directory, 'day')
+    source_paths = [path for path, _ in sources]
+    if is_current(hour_file, inputs=source_paths) and is_current(day_file, inputs=[hour_file]):
+        return False
+
+    hourly = []
+    for path, _ in sources:
+        chunks = pd.read_csv(path, chunksize=CHUNK_SIZE, parse_dates=['Datetime'])
+        partials = [_ohlc(chunk, LEVELS['hour']) for chunk in chunks]
+        if partials:
+            hourly.append(_merge_partials(partials))
+    columns = ['Ticker', 'Datetime'] + OHLC_COLUMNS
+    hour_bars = pd.DataFrame(columns=columns)
+    if hourly:
+        hour_bars = pd.concat(hourly).reset_index().rename(columns={'Bucket': 'Datetime'})
+
+    # Hourly bars are whole buckets, so the daily level is one more resample of them
+    day_bars = pd.DataFrame(columns=columns)
+    if len(hour_bars):
+        day_bars = _ohlc(hour_bars, LEVELS['day']).reset_index().rename(columns={'Bucket': 'Datetime'})
+
+    hour_bars[columns].to_csv(hour_file, index=False)
+    write_lineage(hour_file, 'intraday.resample_intraday', inputs=source_paths, parameters={'freq': LEVELS['hour']})
+    day_bars[columns].to_csv(day_file, index=False)
+    write_lineage(day_file, 'intraday.resample_intraday', inputs=[hour_file], parameters={'freq': LEVELS['day']})
+    return True
+
+
+@lru_cache(maxsize=4)
+def _read_level(path, version):
+    return pd.read_csv(path, parse_dates=['Datetime'])
+
+
+# Close prices (timestamps x tickers) of one level inside [start, end]. Minute bars
+# are read only from the days in the window, chunk by chunk; coarser levels come
+# from the materialized files. Gaps inside the window are forward-filled.
+def load_intraday_prices(level, start, end, directory=INTRADAY_DIR):
+    start, end = pd.Timestamp(start), pd.Timestamp(end) + pd.Timedelta(days=1)
+    if level == 'minute':
+        frames = []
+        for path, _ in minute_files(directory):
+            day = pd.Timestamp(os.path.basename(path)[:-4])
+            if start.normalize() <= day < end:
+                for chunk in pd.read_csv(path, chunksize=CHUNK_SIZE, parse_dates=['Datetime'],
+                                         usecols=['Datetime', 'Ticker', 'Close']):
+                    frames.append(chunk[(chunk['Datetime'] >= start) & (chunk['Datetime'] < end)])
+        bars = pd.concat(frames) if frames else pd.DataFrame(columns=['Datetime', 'Ticker', 'Close'])
+    elif minute_files(directory):
+        resample_intraday(directory)
+        path = _level_file(directory, level)
+        bars = _read_level(path, file_version(path))
+        bars = bars[(bars['Datetime'] >= start) & (bars['Datetime'] < end)]
+    else:
+        bars = pd.DataFrame(columns=['Datetime', 'Ticker', 'Close'])
+
+    if bars.empty:
+        return pd.DataFrame(index=pd.DatetimeIndex([], name='Datetime'), dtype=float)
+    closes = bars.pivot_table(index='Datetime', columns='Ticker', values='Close', aggfunc='last')
+    return closes.sort_index().ffill()
+
+
+# First and last trading day with minute bars, or None without intraday data
+def intraday_range(directory=INTRADAY_DIR):
+    sources = minute_files(directory)
+    if not sources:
+        return None
+    days = [pd.Timestamp(os.path.basename(path)[:-4]) for path, _ in sources]
+    return days[0], days[-1]
+
+
+# Finest level that keeps a window of this many days readable
+def choose_level(start, end):
+    span_days = (pd.Timestamp(end) - pd.Timestamp(start)).days + 1
+    for level, max_days in LEVEL_SPANS.items():
+        if span_days <= max_days:
+            return level
+    return 'day'
+
+
+# Value of every registered portfolio at each bar (timestamps x portfolios). Shares
+# come from the ledger replay as of each bar's trading day, so trades and corporate
+# actions apply intraday exactly as they do in the daily valuation.
+@lru_cache(maxsize=8)
+def _intraday_values(level, start, end, directory, sources, files):
+    closes = load_intraday_prices(level, start, end, directory)
+    ledgers = load_ledgers()
+    daily_prices = load_price_matrix()
+    if closes.empty:
+        return pd.DataFrame(index=closes.index, columns=list(ledgers), dtype=float)
+
+    tickers = daily_prices.columns
+    prices = closes.reindex(columns=tickers).to_numpy(dtype=float)
+    # Tickers without intraday bars keep their latest daily close
+    bar_days = closes.index.normalize().to_numpy()
+    day_rows = np.maximum(np.searchsorted(daily_prices.index.to_numpy(), bar_days, side='right') - 1, 0)
+    previous_close = daily_prices.to_numpy(dtype=float)[day_rows]
+    prices = np.nan_to_num(np.where(np.isnan(prices), previous_close, prices))
+
+    values = {}
+    for portfolio, ledger in ledgers.items():
+        shares, cash = ledger.replay(daily_prices)
+        values[portfolio] = np.einsum('tk,tk->t', prices, shares[day_rows]) + cash[day_rows]
+    return pd.DataFrame(values, index=closes.index)
+
+
+def intraday_values(level, start, end, directory=INTRADAY_DIR):
+    files = tuple((path, file_version(path)) for path in ledger_files())
+    return _intraday_values(level, pd.Timestamp(start), pd.Timestamp(end), directory, minute_files(directory), files)
@@ -0,0 +1,112 @@
+from functools import lru_cache
+
+import numpy as np
+
+from portfolio_data import PORTFOLIO_VALUES_FILE, file_version, load_portfolio_values
+from portfolios import BASE_CURRENCY, CURRENCY_SYMBOLS
+
+# Styling and emojis for the podium
+MEDAL_EMOJIS = ["🥇", "🥈", "🥉"]
+MEDAL_COLORS = ["#FFD700", "#C0C0C0", "#CD7F32"]  # Gold, Silver, Bronze colors
+
+
+# Competition ranking ("1224"): tied values share the best rank of their group.
+# Works on a 1-D array or row by row on a 2-D (days x portfolios) matrix; higher is better.
+def competition_ranks(values):
+    values = np.asarray(values, dtype=float)
+    matrix = np.atleast_2d(values)
+    n_rows, n_cols = matrix.shape
+
+    order = np.argsort(-matrix, axis=1, kind='stable')
+    ordered = np.take_along_axis(matrix, order, axis=1)
+
+    # Position where each run of equal values starts, carried forward along the row
+    positions = np.broadcast_to(np.arange(n_cols), (n_rows, n_cols))
+    run_start = np.ones((n_rows, n_cols), dtype=bool)
+    run_start[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    first_position = np.maximum.accumulate(np.where(run_start, positions, 0), axis=1)
+
+    ranks = np.empty((n_rows, n_cols), dtype=np.int64)
+    np.put_along_axis(ranks, order, first_position + 1, axis=1)
+    return ranks[0] if values.ndim == 1 else ranks
+
+
+# Rank of every portfolio on every day (days x portfolios), computed in one pass
+def rank_history(values_matrix):
+    return competition_ranks(values_matrix)
+
+
+# Indices of the top n values, best first. Entries tied with the n-th value are
+# kept, so a tie is never split at the cut-off. Only the selected slice is sorted.
+def top_n(values, n):
+    values = np.asarray(values, dtype=float)
+    n = min(n, len(values))
+    if n == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    threshold = -np.partition(-values, n - 1)[n - 1]
+    k = int(np.count_nonzero(values >= threshold))
+    selected = np.argpartition(-values, k - 1)[:k] if k < len(values) else np.arange(len(values))
+    selected = selected[np.argsort(-values[selected], kind='stable')]
+
+    # Everything ranked above a selected value is itself in the selection
+    ranks = competition_ranks(values[selected])
+    return selected, ranks
+
+
+# HTML for the visible top slice of the leaderboard, with values in `currency`.
+# Movement arrows compare with the ranks of the previous day when they are given.
+def leaderboard_html(names, values, n_visible=10, previous_ranks=None, currency=BASE_CURRENCY):
+    names = np.asarray(names)
+    values = np.asarray(values, dtype=float)
+    selected, ranks = top_n(values, n_visible)
+    symbol = CURRENCY_SYMBOLS.get(currency, f"{currency} ")
+
+    rows = []
+    for idx, rank in zip(selected, ranks):
+        portfolio_name = str(names[idx]).title()
+        formatted_value = f"{symbol}{values[idx]:,.2f}"
+
+        movement = ""
+        if previous_ranks is not None:
+            change = int(previous_ranks[idx]) - int(rank)
+            if change > 0:
+                movement = f" <span style='color:green; font-size:18px;'>▲{change}</span>"
+            elif change < 0:
+                movement = f" <span style='color:red; font-size:18px;'>▼{-change}</span>"
+
+        if rank <= 3:
+            rows.append(
+                f"<p style='font-size:28px; font-weight:bold; color:{MEDAL_COLORS[rank-1]}; margin: 10px 0;'>"
+                f"{MEDAL_EMOJIS[rank-1]} {portfolio_name} - {formatted_value}{movement}</p>"
+            )
+        else:
+            rows.append(
+                f"<p style='font-size:22px; font-weight:bold; color:#333; margin: 5px 0;'>"
+                f"{rank}. {portfolio_name} - {formatted_value}{movement}</p>"
+            )
+
+    hidden = len(values) - len(selected)
+    if hidden > 0:
+        rows.append(f"<p style='font-size:16px; color:#777; margin: 5px 0;'>... and {hidden:,} more portfolios</p>")
+
+    return (
+        "<div style='text-align: center; border: 2px solid #ddd; padding: 20px; width: 50%; margin: auto; "
+        "background-color: #f9f9f9; border-radius: 10px;'>"
+        + "".join(rows)
+        + "</div>"
+    )
+
+
+# Rank matrix (days x portfolios) for a stored portfolio values file, computed
+# once per file version and shared by every session
+@lru_cache(maxsize=4)
+def _rank_matrix(path, version):
+    df = load_portfolio_values(path)
+    ranks = rank_history(df.iloc[:, 1:].to_numpy(dtype=float))
+    ranks.setflags(write=False)
+    return ranks
+
+
+def load_rank_matrix(path=PORTFOLIO_VALUES_FILE):
+    return _rank_matrix(path, file_version(path))
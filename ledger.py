@@ -0,0 +1,184 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from portfolio_data import PORTFOLIO_VALUES_FILE, file_version, load_portfolio_values
+from portfolios import ALLOCATIONS, BASE_CURRENCY, INITIAL_INVESTMENT
+from price_store import fx_rates, load_price_matrix, price_files
+
+# Event kinds recorded in a ledger
+DEPOSIT, TRADE, DIVIDEND, SPLIT = range(4)
+
+# One row per event. 'quantity' is the cash amount for deposits, the shares bought
+# (negative when sold) for trades, the cash per share for dividends and the share
+# ratio for splits. 'price' is the execution price of a trade; NaN means the day's close.
+EVENT_DTYPE = np.dtype([
+    ('day', 'datetime64[D]'),
+    ('kind', np.int8),
+    ('ticker', np.int32),
+    ('quantity', np.float64),
+    ('price', np.float64),
+])
+
+
+# Append-only record of one portfolio's cash, trades and corporate actions over
+# a fixed ticker universe. Events live in one structured array that grows by doubling.
+class PositionLedger:
+    def __init__(self, tickers, capacity=16):
+        self.tickers = pd.Index(tickers)
+        self._events = np.zeros(capacity, dtype=EVENT_DTYPE)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def events(self):
+        events = self._events[:self._size]
+        events.setflags(write=False)
+        return events
+
+    def _record(self, day, kind, ticker, quantity, price=np.nan):
+        if self._size == len(self._events):
+            self._events = np.concatenate([self._events, np.zeros(len(self._events), dtype=EVENT_DTYPE)])
+        ticker_index = -1 if ticker is None else self.tickers.get_loc(ticker)
+        self._events[self._size] = (np.datetime64(pd.Timestamp(day).date(), 'D'), kind, ticker_index, quantity, price)
+        self._size += 1
+
+    def deposit(self, day, amount):
+        self._record(day, DEPOSIT, None, amount)
+
+    def buy(self, day, ticker, shares, price=np.nan):
+        self._record(day, TRADE, ticker, shares, price)
+
+    def sell(self, day, ticker, shares, price=np.nan):
+        self._record(day, TRADE, ticker, -shares, price)
+
+    def dividend(self, day, ticker, per_share):
+        self._record(day, DIVIDEND, ticker, per_share)
+
+    def split(self, day, ticker, ratio):
+        self._record(day, SPLIT, ticker, ratio)
+
+    # Shares held and cash at the close of every day of a (dates x tickers) price
+    # frame with the ledger's tickers as columns. Events on non-trading days take
+    # effect on the next trading day; events after the last day are not replayed,
+    # and nothing is held before the first event.
+    #
+    # Shares are accumulated in pre-split "base" units so splits never rewrite
+    # history: a trade of q shares on day d adds q / factor[d] base units, and the
+    # holding on any day is its running base units times that day's split factor.
+    # The replay is a scatter of the events plus one cumulative sum per array.
+    def replay(self, prices):
+        price_values = prices.to_numpy(dtype=float)
+        n_days, n_tickers = price_values.shape
+        days = np.searchsorted(prices.index.to_numpy().astype('datetime64[D]'), self.events['day'])
+        inside = days < n_days
+        events, days = self.events[inside], days[inside]
+        kinds, tickers, quantities = events['kind'], events['ticker'], events['quantity']
+
+        splits = kinds == SPLIT
+        log_factor = np.zeros((n_days, n_tickers))
+        np.add.at(log_factor, (days[splits], tickers[splits]), np.log(quantities[splits]))
+        factor = np.exp(np.cumsum(log_factor, axis=0))
+
+        trades = kinds == TRADE
+        trade_days, trade_tickers = days[trades], tickers[trades]
+        base_units = np.zeros((n_days, n_tickers))
+        np.add.at(base_units, (trade_days, trade_tickers), quantities[trades] / factor[trade_days, trade_tickers])
+        shares = np.cumsum(base_units, axis=0) * factor
+
+        cash_flows = np.zeros(n_days)
+        deposits = kinds == DEPOSIT
+        np.add.at(cash_flows, days[deposits], quantities[deposits])
+        trade_prices = np.where(np.isnan(events['price'][trades]), price_values[trade_days, trade_tickers], events['price'][trades])
+        np.add.at(cash_flows, trade_days, -quantities[trades] * trade_prices)
+        # Dividends are paid on the shares held at the previous close
+        dividends = kinds == DIVIDEND
+        dividend_days, dividend_tickers = days[dividends], tickers[dividends]
+        held = np.where(dividend_days > 0, shares[np.maximum(dividend_days - 1, 0), dividend_tickers], 0)
+        np.add.at(cash_flows, dividend_days, quantities[dividends] * held)
+        cash = np.cumsum(cash_flows)
+
+        shares.setflags(write=False)
+        cash.setflags(write=False)
+        return shares, cash
+
+    # Daily market value of the holdings (dates x tickers) and of the whole portfolio
+    def valuation(self, prices):
+        shares, cash = self.replay(prices)
+        holding_values = np.where(shares != 0, shares * np.nan_to_num(prices.to_numpy(dtype=float)), 0)
+        return holding_values, holding_values.sum(axis=1) + cash
+
+
+# Ledger of a buy-and-hold portfolio: the initial investment is deposited and
+# split across the allocation at the first day's closing prices
+def ledger_from_allocation(allocation, start_day, prices):
+    ledger = PositionLedger(prices.columns, capacity=len(allocation) + 1)
+    start_prices = prices.loc[start_day]
+    ledger.deposit(start_day, INITIAL_INVESTMENT)
+    for ticker, weight in allocation.items():
+        ledger.buy(start_day, ticker, INITIAL_INVESTMENT * weight / start_prices[ticker])
+    return ledger
+
+
+# Ledgers of every registered portfolio, starting on the competition's first day.
+# Shares are bought at the prices of `adjustment`, so a portfolio is valued at its
+# initial investment on that day whichever adjustment it is valued with.
+@lru_cache(maxsize=4)
+def _ledgers(files, adjustment):
+    prices = load_price_matrix(adjustment)
+    start_day = load_portfolio_values()['Day'].iloc[0]
+    return {portfolio: ledger_from_allocation(allocation, start_day, prices) for portfolio, allocation in ALLOCATIONS.items()}
+
+
+# Files the ledgers depend on: the competition calendar and the price matrix
+def ledger_files():
+    return [PORTFOLIO_VALUES_FILE] + price_files()
+
+
+def load_ledgers(adjustment='split'):
+    return _ledgers(tuple((path, file_version(path)) for path in ledger_files()), adjustment)
+
+
+# Dollar value of every portfolio's holdings on the latest day (portfolios x tickers),
+# aligned with the columns of the price matrix, replayed from the ledgers
+@lru_cache(maxsize=2)
+def _positions(files):
+    prices = load_price_matrix()
+    ledgers = load_ledgers()
+    portfolios = list(ledgers)
+    positions = np.vstack([ledgers[portfolio].valuation(prices)[0][-1] for portfolio in portfolios])
+    positions.setflags(write=False)
+    return portfolios, prices.columns, positions
+
+
+def load_positions():
+    return _positions(tuple((path, file_version(path)) for path in ledger_files()))
+
+
+# Daily value of every portfolio (dates x portfolios) from the competition's first day.
+# With 'total' prices the holdings are valued with dividends reinvested.
+@lru_cache(maxsize=4)
+def _valuations(files, adjustment):
+    prices = load_price_matrix(adjustment)
+    ledgers = _ledgers(files, adjustment)
+    start = prices.index.searchsorted(load_portfolio_values()['Day'].iloc[0])
+    totals = {portfolio: ledger.valuation(prices)[1][start:] for portfolio, ledger in ledgers.items()}
+    return pd.DataFrame(totals, index=prices.index[start:])
+
+
+# Valuations in another currency reuse the base-currency histories: cash and holdings
+# are both converted by the day's rate, so it is one multiply of the totals
+@lru_cache(maxsize=8)
+def _valuations_in(files, adjustment, currency):
+    valuations = _valuations(files, adjustment)
+    return valuations.mul(fx_rates(valuations.index, currency), axis=0)
+
+
+def load_valuations(adjustment='split', currency=BASE_CURRENCY):
+    files = tuple((path, file_version(path)) for path in ledger_files())
+    if currency == BASE_CURRENCY:
+        return _valuations(files, adjustment)
+    return _valuations_in(files, adjustment, currency)
@@ -0,0 +1,104 @@
+import argparse
+import json
+import os
+from datetime import datetime, timezone
+
+from portfolio_data import file_version
+
+# Lineage of a generated dataset is kept next to it, e.g. fx_rates.csv.lineage.json:
+#   {"version": content hash of the dataset,
+#    "producer": the function or script that wrote it,
+#    "parameters": the arguments it was called with,
+#    "inputs": {input path: content hash at the time},
+#    "created": UTC timestamp}
+LINEAGE_SUFFIX = ".lineage.json"
+
+
+def lineage_file(path):
+    return path + LINEAGE_SUFFIX
+
+
+# Record how `path` was just produced. Call after the dataset is written.
+def write_lineage(path, producer, inputs=(), parameters=None):
+    record = {
+        'version': file_version(path),
+        'producer': producer,
+        'parameters': parameters or {},
+        'inputs': {input_path: file_version(input_path) for input_path in inputs},
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+    }
+    with open(lineage_file(path), 'w', encoding='utf-8') as f:
+        json.dump(record, f, indent=2, default=str)
+    return record
+
+
+def read_lineage(path):
+    try:
+        with open(lineage_file(path), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+# Whether a dataset is exactly what its lineage says: its content is unchanged since
+# it was produced and so is every input. Missing lineage or inputs count as stale.
+def is_current(path, inputs=None, parameters=None):
+    record = read_lineage(path)
+    if record is None or not os.path.exists(path) or record['version'] != file_version(path):
+        return False
+    if parameters is not None and record['parameters'] != json.loads(json.dumps(parameters, default=str)):
+        return False
+    recorded = record['inputs']
+    if inputs is not None and sorted(recorded) != sorted(inputs):
+        return False
+    return all(os.path.exists(input_path) and file_version(input_path) == version
+               for input_path, version in recorded.items())
+
+
+# One line per dataset: version, and for generated ones where it came from and
+# whether it still matches its inputs
+def lineage_report(paths):
+    rows = []
+    for path in paths:
+        if not os.path.exists(path):
+            rows.append((path, '-', 'missing', ''))
+            continue
+        record = read_lineage(path)
+        if record is None:
+            rows.append((path, file_version(path)[:12], 'external', ''))
+        else:
+            status = 'current' if is_current(path) else 'stale'
+            rows.append((path, file_version(path)[:12], status, record['producer']))
+    return rows
+
+
+# Every stored dataset: the inputs of the price store and ledgers, each participant's
+# holding values, and the generated OHLCV bars and intraday levels
+def dataset_files():
+    from intraday import INTRADAY_DIR
+    from ohlcv import OHLCV_DIR
+    from portfolio_data import PORTFOLIO_VALUES_FILE, participant_file
+    from portfolios import ALLOCATIONS
+    from price_store import FX_RATES_FILE, price_files
+
+    paths = [PORTFOLIO_VALUES_FILE, *price_files(), FX_RATES_FILE]
+    paths += [participant_file(participant, 'stock_daily_returns') for participant in ALLOCATIONS]
+    for directory in (OHLCV_DIR, INTRADAY_DIR):
+        for root, _, names in sorted(os.walk(directory)):
+            paths += [os.path.join(root, name) for name in sorted(names) if not name.endswith(LINEAGE_SUFFIX)]
+    return list(dict.fromkeys(paths))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the version and lineage of every dataset.")
+    parser.add_argument('paths', nargs='*', help="Datasets to report (default: everything the dashboard reads)")
+    args = parser.parse_args()
+
+    rows = lineage_report(args.paths or dataset_files())
+    width = max(len(row[0]) for row in rows)
+    for path, version, status, producer in rows:
+        print(f"{path:<{width}}  {version:<12}  {status:<8}  {producer}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,243 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from lineage import write_lineage
+from portfolio_data import file_version
+from price_store import load_price_matrix, price_files
+
+# Daily bars, one compressed file per ticker (ohlcv/AAPL.npz) holding a column per
+# field: 'date' as int32 days since the epoch, float64 prices and int64 volume
+OHLCV_DIR = "ohlcv"
+FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# Timeframes of the stock analysis tab; None is the whole stored history
+TIMEFRAMES = {
+    "Last 5 Days": pd.DateOffset(days=5),
+    "Last Month": pd.DateOffset(months=1),
+    "Last 6 Months": pd.DateOffset(months=6),
+    "Last Year": pd.DateOffset(years=1),
+    "All History": None,
+}
+
+# Above this many daily bars a window is drawn with weekly candles, then monthly ones
+MAX_CANDLES = 400
+
+OVERLAYS = ['SMA 20', 'SMA 50', 'EMA 20', 'Bollinger Bands', 'RSI 14']
+
+
+def ohlcv_file(ticker, directory=OHLCV_DIR):
+    return os.path.join(directory, f"{ticker}.npz")
+
+
+def save_ohlcv(ticker, bars, directory=OHLCV_DIR):
+    os.makedirs(directory, exist_ok=True)
+    days = bars.index.values.astype('datetime64[D]').astype(np.int32)
+    np.savez_compressed(ohlcv_file(ticker, directory), date=days,
+                        **{field: bars[field].to_numpy(dtype=np.int64 if field == 'Volume' else float)
+                           for field in FIELDS})
+
+
+# Versions of what a ticker's bars are read from: its own file (None when missing)
+# and the price matrix it falls back to
+def _versions(ticker):
+    path = ohlcv_file(ticker)
+    return (file_version(path) if os.path.exists(path) else None, *(file_version(p) for p in price_files()))
+
+
+# Bars of one ticker (dates x FIELDS). Tickers without a stored file fall back to the
+# closes of the price matrix, with no range or volume (Open, High, Low and Volume NaN).
+@lru_cache(maxsize=64)
+def _ohlcv(ticker, versions):
+    if versions[0] is not None:
+        with np.load(ohlcv_file(ticker)) as columns:
+            dates = pd.DatetimeIndex(columns['date'].astype('datetime64[D]'), name='Date')
+            return pd.DataFrame({field: columns[field] for field in FIELDS}, index=dates)
+
+    closes = load_price_matrix()[ticker].dropna()
+    bars = pd.DataFrame(np.nan, index=closes.index, columns=FIELDS)
+    bars['Close'] = closes
+    return bars
+
+
+def load_ohlcv(ticker):
+    return _ohlcv(ticker, _versions(ticker))
+
+
+def has_ranges(bars):
+    return bool(bars['High'].notna().any())
+
+
+# ----------------------------------------
+# Indicator kernels: whole-array numpy operations over a price vector; the first
+# window - 1 values (before a full window) are NaN
+# ----------------------------------------
+
+def _window_sum(x, window):
+    totals = np.full(len(x), np.nan)
+    if window <= len(x):
+        cumulative = np.concatenate([[0.0], np.cumsum(x)])
+        totals[window - 1:] = cumulative[window:] - cumulative[:-window]
+    return totals
+
+
+def sma(x, window):
+    return _window_sum(np.asarray(x, dtype=float), window) / window
+
+
+# Exponential moving average with smoothing alpha, seeded with the SMA of the first
+# window. The recursion e[t] = a*x[t] + (1-a)*e[t-1] is evaluated in blocks: inside a
+# block it is a weighted cumulative sum rescaled by powers of (1-a), and blocks are
+# short enough that those powers never underflow.
+def _ewm(x, alpha, window):
+    x = np.asarray(x, dtype=float)
+    out = np.full(len(x), np.nan)
+    if window > len(x):
+        return out
+    decay = 1 - alpha
+    block = max(1, int(-300 / np.log10(decay))) if decay > 0 else 1
+    previous = x[:window].mean()
+    out[window - 1] = previous
+    for start in range(window, len(x), block):
+        chunk = x[start:start + block]
+        powers = decay ** np.arange(1, len(chunk) + 1)
+        out[start:start + len(chunk)] = powers * (previous + np.cumsum(alpha * chunk / powers))
+        previous = out[start + len(chunk) - 1]
+    return out
+
+
+def ema(x, window):
+    return _ewm(x, 2 / (window + 1), window)
+
+
+# Middle band (SMA) and the bands num_std population standard deviations around it
+def bollinger(x, window=20, num_std=2):
+    x = np.asarray(x, dtype=float)
+    mean = sma(x, window)
+    variance = np.clip(_window_sum(x * x, window) / window - mean ** 2, 0, None)
+    width = num_std * np.sqrt(variance)
+    return mean, mean - width, mean + width
+
+
+# Wilder's relative strength index
+def rsi(x, window=14):
+    change = np.diff(np.asarray(x, dtype=float), prepend=np.nan)[1:]
+    out = np.full(len(x), np.nan)
+    if window >= len(x):
+        return out
+    gains = _ewm(np.clip(change, 0, None), 1 / window, window)
+    losses = _ewm(np.clip(-change, 0, None), 1 / window, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out[1:] = np.where(losses == 0, 100.0, 100 - 100 / (1 + gains / losses))
+    return out
+
+
+# ----------------------------------------
+# Technical frames and chart
+# ----------------------------------------
+
+# Bars plus every overlay, computed once over the full history so indicators are
+# warmed up at the start of any window
+@lru_cache(maxsize=64)
+def _technicals(ticker, versions):
+    bars = _ohlcv(ticker, versions).copy()
+    close = bars['Close'].to_numpy()
+    bars['SMA 20'] = sma(close, 20)
+    bars['SMA 50'] = sma(close, 50)
+    bars['EMA 20'] = ema(close, 20)
+    bars['Bollinger Mid'], bars['Bollinger Lower'], bars['Bollinger Upper'] = bollinger(close, 20)
+    bars['RSI 14'] = rsi(close, 14)
+    return bars
+
+
+# Candles of one bar per `freq` period from daily bars, in one groupby pass
+def _resample(bars, freq):
+    grouped = bars.groupby(bars.index.to_period(freq).start_time.rename('Date'))
+    candles = grouped.agg({'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last'})
+    candles['Volume'] = grouped['Volume'].sum(min_count=1)
+    overlays = grouped[[column for column in bars.columns if column not in FIELDS]].last()
+    return candles.join(overlays)
+
+
+# Bars of a ticker inside a timeframe, coarsened to weekly or monthly candles when
+# the window holds more than MAX_CANDLES days; cached per (ticker, timeframe)
+@lru_cache(maxsize=256)
+def _technical_window(ticker, timeframe, versions):
+    bars = _technicals(ticker, versions)
+    offset = TIMEFRAMES[timeframe]
+    if offset is not None:
+        bars = bars[bars.index >= bars.index.max() - offset]
+    candles = bars
+    for freq in ('W', 'M'):
+        if len(candles) <= MAX_CANDLES:
+            break
+        candles = _resample(bars, freq)
+    return candles
+
+
+def technical_window(ticker, timeframe):
+    return _technical_window(ticker, timeframe, _versions(ticker))
+
+
+# Candlestick (or close line without stored ranges) with the chosen overlays, a volume
+# panel and an RSI panel when selected
+def candlestick_figure(ticker, timeframe, overlays=()):
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    bars = technical_window(ticker, timeframe)
+    show_rsi = 'RSI 14' in overlays
+    show_volume = bars['Volume'].notna().any()
+    panels = ['price'] + (['volume'] if show_volume else []) + (['rsi'] if show_rsi else [])
+    heights = {'price': 0.6, 'volume': 0.2, 'rsi': 0.2}
+    fig = make_subplots(rows=len(panels), cols=1, shared_xaxes=True, vertical_spacing=0.03,
+                        row_heights=[heights[panel] for panel in panels])
+
+    if has_ranges(bars):
+        fig.add_trace(go.Candlestick(x=bars.index, open=bars['Open'], high=bars['High'], low=bars['Low'],
+                                     close=bars['Close'], name=ticker), row=1, col=1)
+    else:
+        fig.add_trace(go.Scatter(x=bars.index, y=bars['Close'], name=ticker, mode='lines'), row=1, col=1)
+
+    for overlay in overlays:
+        if overlay == 'Bollinger Bands':
+            for band in ('Upper', 'Mid', 'Lower'):
+                fig.add_trace(go.Scatter(x=bars.index, y=bars[f'Bollinger {band}'], name=f'Bollinger {band}',
+                                         mode='lines', line=dict(width=1, dash='dot' if band == 'Mid' else 'solid')),
+                              row=1, col=1)
+        elif overlay != 'RSI 14':
+            fig.add_trace(go.Scatter(x=bars.index, y=bars[overlay], name=overlay, mode='lines', line=dict(width=1.5)),
+                          row=1, col=1)
+
+    if show_volume:
+        up = bars['Close'] >= bars['Open'].fillna(bars['Close'])
+        fig.add_trace(go.Bar(x=bars.index, y=bars['Volume'], name='Volume', showlegend=False,
+                             marker_color=np.where(up, 'green', 'red')), row=panels.index('volume') + 1, col=1)
+        fig.update_yaxes(title_text='Volume', row=panels.index('volume') + 1, col=1)
+    if show_rsi:
+        row = panels.index('rsi') + 1
+        fig.add_trace(go.Scatter(x=bars.index, y=bars['RSI 14'], name='RSI 14', mode='lines'), row=row, col=1)
+        for level in (30, 70):
+            fig.add_hline(y=level, line_dash='dash', line_color='gray', row=row, col=1)
+        fig.update_yaxes(title_text='RSI', range=[0, 100], row=row, col=1)
+
+    fig.update_yaxes(title_text='Stock Price ($)', row=1, col=1)
+    fig.update_layout(title=f"{ticker} Performance Over {timeframe}", xaxis_rangeslider_visible=False,
+                      height=450 + 150 * (len(panels) - 1))
+    return fig
+
+
+# Refresh the stored bars from Yahoo Finance (requires the yfinance package). Prices
+# are split-adjusted but not dividend-adjusted, like the split-adjusted price matrix.
+def download_ohlcv(tickers, start='2020-01-01', directory=OHLCV_DIR):
+    import yfinance as yf
+
+    quotes = yf.download(list(tickers), start=start, auto_adjust=False, group_by='ticker', progress=False)
+    for ticker in tickers:
+        bars = quotes[ticker][FIELDS].dropna(subset=['Close'])
+        bars.index = pd.DatetimeIndex(bars.index).tz_localize(None).normalize()
+        save_ohlcv(ticker, bars.fillna({'Volume': 0}), directory)
+        write_lineage(ohlcv_file(ticker, directory), 'ohlcv.download_ohlcv',
+                      parameters={'ticker': ticker, 'start': start, 'auto_adjust': False})
@@ -0,0 +1,42 @@
+import streamlit as st
+import plotly.express as px
+
+from risk import METHODS, holding_risk, portfolio_risk
+from warmup import record_render, warm_up
+
+# Preload the shared data cache and precomputed metrics (once per worker process)
+warm_up()
+
+# Streamlit app
+st.title("Value-at-Risk and Expected Shortfall")
+st.write("Potential losses on today's holdings, by historical simulation, a covariance-based "
+         "parametric model and Monte Carlo.")
+
+col1, col2 = st.columns(2)
+with col1:
+    confidence = st.select_slider("Confidence level", options=[0.90, 0.95, 0.975, 0.99], value=0.95,
+                                  format_func=lambda c: f"{c:.1%}")
+with col2:
+    horizon = st.select_slider("Horizon (trading days)", options=[1, 5, 10, 20], value=1)
+
+# Every portfolio at once; the covariance is shared across portfolios and methods
+risk_df = portfolio_risk(confidence, horizon)
+
+st.subheader("Portfolio Tail Risk")
+st.dataframe(risk_df.style.format('${:,.2f}'), width='stretch')
+
+var_df = risk_df[[f'{method} VaR ($)' for method in METHODS]].rename(columns=lambda c: c.replace(' VaR ($)', ''))
+var_melted = var_df.reset_index(names='Portfolio').melt(id_vars='Portfolio', var_name='Method', value_name='VaR ($)')
+fig_var = px.bar(var_melted, x='Portfolio', y='VaR ($)', color='Method', barmode='group',
+                 title=f"{confidence:.1%} {horizon}-Day Value-at-Risk by Method")
+st.plotly_chart(fig_var, width='stretch')
+st.caption("VaR is the loss not exceeded with the chosen confidence; Expected Shortfall (ES) is the average loss beyond it.")
+
+# Each holding on its own
+st.subheader("Holding Tail Risk")
+selected_portfolio = st.selectbox("Portfolio", list(risk_df.index), format_func=str.title)
+st.dataframe(holding_risk(selected_portfolio, confidence, horizon).style.format('${:,.2f}'),
+             width='stretch')
+
+# Time-to-first-render is logged once per worker process
+record_render()
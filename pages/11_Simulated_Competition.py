@@ -0,0 +1,54 @@
+import time
+
+import streamlit as st
+import plotly.express as px
+
+from leaderboard import leaderboard_html
+from simulator import entrant_metrics, simulate_competition
+from warmup import record_render, warm_up
+
+# Preload the shared data cache and precomputed metrics (once per worker process)
+warm_up()
+
+# Streamlit app
+st.title("Simulated Competition")
+st.write("Thousands of synthetic entrants with random allocations over the ticker universe, "
+         "valued together and ranked with the same leaderboard as the real competition.")
+
+# Simulation settings
+col1, col2, col3 = st.columns(3)
+with col1:
+    n_entrants = st.number_input("Entrants", min_value=10, max_value=100000, value=10000, step=1000)
+    seed = st.number_input("Random seed", min_value=0, value=0)
+with col2:
+    min_holdings, max_holdings = st.slider("Holdings per entrant", min_value=1, max_value=30, value=(3, 12))
+with col3:
+    concentration = st.select_slider("Weight concentration", options=[0.1, 0.3, 1.0, 3.0, 10.0], value=1.0,
+                                     help="Dirichlet concentration: small values give a few dominant positions, "
+                                          "large values near-equal weights")
+
+# Valuation is one matrix product for all entrants; results are cached per setting
+start = time.perf_counter()
+names, days, tickers, weights, values = simulate_competition(int(n_entrants), min_holdings, max_holdings,
+                                                             concentration, int(seed))
+metrics = entrant_metrics(names, values)
+st.caption(f"Simulated and ranked {len(names):,} entrants over {len(days)} days in {time.perf_counter() - start:.2f}s")
+
+# Leaderboard: only the visible top slice is selected and rendered
+st.subheader("Leaderboard")
+st.markdown(leaderboard_html(names, values[-1], 10, metrics['Previous Rank'].to_numpy()), unsafe_allow_html=True)
+
+# Distribution of outcomes
+st.subheader("Outcomes")
+fig_growth = px.histogram(metrics, x='Growth (%)', nbins=60, title="Growth of All Entrants")
+st.plotly_chart(fig_growth, width='stretch')
+
+fig_risk = px.scatter(metrics, x='Volatility', y='Growth (%)', hover_name='Entrant', render_mode='webgl',
+                      opacity=0.4, title="Growth vs Volatility of Daily Returns")
+st.plotly_chart(fig_risk, width='stretch')
+
+st.subheader("Top 25 Entrants")
+st.dataframe(metrics.nsmallest(25, 'Rank'), hide_index=True, width='stretch')
+
+# Time-to-first-render is logged once per worker process
+record_render()
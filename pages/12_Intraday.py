@@ -0,0 +1,57 @@
+import streamlit as st
+import plotly.express as px
+
+from intraday import INTRADAY_DIR, LEVELS, choose_level, intraday_range, intraday_values
+from leaderboard import leaderboard_html, rank_history
+from warmup import record_render, warm_up
+
+# Preload the shared data cache and precomputed metrics (once per worker process)
+warm_up()
+
+# Streamlit app
+st.title("Intraday")
+
+trading_days = intraday_range()
+if trading_days is None:
+    st.info(f"No intraday data yet. Add one file of minute bars per trading day as "
+            f"`{INTRADAY_DIR}/minute/YYYY-MM-DD.csv` with columns Datetime, Ticker, Open, High, Low, Close, Volume.")
+    record_render()
+    st.stop()
+
+first_day, last_day = trading_days
+col1, col2 = st.columns([2, 1])
+with col1:
+    window = st.date_input("Window", value=(last_day.date(), last_day.date()),
+                           min_value=first_day.date(), max_value=last_day.date())
+with col2:
+    resolution = st.selectbox("Resolution", ['Auto', *LEVELS],
+                              help="Auto picks the finest bars that keep the window readable: "
+                                   "minutes for a day or two, hours for a few weeks, days beyond")
+start, end = (window[0], window[-1]) if isinstance(window, tuple) else (window, window)
+
+# The window is the zoom level: short windows read minute bars for those days only,
+# longer ones read the pre-aggregated hourly or daily bars
+level = choose_level(start, end) if resolution == 'Auto' else resolution
+values = intraday_values(level, start, end)
+
+if values.empty:
+    st.warning("No intraday bars in this window.")
+else:
+    st.caption(f"{len(values):,} {level} bars from {values.index[0]:%Y-%m-%d %H:%M} to {values.index[-1]:%Y-%m-%d %H:%M}")
+
+    # Leaderboard at the latest bar; movement is against the open of that day
+    st.subheader("Intraday Leaderboard")
+    ranks = rank_history(values.to_numpy())
+    day_open = values.index.normalize().searchsorted(values.index[-1].normalize())
+    st.markdown(leaderboard_html(values.columns, values.iloc[-1].to_numpy(), 10, ranks[day_open]),
+                unsafe_allow_html=True)
+
+    fig = px.line(values, labels={'value': 'Portfolio Value ($)', 'Datetime': 'Time', 'variable': 'Portfolio'},
+                  title=f"Portfolio Values ({level} bars)")
+    # Skip the closed hours and weekends between sessions
+    if level != 'day':
+        fig.update_xaxes(rangebreaks=[dict(bounds=['sat', 'mon']), dict(bounds=[16, 9], pattern='hour')])
+    st.plotly_chart(fig, width='stretch')
+
+# Time-to-first-render is logged once per worker process
+record_render()
@@ -1,45 +1,27 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import matplotlib.pyplot as plt
 
-# Load the portfolio data
-file_path = 'clean_withSMP500_Jan22.csv'  # Update with your file path
-df = pd.read_csv(file_path)
+from attribution import attribution, attribution_bounds, contribution_bar, contribution_waterfall
+from holdings import load_holdings_index
+from ohlcv import OVERLAYS, TIMEFRAMES, candlestick_figure
+from portfolio_data import load_portfolio_values, load_stock_prices, load_stock_values
+from portfolio_metrics import holding_summary, holding_volatility, portfolio_summary
+from quotes import live_value
+from rolling import PORTFOLIO_BENCHMARK, ROLLING_METRICS, STOCK_BENCHMARK, portfolio_rolling, rolling_figure, stock_rolling
+from waterfall import BUCKETS, stock_waterfall
+from warmup import record_render, warm_up
+from what_if import render_what_if
 
-# Convert 'Day' column to datetime format
-df['Day'] = pd.to_datetime(df['Day'])
+# Preload the shared data cache and precomputed metrics (once per worker process)
+warm_up()
+
+# Load the portfolio data (shared between sessions, never modified)
+df = load_portfolio_values()
 
 # Extract Bryan's portfolio and relevant data
 bryan_portfolio = df[['Day', 'bryan', 'SMP-500']]
-
-# Calculate percentage change in portfolio value over time
-bryan_portfolio['Portfolio Change (%)'] = bryan_portfolio['bryan'].pct_change() * 100
-
-# Bryan's portfolio allocations
-allocations = {
-    'PDS': 0.15,
-    'BRK-B': 0.15,
-    'GOOG': 0.10,
-    'NTR': 0.05,
-    'FLUT': 0.10,
-    'DECK': 0.10,
-    'GOLD': 0.05,
-    'TGT': 0.05,
-    'KB': 0.05,
-    'NKE': 0.10,
-    'MU': 0.10
-}
-
-
-# Simulate the investment distribution based on allocation percentages
-initial_investment = 10000  # Assuming initial investment amount
-impact_data = {stock: (allocations[stock] * initial_investment) for stock in allocations}
-
-# Create a DataFrame for visualization
-impact_df = pd.DataFrame(list(impact_data.items()), columns=['Stock', 'Investment'])
-impact_df['Deviation from Avg'] = impact_df['Investment'] - impact_df['Investment'].mean()
-impact_df = impact_df.sort_values(by='Deviation from Avg', ascending=False)
+summary = portfolio_summary(bryan_portfolio['Day'].to_numpy(), bryan_portfolio['bryan'].to_numpy())
 
 # Streamlit app
 st.title("Bryan's Portfolio Analysis")
@@ -57,99 +39,127 @@ with tab1:
 
     # Key Portfolio Metrics
     st.subheader("Key Portfolio Metrics")
-    initial_value = bryan_portfolio['bryan'].iloc[0]
-    current_value = bryan_portfolio['bryan'].iloc[-1]
-    growth = ((current_value - initial_value) / initial_value) * 100
+    initial_value = summary['initial_value']
+    current_value = summary['current_value']
+    growth = summary['growth']
     col1, col2, col3 = st.columns(3)
     with col1:
         st.metric(label="Starting Value ($)", value=f"{initial_value:,.2f}")
     with col2:
-        st.metric(label="Current Value ($)", value=f"{current_value:,.2f}")
+        # Marked to market from the quote service when it is running
+        live = live_value('bryan')
+        if live is None:
+            st.metric(label="Current Value ($)", value=f"{current_value:,.2f}")
+        else:
+            st.metric(label="Current Value ($, live)", value=f"{live[1]:,.2f}", delta=f"{live[1] - live[2]:+,.2f} since close",
+                      help=f"Latest quotes at {live[0]:%H:%M:%S} UTC")
     with col3:
         st.metric(label="Growth (%)", value=f"{growth:.2f}%")
 
     # Best and Worst Days
-    bryan_portfolio['Daily Change'] = bryan_portfolio['bryan'].diff()
-    best_day = bryan_portfolio.loc[bryan_portfolio['Daily Change'].idxmax()]
-    worst_day = bryan_portfolio.loc[bryan_portfolio['Daily Change'].idxmin()]
-
-    st.write(f"**Best Day:** {best_day['Day'].date()} with an increase of ${best_day['Daily Change']:.2f}")
-    st.write(f"**Worst Day:** {worst_day['Day'].date()} with a decrease of ${worst_day['Daily Change']:.2f}")
+    best_day = pd.Timestamp(summary['best_day'])
+    worst_day = pd.Timestamp(summary['worst_day'])
+
+    st.write(f"**Best Day:** {best_day.date()} with an increase of ${summary['best_change']:.2f}")
+    st.write(f"**Worst Day:** {worst_day.date()} with a decrease of ${summary['worst_change']:.2f}")
+
+    # Rolling return, volatility and correlation to the S&P 500 over a trailing window;
+    # each window is computed once for every portfolio and then cached
+    st.subheader("Rolling Analytics")
+    max_window = min(60, len(df) - 1)
+    window = st.slider("Rolling window (trading days)", min_value=2, max_value=max_window,
+                       value=min(20, max_window), key='portfolio_window')
+    rolling_metric = st.radio("Rolling metric:", ROLLING_METRICS, horizontal=True, key='portfolio_metric')
+    fig_rolling = rolling_figure(portfolio_rolling(window)[rolling_metric], ['bryan', PORTFOLIO_BENCHMARK],
+                                 rolling_metric, title=f"{window}-Day Rolling {rolling_metric}")
+    st.plotly_chart(fig_rolling)
 
     #___________________________________________________________________________________________________________________________
 
-    # Investment Contribution Breakdown Pie Chart
+    # Investment Contribution Breakdown: each holding's share of the portfolio's change
     st.subheader("Investment Contribution Breakdown")
-    fig2 = px.pie(impact_df, values='Investment', names='Stock', 
-                title="Contribution of Each Investment")
+    first_day, last_day = attribution_bounds('bryan')
+    contribution_window = st.date_input("Contribution window", value=(first_day, last_day),
+                                        min_value=first_day, max_value=last_day)
+    window_start, window_end = contribution_window if len(contribution_window) == 2 else (contribution_window[0], last_day)
+    contributions = attribution('bryan', window_start, window_end)
+
+    fig2 = contribution_bar(contributions, "Contribution of Each Investment")
     st.plotly_chart(fig2)
 
+    fig3 = contribution_waterfall(contributions, "From Starting to Ending Portfolio Value")
+    st.plotly_chart(fig3)
+    #___________________________________________________________________________________________________________________________
+
+    # What-If Allocation: sliders reweight the holdings and revalue the whole history
+    st.subheader("What-If Allocation")
+    render_what_if('bryan')
+
 ##############################################################################################################################
 
 with tab2:
     # Stock Analysis Section
     st.subheader("Stock Analysis")
 
-    # Load additional stock analysis data
-    stock_prices = pd.read_csv('bryan_individual_stock_prices.csv')
-    stock_returns = pd.read_csv('bryan_stock_daily_returns.csv')
-
-    # Convert 'Date' column to datetime
-    stock_prices['Date'] = pd.to_datetime(stock_prices['Date'])
-
-    # Timeframe selection
-    timeframe_options = {
-        "Last 5 Days": stock_prices[stock_prices['Date'] >= stock_prices['Date'].max() - pd.DateOffset(days=5)],
-        "Last Month": stock_prices[stock_prices['Date'] >= stock_prices['Date'].max() - pd.DateOffset(months=1)],
-        "Last 6 Months": stock_prices[stock_prices['Date'] >= stock_prices['Date'].max() - pd.DateOffset(months=6)],
-        "Last Year": stock_prices[stock_prices['Date'] >= stock_prices['Date'].max() - pd.DateOffset(years=1)]
-    }
+    # Load additional stock analysis data (shared between sessions, never modified)
+    stock_prices = load_stock_prices('bryan')
+    stock_returns = load_stock_values('bryan')
 
-    selected_timeframe = st.radio("Select Timeframe:", list(timeframe_options.keys()), index=3, horizontal=True)
-    filtered_data = timeframe_options[selected_timeframe]
+    # Timeframe selection; only the selected window is filtered
+    selected_timeframe = st.radio("Select Timeframe:", list(TIMEFRAMES), index=3, horizontal=True)
+    offset = TIMEFRAMES[selected_timeframe]
+    filtered_data = stock_prices if offset is None else stock_prices[stock_prices['Date'] >= stock_prices['Date'].max() - offset]
 
     # Select stock to analyze
     selected_stock = st.selectbox("Select a stock to analyze:", stock_prices.columns.drop(['Index', 'Date']))
 
-    # Plot stock performance with selected timeframe
-    fig = px.line(filtered_data, x='Date', y=selected_stock, 
-                  title=f"{selected_stock} Performance Over {selected_timeframe}",
-                  labels={'x': 'Date', 'y': 'Stock Price ($)'})
+    # Candlesticks, volume and technical overlays of the selected stock; indicators are
+    # computed once over its full history and each (stock, timeframe) window is cached
+    selected_overlays = st.multiselect("Technical overlays:", OVERLAYS, default=['SMA 20'])
+    fig = candlestick_figure(selected_stock, selected_timeframe, selected_overlays)
     st.plotly_chart(fig)
-    st.caption("This chart shows the stock price movement of the selected stock over the chosen timeframe.")
+    st.caption("This chart shows the daily price range of the selected stock over the chosen timeframe, "
+               "with weekly or monthly candles for long histories. Stocks without stored OHLCV data show closing prices only.")
+
+    # Other portfolios holding the selected stock
+    other_holders = load_holdings_index().other_holders(selected_stock, 'bryan')
+    if other_holders.empty:
+        st.write(f"No other portfolio holds {selected_stock}.")
+    else:
+        st.write("**Also held by:** " + ", ".join(f"{portfolio} ({weight:.1%})" for portfolio, weight in other_holders.itertuples(index=False)))
+
+    # Rolling statistics of the selected stock against the S&P 500 ETF
+    stock_window = st.slider("Rolling window (trading days)", min_value=5, max_value=120, value=60, step=5,
+                             key='stock_window')
+    stock_metric = st.radio("Rolling metric:", ROLLING_METRICS, horizontal=True, key='stock_metric')
+    fig_stock_rolling = rolling_figure(stock_rolling(stock_window)[stock_metric], [selected_stock, STOCK_BENCHMARK],
+                                       stock_metric, title=f"{selected_stock} {stock_window}-Day Rolling {stock_metric}")
+    st.plotly_chart(fig_stock_rolling)
 
     #______________________________________________________________________________________________________________
 
     # Waterfall chart for cash flow analysis
     st.subheader(f"Cash Flow Waterfall Chart for {selected_stock}")
 
-    # Calculate deviation from initial investment
-    initial_investment_value = stock_returns[selected_stock].iloc[0]
-    stock_returns['Adjusted Return'] = stock_returns[selected_stock] - initial_investment_value
-
-    # Filter returns data for the selected stock
-    selected_stock_returns = stock_returns[['Date', 'Adjusted Return']].copy()
-
-    # Calculate summary statistics
-    current_value = selected_stock_returns['Adjusted Return'].iloc[-1]
-    peak_value = selected_stock_returns['Adjusted Return'].max()
-    lowest_value = selected_stock_returns['Adjusted Return'].min()
-    average_performance = selected_stock_returns['Adjusted Return'].mean()
-    volatility = selected_stock_returns['Adjusted Return'].std()
-
-    # Create a waterfall chart using Plotly
-    fig_waterfall = px.bar(
-        selected_stock_returns, 
-        x='Date', 
-        y='Adjusted Return', 
-        title=f"{selected_stock} Daily Cash Flows Relative to Initial Investment",
-        labels={'x': 'Date', 'y': 'Cash Flow Change ($)'},
-        text=selected_stock_returns['Adjusted Return'].round(2),
+    # Deviation from initial investment and summary statistics
+    stock_summary = holding_summary(stock_returns[selected_stock].to_numpy())
+    initial_investment_value = stock_summary['initial_value']
+    current_value = stock_summary['current_gain']
+    peak_value = stock_summary['peak']
+    lowest_value = stock_summary['lowest']
+    average_performance = stock_summary['average']
+    volatility = stock_summary['volatility']
+
+    # Waterfall of the holding's value changes over the selected timeframe; windows with
+    # many changes are aggregated into weekly or monthly bars so the bar count stays bounded
+    bucket_choice = st.radio("Aggregate by:", ['Auto', *BUCKETS], horizontal=True)
+    fig_waterfall = stock_waterfall(
+        'bryan', selected_stock, filtered_data['Date'].min().date(), filtered_data['Date'].max().date(),
+        bucket=BUCKETS.get(bucket_choice),
+        title=f"{selected_stock} Value Changes Over {selected_timeframe}",
     )
-
-    fig_waterfall.update_traces(marker_color=['green' if x >= 0 else 'red' for x in selected_stock_returns['Adjusted Return']])
     st.plotly_chart(fig_waterfall)
-    st.caption("This chart shows the daily cash flow changes for the selected stock relative to its initial investment, with positive values in green and negative values in red.")
+    st.caption("This chart starts from the stock's value at the beginning of the timeframe (within the competition) and adds each period's gain (green) or loss (red) to reach its current value.")
 
     # Display summary statistics
 
@@ -166,12 +176,9 @@ with tab2:
 
     #_______________________________________________________________________________________________________________________
     
-    if 'Adjusted Return' in stock_returns.columns:
-        stock_returns = stock_returns.drop(columns=['Adjusted Return'])
-
     # Calculate volatility (standard deviation of daily returns) for each stock
-    volatility = stock_returns.iloc[:, 2:].std().sort_values(ascending=False).reset_index()
-    volatility.columns = ['Stock', 'Volatility']
+    stocks, stock_volatility = holding_volatility(stock_returns.columns[2:], stock_returns.iloc[:, 2:].to_numpy())
+    volatility = pd.DataFrame({'Stock': stocks, 'Volatility': stock_volatility})
 
     # Plot volatility comparison
     st.subheader("Stock Volatility Comparison")
@@ -182,3 +189,6 @@ with tab2:
     st.plotly_chart(fig)
 
     st.caption("This chart compares the volatility of different stocks based on the standard deviation of their daily returns.")
+
+# Time-to-first-render is logged once per worker process
+record_render()
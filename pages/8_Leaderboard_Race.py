@@ -0,0 +1,67 @@
+import streamlit as st
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from leaderboard import load_rank_matrix
+from portfolio_data import load_portfolio_values
+from warmup import record_render, warm_up
+
+# Preload the shared data cache and precomputed metrics (once per worker process)
+warm_up()
+
+# Load the portfolio data and its precomputed rank matrix (days x portfolios)
+df = load_portfolio_values()
+ranks = load_rank_matrix()
+portfolio_names = df.columns[1:]
+values = df.iloc[:, 1:].to_numpy(dtype=float)
+days = df['Day'].dt.strftime('%Y-%m-%d').to_numpy()
+
+# Streamlit app
+st.title("Leaderboard Race")
+st.write("How each portfolio's leaderboard position changed day by day.")
+
+tab1, tab2 = st.tabs(["Race", "Rank History"])
+
+with tab1:
+    # Only the portfolios inside the top slice on a given day become frames
+    n_top = st.slider("Portfolios per frame", min_value=3, max_value=min(25, len(portfolio_names)),
+                      value=min(10, len(portfolio_names)))
+    day_idx, portfolio_idx = np.nonzero(ranks <= n_top)
+    race_df = pd.DataFrame({
+        'Day': days[day_idx],
+        'Portfolio': portfolio_names[portfolio_idx],
+        'Rank': ranks[day_idx, portfolio_idx],
+        'Value': values[day_idx, portfolio_idx],
+    })
+
+    # The animation is played in the browser, frames are sent once
+    fig_race = px.bar(race_df, x='Value', y='Rank', color='Portfolio', text='Portfolio',
+                      orientation='h', animation_frame='Day', animation_group='Portfolio',
+                      range_x=[values.min() * 0.98, values.max() * 1.02],
+                      title="Portfolio Values by Leaderboard Position",
+                      labels={'Value': 'Portfolio Value ($)', 'Rank': 'Rank'})
+    fig_race.update_yaxes(autorange='reversed', dtick=1)
+    fig_race.update_layout(showlegend=False, height=150 + 40 * n_top)
+    st.plotly_chart(fig_race, width='stretch')
+    st.caption("Press play to watch the leaderboard evolve over the competition.")
+
+with tab2:
+    # Bump chart of ranks over time for the selected portfolios
+    current_order = portfolio_names[np.argsort(ranks[-1], kind='stable')]
+    selected = st.multiselect("Select portfolios", current_order, default=list(current_order[:10]))
+    selected_idx = [portfolio_names.get_loc(name) for name in selected]
+
+    rank_df = pd.DataFrame(ranks[:, selected_idx], columns=selected)
+    rank_df.insert(0, 'Day', df['Day'])
+    rank_melted = rank_df.melt(id_vars=['Day'], var_name='Portfolio', value_name='Rank')
+
+    fig_bump = px.line(rank_melted, x='Day', y='Rank', color='Portfolio', markers=True,
+                       title="Leaderboard Position Over Time",
+                       labels={'Day': 'Date', 'Rank': 'Rank'})
+    fig_bump.update_yaxes(autorange='reversed', dtick=1)
+    fig_bump.update_layout(hovermode="x unified")
+    st.plotly_chart(fig_bump, width='stretch')
+
+# Time-to-first-render is logged once per worker process
+record_render()
@@ -0,0 +1,81 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from portfolios import SECTORS
+from price_store import load_price_matrix
+from stress_test import PREDEFINED_SCENARIOS, holding_impact, run_stress_test
+from warmup import record_render, warm_up
+
+# Preload the shared data cache and precomputed metrics (once per worker process)
+warm_up()
+
+# Streamlit app
+st.title("Scenario Stress Test")
+st.write("Applies historical and hypothetical shocks to every portfolio's current holdings.")
+
+# Scenario selection
+scenario_names = [scenario['name'] for scenario in PREDEFINED_SCENARIOS]
+selected_names = st.multiselect("Select scenarios", scenario_names, default=scenario_names)
+scenarios = [scenario for scenario in PREDEFINED_SCENARIOS if scenario['name'] in selected_names]
+
+# Custom scenario: per-sector shocks and/or a replay of a stored window
+with st.expander("Build a custom scenario"):
+    sector_shocks = {}
+    sector_columns = st.columns(3)
+    for i, sector in enumerate(sorted(set(SECTORS.values()))):
+        with sector_columns[i % 3]:
+            shock = st.slider(f"{sector} (%)", min_value=-50, max_value=50, value=0, step=1)
+        if shock:
+            sector_shocks[sector] = shock / 100
+
+    prices = load_price_matrix()
+    first_day, last_day = prices.index[0].date(), prices.index[-1].date()
+    use_replay = st.checkbox("Replay a historical window")
+    replay_window = st.date_input("Replay window", value=(first_day, last_day),
+                                  min_value=first_day, max_value=last_day, disabled=not use_replay)
+
+    custom_scenario = {'name': "Custom scenario"}
+    if sector_shocks:
+        custom_scenario['sectors'] = sector_shocks
+    if use_replay and len(replay_window) == 2:
+        custom_scenario['replay'] = tuple(str(day) for day in replay_window)
+    if len(custom_scenario) > 1:
+        scenarios.append(custom_scenario)
+
+if not scenarios:
+    st.info("Select at least one scenario.")
+    st.stop()
+
+# All portfolios under all scenarios in one batched evaluation
+pnl_df, pct_df = run_stress_test(scenarios)
+
+st.subheader("Portfolio Impact (%)")
+fig_impact = px.imshow(pct_df, color_continuous_scale='RdYlGn', color_continuous_midpoint=0,
+                       text_auto='.1f', aspect='auto',
+                       labels={'x': 'Scenario', 'y': 'Portfolio', 'color': 'Impact (%)'})
+st.plotly_chart(fig_impact, width='stretch')
+
+st.subheader("Portfolio Impact ($)")
+st.dataframe(pnl_df.style.format('${:,.2f}'), width='stretch')
+
+# Per-holding breakdown for one portfolio and scenario
+st.subheader("Impact by Holding")
+col1, col2 = st.columns(2)
+with col1:
+    selected_portfolio = st.selectbox("Portfolio", list(pnl_df.index), format_func=str.title)
+with col2:
+    selected_scenario = st.selectbox("Scenario", [scenario['name'] for scenario in scenarios])
+
+impact_df = holding_impact(selected_portfolio, next(s for s in scenarios if s['name'] == selected_scenario))
+fig_holdings = px.bar(impact_df, x='Stock', y='P&L ($)',
+                      color=pd.Series(impact_df['P&L ($)'] >= 0).map({True: 'Gain', False: 'Loss'}),
+                      color_discrete_map={'Gain': 'green', 'Loss': 'red'},
+                      hover_data={'Position ($)': ':,.2f', 'Shock (%)': ':.1f'},
+                      title=f"{selected_portfolio.title()} under {selected_scenario}",
+                      labels={'color': ''})
+st.plotly_chart(fig_holdings, width='stretch')
+st.caption("Hypothetical scenarios are illustrative shocks; replays apply each stock's stored return over the window to today's positions.")
+
+# Time-to-first-render is logged once per worker process
+record_render()
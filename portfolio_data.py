@@ -0,0 +1,84 @@
+import hashlib
+import os
+import threading
+from functools import lru_cache
+
+import pandas as pd
+
+from validation import read_validated
+
+# Cached frames are handed to every session as the same object. With copy-on-write,
+# frames derived from them never write through (always on from pandas 3).
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+# Portfolio values for every participant plus the benchmarks
+PORTFOLIO_VALUES_FILE = "clean_withSMP500_withForestFunds_Jan22.csv"
+
+# Exported final values of the participants (month/day/year dates); checked by the
+# data quality report but not read by the dashboard
+FINAL_PORTFOLIO_VALUES_FILE = "final_portfolio_values_Jan22.csv"
+
+
+# Content hashes by path, with the (mtime, size) they were computed at
+_hashes = {}
+_hashes_lock = threading.Lock()
+
+
+# Version of a file: a hash of its content, so every cache keyed on it is invalidated
+# exactly when the data changes. A file rewritten with the same content (e.g. a refresh
+# that found nothing new) keeps its version and nothing is recomputed. The hash is only
+# recomputed when the file's modification time or size changes.
+def file_version(path):
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _hashes.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    version = digest.hexdigest()
+    with _hashes_lock:
+        _hashes[path] = (key, version)
+    return version
+
+
+# Tables are validated and their names normalized once per version, at ingest
+@lru_cache(maxsize=8)
+def _read_portfolio_values(path, version):
+    return read_validated(path, 'portfolio_values')
+
+
+# Load the portfolio values table (one row per day, one column per portfolio)
+def load_portfolio_values(path=PORTFOLIO_VALUES_FILE):
+    return _read_portfolio_values(path, file_version(path))
+
+
+# Per-participant files, e.g. tina_individual_stock_prices.csv and tina_stock_daily_returns.csv
+def participant_file(participant, kind):
+    return f"{participant.lower()}_{kind}.csv"
+
+
+@lru_cache(maxsize=32)
+def _read_stock_table(path, version, kind):
+    return read_validated(path, kind)
+
+
+# A per-participant or universe table of the given validation kind, read once per version
+def load_stock_table(path, kind):
+    return _read_stock_table(path, file_version(path), kind)
+
+
+# Daily closing prices of each stock a participant holds (full history)
+def load_stock_prices(participant):
+    path = participant_file(participant, 'individual_stock_prices')
+    return _read_stock_table(path, file_version(path), 'stock_prices')
+
+
+# Daily dollar value of each of a participant's holdings since the competition start
+def load_stock_values(participant):
+    path = participant_file(participant, 'stock_daily_returns')
+    return _read_stock_table(path, file_version(path), 'stock_values')
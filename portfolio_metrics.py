@@ -0,0 +1,50 @@
+import numpy as np
+
+# Pure computations behind the participant pages. Inputs (often frames shared
+# through the data cache) are never modified; results are new read-only arrays.
+
+
+def _read_only(array):
+    array = np.array(array, dtype=float)
+    array.setflags(write=False)
+    return array
+
+
+# Starting and current value, growth, and best and worst day of a portfolio
+def portfolio_summary(days, values):
+    values = np.asarray(values, dtype=float)
+    daily_change = _read_only(np.diff(values))
+    best, worst = np.argmax(daily_change), np.argmin(daily_change)
+    return {
+        'initial_value': values[0],
+        'current_value': values[-1],
+        'growth': (values[-1] - values[0]) / values[0] * 100,
+        'daily_change': daily_change,
+        'best_day': days[best + 1],
+        'best_change': daily_change[best],
+        'worst_day': days[worst + 1],
+        'worst_change': daily_change[worst],
+    }
+
+
+# Gain or loss of a holding relative to its initial investment, and its statistics
+def holding_summary(values):
+    values = np.asarray(values, dtype=float)
+    gain = _read_only(values - values[0])
+    return {
+        'initial_value': values[0],
+        'gain': gain,
+        'current_gain': gain[-1],
+        'peak': gain.max(),
+        'lowest': gain.min(),
+        'average': gain.mean(),
+        'volatility': gain.std(ddof=1) if len(gain) > 1 else np.nan,
+    }
+
+
+# Standard deviation of each holding's value, most volatile first
+def holding_volatility(stocks, values_matrix):
+    values_matrix = np.asarray(values_matrix, dtype=float)
+    volatility = np.nanstd(values_matrix, axis=0, ddof=1)
+    order = np.argsort(-volatility, kind='stable')
+    return np.asarray(stocks)[order], _read_only(volatility[order])
@@ -0,0 +1,120 @@
+# Registered competition portfolios
+
+# Starting value of every participant's portfolio
+INITIAL_INVESTMENT = 10000
+
+# Benchmark columns in the portfolio values file (no registered allocations)
+BENCHMARKS = ['SMP-500', 'Fore$t_Fund$']
+
+# Portfolio allocations, keyed by the participant's column in the portfolio values file
+ALLOCATIONS = {
+    'bashir': {
+        'ETH': 0.075, 'LINK': 0.075, 'INO': 0.125, 'GEO': 0.075,
+        'AI': 0.10, 'CTRA': 0.075, 'BORR': 0.075, 'RGTI': 0.15,
+        'PATH': 0.10, 'ANET': 0.15
+    },
+    'bryan': {
+        'PDS': 0.15,
+        'BRK-B': 0.15,
+        'GOOG': 0.10,
+        'NTR': 0.05,
+        'FLUT': 0.10,
+        'DECK': 0.10,
+        'GOLD': 0.05,
+        'TGT': 0.05,
+        'KB': 0.05,
+        'NKE': 0.10,
+        'MU': 0.10
+    },
+    'isaiah': {
+        'ISRG': 1.00  # 100% allocation
+    },
+    'karol': {
+        'BTC-USD': 0.125,
+        'ETH': 0.075,
+        'NVDA': 0.15,
+        'AAPL': 0.12,
+        'MSFT': 0.12,
+        'TSLA': 0.11,
+        'LLY': 0.10,
+        'COIN': 0.05,
+        'PLTR': 0.10,
+        'IAG': 0.05
+    },
+    'makeenie': {
+        'MSCI': 0.10,
+        'AAPL': 0.15,
+        'BRK-A': 0.10,
+        'SWPPX': 0.10,
+        'FXAIX': 0.10,
+        'NVDA': 0.15,
+        'AMZN': 0.10,
+        'TGT': 0.05,
+        'BABA': 0.05,
+        'MSFT': 0.10
+    },
+    'rylan': {
+        'NVDA': 0.18,
+        'AAPL': 0.18,
+        'MSFT': 0.18,
+        'TSMC34.SA': 0.05,
+        'NVO': 0.05,
+        'HII': 0.12,
+        'PFE': 0.12,
+        'MCHP': 0.12
+    },
+    'tina': {
+        'PRKR': 0.10,
+        'TMDX': 0.10,
+        'ZETA': 0.10,
+        'FTCI': 0.10,
+        'LEAT': 0.10,
+        'LNTH': 0.10,
+        'TREE': 0.08,
+        'BLBD': 0.08,
+        'NXT': 0.08,
+        'QXO': 0.04,
+        'TSSI': 0.04,
+        'UBER': 0.02,
+        'AVGO': 0.02,
+        'LLY': 0.02,
+        'ELF': 0.02
+    },
+}
+
+# Sector of each ticker in the universe (GICS-style), used to group shocks and exposures
+SECTORS = {
+    'AAPL': 'Technology', 'AI': 'Technology', 'ANET': 'Technology', 'AVGO': 'Technology',
+    'LINK': 'Technology', 'MCHP': 'Technology', 'MSFT': 'Technology', 'MU': 'Technology',
+    'NVDA': 'Technology', 'PATH': 'Technology', 'PLTR': 'Technology', 'PRKR': 'Technology',
+    'QXO': 'Technology', 'RGTI': 'Technology', 'TSMC34.SA': 'Technology', 'TSSI': 'Technology',
+    'ZETA': 'Technology',
+    'GOOG': 'Communication Services',
+    'AMZN': 'Consumer Discretionary', 'BABA': 'Consumer Discretionary', 'DECK': 'Consumer Discretionary',
+    'FLUT': 'Consumer Discretionary', 'LEAT': 'Consumer Discretionary', 'NKE': 'Consumer Discretionary',
+    'TM': 'Consumer Discretionary', 'TSLA': 'Consumer Discretionary',
+    'ELF': 'Consumer Staples', 'KO': 'Consumer Staples', 'TGT': 'Consumer Staples', 'UL': 'Consumer Staples',
+    'BORR': 'Energy', 'CTRA': 'Energy', 'PDS': 'Energy',
+    'BRK-A': 'Financials', 'BRK-B': 'Financials', 'COIN': 'Financials', 'JPM': 'Financials',
+    'KB': 'Financials', 'MSCI': 'Financials', 'TREE': 'Financials',
+    'INO': 'Health Care', 'ISRG': 'Health Care', 'LLY': 'Health Care', 'LNTH': 'Health Care',
+    'NVO': 'Health Care', 'PFE': 'Health Care', 'TMDX': 'Health Care',
+    'BLBD': 'Industrials', 'FTCI': 'Industrials', 'GEO': 'Industrials', 'HII': 'Industrials',
+    'NXT': 'Industrials', 'UBER': 'Industrials',
+    'GOLD': 'Materials', 'IAG': 'Materials', 'NTR': 'Materials',
+    'BTC-USD': 'Crypto', 'ETH': 'Crypto', 'ETH-USD': 'Crypto',
+    'DIA': 'Index Fund', 'FXAIX': 'Index Fund', 'SPY': 'Index Fund', 'SWPPX': 'Index Fund', '^IXIC': 'Index Fund',
+}
+
+# Values are reported in this currency; portfolios start with INITIAL_INVESTMENT of it.
+# Every entrant is funded in it: other currencies are for display only.
+BASE_CURRENCY = 'USD'
+
+# Symbols used to display amounts; other currencies are shown with their code
+CURRENCY_SYMBOLS = {'USD': '$', 'EUR': '€', 'GBP': '£', 'BRL': 'R$'}
+
+# Quote currency of tickers not priced in the base currency (crypto pairs and ADRs
+# such as BABA, TM and UL trade in USD)
+TICKER_CURRENCIES = {
+    'TSMC34.SA': 'BRL',
+}
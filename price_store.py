@@ -0,0 +1,194 @@
+import logging
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from corporate_actions import CORPORATE_ACTIONS_FILE, adjustment_factors, load_corporate_actions
+from lineage import write_lineage
+from portfolio_data import PORTFOLIO_VALUES_FILE, file_version, load_portfolio_values, load_stock_table, participant_file
+from portfolios import ALLOCATIONS, BASE_CURRENCY, INITIAL_INVESTMENT, TICKER_CURRENCIES
+from validation import read_validated
+
+logger = logging.getLogger(__name__)
+
+# Closing prices of the whole ticker universe since the competition start
+UNIVERSE_FILE = "all_stock_prices_since_competition_start.csv"
+
+# Daily exchange rates: one column per currency with the base-currency value of one
+# unit, e.g. EUR = 1.08 when one euro buys 1.08 dollars
+FX_RATES_FILE = "fx_rates.csv"
+
+# Corporate action adjustments: 'raw' for prices as traded (splits the stored history
+# already reflects are undone), 'split' for a split-consistent history, 'total' for
+# total-return prices (splits and reinvested dividends)
+ADJUSTMENTS = ['raw', 'split', 'total']
+
+
+def _read_prices(path, kind):
+    # The universe file stores timestamps with a timezone; validation keeps only the date
+    df = load_stock_table(path, kind)
+    return df.drop(columns=['Index'], errors='ignore').set_index('Date')
+
+
+# One aligned (dates x tickers) price matrix built from every participant's price
+# history plus the universe file, on the participants' trading calendar.
+# Non-positive prices (e.g. ETH before it listed) become missing, then gaps are forward-filled.
+@lru_cache(maxsize=2)
+def _raw_price_matrix(files):
+    participant_prices = [_read_prices(path, 'stock_prices') for path, _ in files[:-1]]
+    universe_prices = _read_prices(files[-1][0], 'universe')
+    calendar = participant_prices[0].index
+    for prices in participant_prices[1:]:
+        calendar = calendar.union(prices.index)
+
+    combined = pd.concat([*participant_prices, universe_prices], axis=1, sort=True)
+    # The same ticker appears in several files; keep the first available price on each day
+    combined = combined.T.groupby(level=0, sort=True).first().T
+    combined = combined.mask(combined <= 0).sort_index().ffill()
+    combined = combined.loc[combined.index.isin(calendar)]
+    combined.index.name = 'Date'
+    return combined
+
+
+@lru_cache(maxsize=2)
+def _read_fx_rates(path, version):
+    return read_validated(path, 'fx_rates').set_index('Date')
+
+
+# Units of `currency` per unit of every currency in the rates file (plus the base
+# currency), cached per (rates version, currency). Currencies without any quotes
+# are treated as worth one unit of `currency`.
+@lru_cache(maxsize=8)
+def _fx_table(path, version, currency):
+    rates = _read_fx_rates(path, version).assign(**{BASE_CURRENCY: 1.0})
+    if currency != BASE_CURRENCY and rates.get(currency, pd.Series(dtype=float)).isna().all():
+        raise ValueError(f"No exchange rates for {currency}")
+    missing = rates.columns[rates.isna().all()].drop(BASE_CURRENCY, errors='ignore')
+    if len(missing):
+        logger.warning("No exchange rates for %s; amounts in them are not converted", ", ".join(missing))
+    return rates.div(rates[currency], axis=0)
+
+
+def load_fx_table(currency=BASE_CURRENCY, path=FX_RATES_FILE):
+    return _fx_table(path, file_version(path), currency)
+
+
+# Exchange rates on the given dates: the latest quote on or before each date,
+# or the first quote for dates before it
+def _align(table, dates):
+    return table.reindex(table.index.union(dates)).ffill().bfill().reindex(dates).fillna(1.0)
+
+
+# Display currencies: the base currency plus every currency with quotes
+def available_currencies(path=FX_RATES_FILE):
+    rates = _read_fx_rates(path, file_version(path))
+    return [BASE_CURRENCY, *rates.columns[rates.notna().any()]]
+
+
+# Units of `currency` per unit of every currency on the given dates
+def fx_table_on(dates, currency=BASE_CURRENCY):
+    return _align(load_fx_table(currency), pd.DatetimeIndex(dates))
+
+
+# Multipliers converting base-currency amounts on each date into `currency`
+def fx_rates(dates, currency):
+    return fx_table_on(dates, currency)[BASE_CURRENCY].to_numpy()
+
+
+# Prices are the stored prices times the corporate action factors and the exchange
+# rates into one currency: a single multiply per (data version, adjustment, currency)
+# by a (dates x tickers) matrix. The stored history is never rewritten. A currency of
+# None leaves every ticker in its own quote currency.
+@lru_cache(maxsize=8)
+def _price_matrix(files, adjustment, currency):
+    if adjustment not in ADJUSTMENTS:
+        raise ValueError(f"Unknown price adjustment: {adjustment}")
+    raw = _raw_price_matrix(files[:-2])
+
+    actions = load_corporate_actions(files[-2][0])
+    if adjustment == 'raw':
+        multipliers = 1 / adjustment_factors(raw, actions, in_source=True)
+    else:
+        multipliers = adjustment_factors(raw, actions, total_return=adjustment == 'total')
+
+    if currency is None:
+        return raw * multipliers
+    # Each ticker takes the rate column of its quote currency
+    quote_currencies = [TICKER_CURRENCIES.get(ticker, BASE_CURRENCY) for ticker in raw.columns]
+    rates = _align(_fx_table(*files[-1], currency), raw.index)
+    rates = rates.reindex(columns=rates.columns.union(sorted(set(quote_currencies))), fill_value=1.0)
+    return raw * (multipliers * rates[quote_currencies].to_numpy())
+
+
+# Files the price matrix depends on: every price history, the corporate actions
+# and the exchange rates
+def price_files():
+    return ([participant_file(participant, 'individual_stock_prices') for participant in ALLOCATIONS]
+            + [UNIVERSE_FILE, CORPORATE_ACTIONS_FILE, FX_RATES_FILE])
+
+
+def load_price_matrix(adjustment='split', currency=BASE_CURRENCY):
+    return _price_matrix(tuple((path, file_version(path)) for path in price_files()), adjustment, currency)
+
+
+# Portfolio values table in a display currency. The stored histories are not
+# recomputed: switching currency is one cached broadcast multiply by the day's rate.
+@lru_cache(maxsize=8)
+def _portfolio_values_in(path, version, fx_version, currency):
+    df = load_portfolio_values(path)
+    converted = df.copy()
+    converted[df.columns[1:]] = df[df.columns[1:]].mul(fx_rates(df['Day'], currency), axis=0)
+    return converted
+
+
+def load_portfolio_values_in(currency=BASE_CURRENCY, path=PORTFOLIO_VALUES_FILE):
+    if currency == BASE_CURRENCY:
+        return load_portfolio_values(path)
+    return _portfolio_values_in(path, file_version(path), file_version(FX_RATES_FILE), currency)
+
+
+# Prices over the competition divided by each ticker's price on the first day
+# (days x tickers), so a buy-and-hold portfolio's value history is
+# INITIAL_INVESTMENT * normalized @ weights. Tickers without a price on the first
+# day cannot have been bought and are left out.
+@lru_cache(maxsize=2)
+def _normalized_prices(files, values_version):
+    start_day = load_portfolio_values()['Day'].iloc[0]
+    prices = _price_matrix(files, 'split', BASE_CURRENCY)
+    window = prices.loc[prices.index >= start_day]
+    values = window.to_numpy(dtype=float)
+    start = values[0]
+    buyable = (start > 0) & ~np.isnan(values).any(axis=0)
+    normalized = values[:, buyable] / start[buyable]
+    normalized.setflags(write=False)
+    return window.index, window.columns[buyable], normalized
+
+
+def load_normalized_prices():
+    files = tuple((path, file_version(path)) for path in price_files())
+    return _normalized_prices(files, file_version(PORTFOLIO_VALUES_FILE))
+
+
+# Weight vector aligned with the normalized price columns, from a {ticker: weight} dict
+def weight_vector(allocation, tickers):
+    weights = np.zeros(len(tickers))
+    positions = tickers.get_indexer(list(allocation))
+    weights[positions[positions >= 0]] = np.asarray(list(allocation.values()), dtype=float)[positions >= 0]
+    return weights
+
+
+# Daily value of a buy-and-hold allocation over the competition: one dot product
+def allocation_values(weights, normalized):
+    return INITIAL_INVESTMENT * (normalized @ weights)
+
+
+# Refresh the exchange rates file from Yahoo Finance (requires the yfinance package)
+def download_fx_rates(currencies=('EUR', 'GBP', 'BRL'), start='2023-12-01', path=FX_RATES_FILE):
+    import yfinance as yf
+
+    symbols = {f"{currency}{BASE_CURRENCY}=X": currency for currency in currencies}
+    quotes = yf.download(list(symbols), start=start, progress=False)['Close'].rename(columns=symbols)
+    quotes.index = quotes.index.strftime('%Y-%m-%d').rename('Date')
+    quotes[list(currencies)].to_csv(path)
+    write_lineage(path, 'price_store.download_fx_rates', parameters={'currencies': list(currencies), 'start': start})
@@ -0,0 +1,232 @@
+import argparse
+import asyncio
+import logging
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from ledger import load_ledgers
+from portfolios import BASE_CURRENCY, TICKER_CURRENCIES
+from price_store import fx_table_on, load_price_matrix
+
+logger = logging.getLogger(__name__)
+
+# Quotes kept per ticker, and seconds between polls of a live source and of a replay
+RING_SIZE = 1024
+POLL_INTERVAL = 60.0
+REPLAY_INTERVAL = 2.0
+
+
+# The last `capacity` quotes of every ticker in preallocated (tickers x capacity)
+# arrays. Each poll writes one slot per quoted ticker with a single fancy-indexed
+# assignment; nothing is allocated after construction.
+class QuoteRing:
+    def __init__(self, tickers, capacity=RING_SIZE):
+        self.tickers = pd.Index(tickers)
+        self.capacity = capacity
+        self.times = np.full((len(self.tickers), capacity), np.nan)
+        self.prices = np.full((len(self.tickers), capacity), np.nan)
+        # Quotes ever written per ticker; the next slot is count % capacity
+        self.count = np.zeros(len(self.tickers), dtype=np.int64)
+        self.latest = np.full(len(self.tickers), np.nan)
+
+    # Record one poll: a timestamp (seconds since the epoch) and a price per ticker,
+    # NaN for tickers that were not quoted
+    def append(self, timestamp, prices):
+        quoted = np.flatnonzero(~np.isnan(prices))
+        slots = self.count[quoted] % self.capacity
+        self.times[quoted, slots] = timestamp
+        self.prices[quoted, slots] = prices[quoted]
+        self.count[quoted] += 1
+        self.latest[quoted] = prices[quoted]
+
+    # Quotes of one ticker, oldest first
+    def history(self, ticker):
+        row = self.tickers.get_loc(ticker)
+        n = min(self.count[row], self.capacity)
+        order = (self.count[row] - n + np.arange(n)) % self.capacity
+        return pd.Series(self.prices[row, order], index=pd.to_datetime(self.times[row, order], unit='s'), name=ticker)
+
+
+# ----------------------------------------
+# Sources: coroutines returning (timestamp, prices aligned with the tickers)
+# ----------------------------------------
+
+# Latest one-minute close of every ticker from Yahoo Finance (requires the yfinance
+# package); the blocking download runs in a worker thread
+class YahooQuotes:
+    async def __call__(self, tickers):
+        import yfinance as yf
+
+        def download():
+            bars = yf.download(list(tickers), period='1d', interval='1m', progress=False)['Close']
+            return bars.ffill().iloc[-1].reindex(tickers).to_numpy(dtype=float)
+
+        prices = await asyncio.to_thread(download)
+        return time.time(), prices
+
+
+# Replays the rows of a (timestamps x tickers) price frame, one row per poll, for
+# demos and tests; wraps around at the end. Like a live source, prices are in each
+# ticker's quote currency.
+class ReplayQuotes:
+    def __init__(self, frame):
+        self.frame = frame
+        self.row = 0
+
+    @classmethod
+    def from_price_matrix(cls, days=20):
+        return cls(load_price_matrix(currency=None).iloc[-days:])
+
+    async def __call__(self, tickers):
+        prices = self.frame.iloc[self.row % len(self.frame)].reindex(tickers).to_numpy(dtype=float)
+        self.row += 1
+        return time.time(), prices
+
+
+# ----------------------------------------
+# Service
+# ----------------------------------------
+
+# Polls a source on a cadence into a QuoteRing and marks every registered portfolio
+# to market after each poll. Holdings (latest shares and cash from the ledgers) are
+# fixed at construction, so a poll is one matrix-vector product. Readers only fetch
+# the latest immutable snapshot, which the poller replaces in one assignment.
+class QuoteService:
+    def __init__(self, source, interval=POLL_INTERVAL, capacity=RING_SIZE, name=None):
+        prices = load_price_matrix()
+        ledgers = load_ledgers()
+        self.source = source
+        self.name = name
+        self.interval = interval
+        self.ring = QuoteRing(prices.columns, capacity)
+        self.portfolios = list(ledgers)
+
+        replays = [ledger.replay(prices) for ledger in ledgers.values()]
+        self.shares = np.vstack([shares[-1] for shares, _ in replays])
+        self.cash = np.array([cash[-1] for _, cash in replays])
+        # Quotes are in each ticker's own currency; holdings are valued in the base
+        # currency at the rates of the latest close, like the closes themselves
+        latest_rates = fx_table_on(prices.index[-1:], BASE_CURRENCY).iloc[0]
+        self.conversion = np.nan_to_num([latest_rates.get(TICKER_CURRENCIES.get(ticker, BASE_CURRENCY), 1.0)
+                                         for ticker in prices.columns], nan=1.0)
+        # Tickers without a quote are valued at their latest close
+        self.last_close = np.nan_to_num(prices.iloc[-1].to_numpy(dtype=float))
+        self.close_values = self.shares @ self.last_close + self.cash
+
+        self._snapshot = None
+        self._stopping = False
+
+    def update(self, timestamp, prices):
+        self.ring.append(timestamp, prices)
+        marks = np.where(np.isnan(self.ring.latest), self.last_close, self.ring.latest * self.conversion)
+        values = self.shares @ marks + self.cash
+        values.setflags(write=False)
+        self._snapshot = (timestamp, values)
+
+    async def poll(self):
+        timestamp, prices = await self.source(self.ring.tickers)
+        self.update(timestamp, np.asarray(prices, dtype=float))
+
+    async def run(self, polls=None):
+        completed = 0
+        while not self._stopping and (polls is None or completed < polls):
+            started = time.monotonic()
+            try:
+                await self.poll()
+            except Exception:
+                logger.exception("Quote poll failed; keeping the previous quotes")
+            completed += 1
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def stop(self):
+        self._stopping = True
+
+    # Time of the latest poll and the mark-to-market value of every portfolio,
+    # or None before the first poll
+    def current_values(self):
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        timestamp, values = snapshot
+        return pd.Timestamp(timestamp, unit='s'), pd.Series(values, index=self.portfolios)
+
+
+# Sources the dashboard can switch between: a factory and its polling interval
+QUOTE_SOURCES = {
+    'Yahoo Finance': (YahooQuotes, POLL_INTERVAL),
+    'Replay': (ReplayQuotes.from_price_matrix, REPLAY_INTERVAL),
+}
+
+# One service per process, polling in a daemon thread with its own event loop
+_lock = threading.Lock()
+_service = None
+
+
+# Start polling one of QUOTE_SOURCES (or an explicit source); a running service is kept
+def start_quote_service(name, source=None, interval=None):
+    global _service
+    with _lock:
+        if _service is not None:
+            return _service
+        factory, default_interval = QUOTE_SOURCES.get(name, (None, POLL_INTERVAL))
+        _service = QuoteService(source or factory(), interval or default_interval, name=name)
+        threading.Thread(target=asyncio.run, args=(_service.run(),), name='quote-service', daemon=True).start()
+        return _service
+
+
+def stop_quote_service():
+    global _service
+    with _lock:
+        if _service is not None:
+            _service.stop()
+            _service = None
+
+
+def quote_service():
+    return _service
+
+
+# Latest poll time, mark-to-market value and value at the last close of one portfolio,
+# or None without live quotes
+def live_value(portfolio):
+    service = _service
+    snapshot = service.current_values() if service is not None else None
+    if snapshot is None or portfolio not in snapshot[1].index:
+        return None
+    timestamp, values = snapshot
+    return timestamp, values[portfolio], service.close_values[service.portfolios.index(portfolio)]
+
+
+# Poll and print the live leaderboard, e.g. `python quotes.py --replay --interval 1`
+def main():
+    parser = argparse.ArgumentParser(description="Poll the latest quotes and mark every portfolio to market.")
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL, help="Seconds between polls")
+    parser.add_argument('--polls', type=int, help="Stop after this many polls (default: run until interrupted)")
+    parser.add_argument('--replay', action='store_true', help="Replay the last closes instead of polling Yahoo Finance")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    source = ReplayQuotes.from_price_matrix() if args.replay else YahooQuotes()
+    service = QuoteService(source, args.interval)
+
+    async def report():
+        polls = 0
+        while args.polls is None or polls < args.polls:
+            await service.poll()
+            polls += 1
+            timestamp, values = service.current_values()
+            ranking = values.sort_values(ascending=False)
+            print(f"{timestamp:%Y-%m-%d %H:%M:%S}  " + "  ".join(f"{name} {value:,.2f}" for name, value in ranking.items()))
+            await asyncio.sleep(args.interval)
+
+    try:
+        asyncio.run(report())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
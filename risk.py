@@ -0,0 +1,139 @@
+from functools import lru_cache
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from portfolio_data import file_version
+from ledger import ledger_files, load_positions
+from price_store import load_price_matrix
+
+METHODS = ['Historical', 'Parametric', 'Monte Carlo']
+
+# Number of Monte Carlo scenarios drawn (shared by every portfolio)
+MC_SIMULATIONS = 20000
+MC_SEED = 42
+
+# Portfolios evaluated at a time against the scenario returns; bounds the P&L block in memory
+BLOCK_SIZE = 256
+
+
+def _data_version():
+    return tuple(file_version(path) for path in ledger_files())
+
+
+# h-day simple returns of every ticker (overlapping windows); missing prices count as no move
+@lru_cache(maxsize=8)
+def _ticker_returns(version, horizon):
+    values = load_price_matrix().to_numpy()
+    returns = np.nan_to_num(values[horizon:] / values[:-horizon] - 1)
+    returns.setflags(write=False)
+    return returns
+
+
+# Mean and covariance of daily ticker returns, built once per data version and
+# shared by every portfolio and holding
+@lru_cache(maxsize=2)
+def _covariance(version):
+    returns = _ticker_returns(version, 1)
+    mean = returns.mean(axis=0)
+    cov = np.cov(returns, rowvar=False)
+    mean.setflags(write=False)
+    cov.setflags(write=False)
+    return mean, cov
+
+
+# Standard normal draws correlated through the covariance. The factor comes from
+# an eigendecomposition so a rank-deficient covariance (short histories) still works.
+@lru_cache(maxsize=2)
+def _mc_daily_returns(version):
+    mean, cov = _covariance(version)
+    eigenvalues, eigenvectors = np.linalg.eigh(cov)
+    factor = eigenvectors * np.sqrt(np.clip(eigenvalues, 0, None))
+    draws = np.random.default_rng(MC_SEED).standard_normal((MC_SIMULATIONS, len(cov)))
+    simulated = draws @ factor.T
+    simulated.setflags(write=False)
+    return simulated
+
+
+# VaR and ES from scenario returns (scenarios x tickers) applied to positions;
+# losses are reported as positive dollars. Each block's P&L is laid out with one
+# row per portfolio, and the quantile (linear interpolation, as np.quantile) only
+# needs the two order statistics around it, found with a single partition.
+def _tail_from_scenarios(returns, positions, confidence):
+    if len(returns) == 0:
+        raise ValueError("No return scenarios: the horizon must be shorter than the price history")
+    var = np.empty(len(positions))
+    es = np.empty(len(positions))
+    position = (len(returns) - 1) * (1 - confidence)
+    lower = int(np.floor(position))
+    upper = min(lower + 1, len(returns) - 1)
+    for start in range(0, len(positions), BLOCK_SIZE):
+        block = slice(start, start + BLOCK_SIZE)
+        pnl = positions[block] @ returns.T
+        ordered = np.partition(pnl, [lower, upper], axis=1)
+        quantile = ordered[:, lower] + (position - lower) * (ordered[:, upper] - ordered[:, lower])
+        var[block] = -quantile
+        tail = pnl <= quantile[:, None]
+        es[block] = -np.where(tail, pnl, 0).sum(axis=1) / np.maximum(tail.sum(axis=1), 1)
+    return var, es
+
+
+# VaR and ES of positions (rows = portfolios or holdings, columns = tickers in dollars)
+def tail_risk(positions, method, confidence=0.95, horizon=1):
+    version = _data_version()
+
+    if method == 'Historical':
+        return _tail_from_scenarios(_ticker_returns(version, horizon), positions, confidence)
+
+    mean, cov = _covariance(version)
+    if method == 'Parametric':
+        expected = positions @ mean * horizon
+        sd = np.sqrt(np.einsum('ij,jk,ik->i', positions, cov, positions) * horizon)
+        z = NormalDist().inv_cdf(confidence)
+        var = z * sd - expected
+        es = sd * np.exp(-z ** 2 / 2) / np.sqrt(2 * np.pi) / (1 - confidence) - expected
+        return var, es
+
+    if method == 'Monte Carlo':
+        simulated = mean * horizon + _mc_daily_returns(version) * np.sqrt(horizon)
+        return _tail_from_scenarios(simulated, positions, confidence)
+
+    raise ValueError(f"Unknown VaR method: {method}")
+
+
+# VaR and ES of every portfolio with every method, cached per data version
+@lru_cache(maxsize=32)
+def _portfolio_risk(version, confidence, horizon):
+    portfolios, _, positions = load_positions()
+    columns = {'Value ($)': positions.sum(axis=1)}
+    for method in METHODS:
+        var, es = tail_risk(positions, method, confidence, horizon)
+        columns[f'{method} VaR ($)'] = var
+        columns[f'{method} ES ($)'] = es
+    return pd.DataFrame(columns, index=portfolios)
+
+
+def portfolio_risk(confidence=0.95, horizon=1):
+    return _portfolio_risk(_data_version(), confidence, horizon)
+
+
+# VaR and ES of each holding of one portfolio, treating every position on its own
+@lru_cache(maxsize=64)
+def _holding_risk(version, portfolio, confidence, horizon):
+    portfolios, tickers, positions = load_positions()
+    row = positions[portfolios.index(portfolio)]
+    held = np.nonzero(row)[0]
+    holding_positions = np.zeros((len(held), len(tickers)))
+    holding_positions[np.arange(len(held)), held] = row[held]
+
+    columns = {'Position ($)': row[held]}
+    for method in METHODS:
+        var, es = tail_risk(holding_positions, method, confidence, horizon)
+        columns[f'{method} VaR ($)'] = var
+        columns[f'{method} ES ($)'] = es
+    return pd.DataFrame(columns, index=pd.Index(tickers[held], name='Stock'))
+
+
+def holding_risk(portfolio, confidence=0.95, horizon=1):
+    return _holding_risk(_data_version(), portfolio, confidence, horizon)
@@ -0,0 +1,112 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from portfolio_data import PORTFOLIO_VALUES_FILE, file_version, load_portfolio_values
+from price_store import load_price_matrix, price_files
+
+# Benchmarks the correlations are measured against: the S&P 500 column of the
+# portfolio values file, and its ETF in the price matrix
+PORTFOLIO_BENCHMARK = 'SMP-500'
+STOCK_BENCHMARK = 'SPY'
+
+ROLLING_METRICS = ['Return (%)', 'Volatility (%)', 'Correlation to S&P 500']
+
+
+# Sum over the trailing window of every column via one cumulative sum, so the cost
+# is O(T) whatever the window. Rows before the first full window are NaN.
+def _rolling_sum(x, window):
+    totals = np.full(x.shape, np.nan)
+    if window <= len(x):
+        cumulative = np.concatenate([np.zeros((1, *x.shape[1:])), np.cumsum(x, axis=0)])
+        totals[window - 1:] = cumulative[window:] - cumulative[:-window]
+    return totals
+
+
+# Trailing return, volatility of daily returns and correlation of daily returns with
+# a benchmark, for every column of a (days x series) value matrix at once.
+# Missing values are skipped inside each window; all results are aligned with the input rows.
+def rolling_stats(values, benchmark, window):
+    values = np.asarray(values, dtype=float)
+    benchmark = np.asarray(benchmark, dtype=float)[:, None]
+
+    trailing = np.full(values.shape, np.nan)
+    trailing[window:] = values[window:] / values[:-window] - 1
+
+    returns = np.full(values.shape, np.nan)
+    returns[1:] = values[1:] / values[:-1] - 1
+    benchmark_returns = np.full(benchmark.shape, np.nan)
+    benchmark_returns[1:] = benchmark[1:] / benchmark[:-1] - 1
+
+    # Centre each series first; variances and covariances are unchanged but the
+    # running sums lose far less precision
+    returns = returns - np.nanmean(returns, axis=0)
+    benchmark_returns = benchmark_returns - np.nanmean(benchmark_returns)
+
+    valid = np.isfinite(returns)
+    x = np.where(valid, returns, 0)
+    count = _rolling_sum(valid.astype(float), window)
+    sum_x = _rolling_sum(x, window)
+    sum_xx = _rolling_sum(x * x, window)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        variance = np.clip(sum_xx - sum_x ** 2 / count, 0, None) / (count - 1)
+        volatility = np.where(count >= 2, np.sqrt(variance), np.nan)
+
+        # Correlation over the days where both the series and the benchmark moved
+        paired = valid & np.isfinite(benchmark_returns)
+        x = np.where(paired, returns, 0)
+        y = np.where(paired, benchmark_returns, 0)
+        n = _rolling_sum(paired.astype(float), window)
+        sum_x, sum_y = _rolling_sum(x, window), _rolling_sum(y, window)
+        covariance = _rolling_sum(x * y, window) - sum_x * sum_y / n
+        variance_x = np.clip(_rolling_sum(x * x, window) - sum_x ** 2 / n, 0, None)
+        variance_y = np.clip(_rolling_sum(y * y, window) - sum_y ** 2 / n, 0, None)
+        correlation = np.where(n >= 2, covariance / np.sqrt(variance_x * variance_y), np.nan)
+
+    return {
+        'Return (%)': trailing * 100,
+        'Volatility (%)': volatility * 100,
+        'Correlation to S&P 500': np.clip(correlation, -1, 1),
+    }
+
+
+def _rolling_frames(matrix, benchmark_column, window):
+    stats = rolling_stats(matrix.to_numpy(dtype=float), matrix[benchmark_column].to_numpy(dtype=float), window)
+    frames = {metric: pd.DataFrame(values, index=matrix.index, columns=matrix.columns) for metric, values in stats.items()}
+    # The benchmark's correlation with itself carries no information
+    frames['Correlation to S&P 500'] = frames['Correlation to S&P 500'].drop(columns=benchmark_column)
+    return frames
+
+
+# Rolling statistics of every portfolio, cached per (data version, window)
+@lru_cache(maxsize=64)
+def _portfolio_rolling(version, window):
+    df = load_portfolio_values()
+    return _rolling_frames(df.set_index('Day'), PORTFOLIO_BENCHMARK, window)
+
+
+def portfolio_rolling(window):
+    return _portfolio_rolling(file_version(PORTFOLIO_VALUES_FILE), window)
+
+
+# Rolling statistics of every ticker in the price matrix, cached per (data version, window)
+@lru_cache(maxsize=64)
+def _stock_rolling(version, window):
+    return _rolling_frames(load_price_matrix(), STOCK_BENCHMARK, window)
+
+
+def stock_rolling(window):
+    return _stock_rolling(tuple(file_version(path) for path in price_files()), window)
+
+
+# Line chart of one rolling metric for the given columns (those without the metric are skipped)
+def rolling_figure(frame, columns, metric, title):
+    import plotly.express as px
+
+    columns = [column for column in columns if column in frame.columns]
+    fig = px.line(frame[columns].reset_index(), x=frame.index.name, y=columns,
+                  labels={'value': metric, 'variable': ''}, title=title)
+    if metric == 'Correlation to S&P 500':
+        fig.update_yaxes(range=[-1, 1])
+    return fig
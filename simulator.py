@@ -0,0 +1,151 @@
+import argparse
+import time
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from leaderboard import rank_history
+from lineage import write_lineage
+from portfolio_data import PORTFOLIO_VALUES_FILE, file_version, load_portfolio_values
+from portfolios import INITIAL_INVESTMENT
+from price_store import UNIVERSE_FILE, load_price_matrix, price_files
+
+
+# Tickers entrants can pick from: the universe file's columns
+def universe_tickers():
+    return pd.read_csv(UNIVERSE_FILE, nrows=0).columns.drop(['Index', 'Date'], errors='ignore')
+
+
+# Allocation weights (entrants x tickers) for n synthetic entrants. Each entrant holds
+# a uniformly drawn number of tickers in [min_holdings, max_holdings], chosen uniformly
+# from the universe, with Dirichlet(concentration) weights over them: a small
+# concentration gives a few dominant positions, a large one near-equal weights.
+def synthetic_allocations(n, n_tickers, min_holdings=3, max_holdings=12, concentration=1.0, seed=0):
+    rng = np.random.default_rng(seed)
+    max_holdings = min(max_holdings, n_tickers)
+    min_holdings = min(min_holdings, max_holdings)
+
+    holdings = rng.integers(min_holdings, max_holdings + 1, size=n)
+    # A ticker is held when its random key ranks inside the entrant's holding count
+    key_ranks = rng.random((n, n_tickers)).argsort(axis=1).argsort(axis=1)
+    held = key_ranks < holdings[:, None]
+
+    weights = np.where(held, rng.gamma(concentration, size=(n, n_tickers)), 0)
+    weights /= weights.sum(axis=1, keepdims=True)
+    return weights
+
+
+# Shares of every ticker held by each entrant (entrants x tickers): the initial
+# investment buys the allocation at the first day's close
+def entrant_shares(prices, weights):
+    start = np.nan_to_num(np.asarray(prices[0], dtype=float))
+    return INITIAL_INVESTMENT * weights / np.where(start > 0, start, np.inf)
+
+
+# Daily value of every entrant (days x entrants) in one matrix product
+def value_entrants(prices, weights):
+    prices = np.nan_to_num(np.asarray(prices, dtype=float))
+    return prices @ entrant_shares(prices, weights).T
+
+
+# Leaderboard metrics of every entrant from its value history
+def entrant_metrics(names, values):
+    returns = values[1:] / values[:-1] - 1
+    ranks = rank_history(values)
+    return pd.DataFrame({
+        'Entrant': names,
+        'Rank': ranks[-1],
+        'Previous Rank': ranks[-2] if len(values) > 1 else ranks[-1],
+        'Final Value': values[-1],
+        'Growth (%)': (values[-1] - values[0]) / values[0] * 100,
+        'Volatility': returns.std(axis=0, ddof=1) if len(returns) > 1 else np.nan,
+        'Best Rank': ranks.min(axis=0),
+    })
+
+
+# Files a simulation is computed from: the competition calendar and the price matrix
+def simulation_files():
+    return [PORTFOLIO_VALUES_FILE] + price_files()
+
+
+# A whole synthetic competition over the competition window of the price store:
+# entrant names, trading days, tickers, weights and values (days x entrants)
+@lru_cache(maxsize=4)
+def _simulate_competition(version, n, min_holdings, max_holdings, concentration, seed):
+    start_day = load_portfolio_values()['Day'].iloc[0]
+    prices = load_price_matrix()
+    prices = prices.loc[prices.index >= start_day, universe_tickers()]
+    weights = synthetic_allocations(n, len(prices.columns), min_holdings, max_holdings, concentration, seed)
+    values = value_entrants(prices.to_numpy(), weights)
+
+    names = np.char.add('entrant_', np.char.zfill(np.arange(1, n + 1).astype(str), len(str(n))))
+    for array in (weights, values):
+        array.setflags(write=False)
+    return names, prices.index, prices.columns, weights, values
+
+
+def simulate_competition(n, min_holdings=3, max_holdings=12, concentration=1.0, seed=0):
+    version = tuple(file_version(path) for path in simulation_files())
+    return _simulate_competition(version, n, min_holdings, max_holdings, concentration, seed)
+
+
+# Load test of the analytics pipeline on a synthetic competition, timing each stage
+def main():
+    parser = argparse.ArgumentParser(description="Simulate a competition with synthetic entrants.")
+    parser.add_argument('--entrants', type=int, default=10000, help="Number of synthetic entrants")
+    parser.add_argument('--min-holdings', type=int, default=3, help="Fewest tickers an entrant holds")
+    parser.add_argument('--max-holdings', type=int, default=12, help="Most tickers an entrant holds")
+    parser.add_argument('--concentration', type=float, default=1.0,
+                        help="Dirichlet concentration of the weights (small = concentrated)")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed")
+    parser.add_argument('--pairwise', action='store_true',
+                        help="Also time the correlation and overlap matrices (entrants x entrants)")
+    parser.add_argument('--output', help="Write the daily values (Day + one column per entrant) to this CSV")
+    args = parser.parse_args()
+
+    from correlation import correlation_matrix, overlap_matrix
+    from leaderboard import leaderboard_html
+    from risk import tail_risk
+    from stress_test import PREDEFINED_SCENARIOS, run_stress_test
+
+    def timed(label, function, *function_args):
+        start = time.perf_counter()
+        result = function(*function_args)
+        print(f"{label:<28}{time.perf_counter() - start:8.3f}s")
+        return result
+
+    names, days, tickers, weights, values = timed(
+        "Allocate and value", simulate_competition,
+        args.entrants, args.min_holdings, args.max_holdings, args.concentration, args.seed)
+    metrics = timed("Ranks and metrics", entrant_metrics, names, values)
+    timed("Leaderboard (top 10)", leaderboard_html, names, values[-1], 10, metrics['Previous Rank'].to_numpy())
+    if args.pairwise:
+        timed("Return correlation", correlation_matrix, values[1:] / values[:-1] - 1)
+        timed("Holding overlap", overlap_matrix, weights)
+
+    # Latest dollar value of each holding, on the full price store's columns
+    prices = load_price_matrix()
+    shares = pd.DataFrame(entrant_shares(prices.loc[days, tickers].to_numpy(), weights), columns=tickers)
+    shares = shares.reindex(columns=prices.columns, fill_value=0).to_numpy()
+    positions = shares * np.nan_to_num(prices.loc[days[-1]].to_numpy())
+    timed("Stress test", run_stress_test, PREDEFINED_SCENARIOS, list(names), prices.columns, positions)
+    for method in ('Historical', 'Parametric', 'Monte Carlo'):
+        timed(f"{method} VaR", tail_risk, positions, method)
+
+    print()
+    print(metrics.sort_values('Rank').head(10).to_string(index=False))
+
+    if args.output:
+        frame = pd.DataFrame(values, columns=names)
+        frame.insert(0, 'Day', days.strftime('%Y-%m-%d'))
+        frame.to_csv(args.output, index=False)
+        write_lineage(args.output, 'simulator.py', inputs=simulation_files(),
+                      parameters={'entrants': args.entrants, 'min_holdings': args.min_holdings,
+                                  'max_holdings': args.max_holdings, 'concentration': args.concentration,
+                                  'seed': args.seed})
+        print(f"Wrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
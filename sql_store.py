@@ -0,0 +1,145 @@
+import sqlite3
+import sys
+import threading
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from ledger import ledger_files, load_positions
+from portfolio_data import file_version, load_portfolio_values
+from portfolios import ALLOCATIONS, SECTORS
+from price_store import load_price_matrix
+
+# Tables (long format, dates as ISO 'YYYY-MM-DD' text):
+#   prices(date, ticker, close)              - consolidated, split-adjusted closes
+#   portfolio_values(day, portfolio, value)  - every portfolio and benchmark
+#   holdings(portfolio, ticker, weight)      - registered allocations
+#   positions(portfolio, ticker, value)      - latest dollar value of each holding
+#   sectors(ticker, sector)
+SCHEMA = """
+CREATE TABLE prices (date TEXT NOT NULL, ticker TEXT NOT NULL, close REAL,
+                     PRIMARY KEY (ticker, date)) WITHOUT ROWID;
+CREATE INDEX prices_by_date ON prices (date, ticker);
+CREATE TABLE portfolio_values (day TEXT NOT NULL, portfolio TEXT NOT NULL, value REAL,
+                               PRIMARY KEY (portfolio, day)) WITHOUT ROWID;
+CREATE TABLE holdings (portfolio TEXT NOT NULL, ticker TEXT NOT NULL, weight REAL NOT NULL,
+                       PRIMARY KEY (portfolio, ticker)) WITHOUT ROWID;
+CREATE TABLE positions (portfolio TEXT NOT NULL, ticker TEXT NOT NULL, value REAL NOT NULL,
+                        PRIMARY KEY (portfolio, ticker)) WITHOUT ROWID;
+CREATE TABLE sectors (ticker TEXT PRIMARY KEY, sector TEXT NOT NULL);
+"""
+
+# Predefined views. Performance is each ticker's change between its first and last
+# close inside a window: the competition (the days in portfolio_values) or the last week.
+VIEWS = """
+CREATE VIEW competition_window AS
+SELECT MIN(day) AS start_day, MAX(day) AS end_day FROM portfolio_values;
+
+CREATE VIEW last_week_window AS
+SELECT date(MAX(date), '-7 days') AS start_day, MAX(date) AS end_day FROM prices;
+
+CREATE VIEW stock_performance AS
+WITH bounds AS (
+    SELECT p.ticker, MIN(p.date) AS first_date, MAX(p.date) AS last_date
+    FROM prices AS p, competition_window AS w
+    WHERE p.date BETWEEN w.start_day AND w.end_day AND p.close IS NOT NULL
+    GROUP BY p.ticker
+)
+SELECT b.ticker AS "Stock",
+       (last.close - first.close) / first.close * 100 AS "Performance Change (%)"
+FROM bounds AS b
+JOIN prices AS first ON first.ticker = b.ticker AND first.date = b.first_date
+JOIN prices AS last ON last.ticker = b.ticker AND last.date = b.last_date;
+
+CREATE VIEW last_week_performance AS
+WITH bounds AS (
+    SELECT p.ticker, MIN(p.date) AS first_date, MAX(p.date) AS last_date
+    FROM prices AS p, last_week_window AS w
+    WHERE p.date BETWEEN w.start_day AND w.end_day AND p.close IS NOT NULL
+    GROUP BY p.ticker
+)
+SELECT b.ticker AS "Stock",
+       (last.close - first.close) / first.close * 100 AS "Performance Change (%)"
+FROM bounds AS b
+JOIN prices AS first ON first.ticker = b.ticker AND first.date = b.first_date
+JOIN prices AS last ON last.ticker = b.ticker AND last.date = b.last_date;
+
+CREATE VIEW best_stocks AS
+SELECT * FROM stock_performance ORDER BY "Performance Change (%)" DESC, "Stock" LIMIT 5;
+
+CREATE VIEW worst_stocks AS
+SELECT * FROM stock_performance ORDER BY "Performance Change (%)" ASC, "Stock" LIMIT 5;
+
+CREATE VIEW holding_performance AS
+SELECT h.portfolio AS "Portfolio", h.ticker AS "Stock", h.weight AS "Weight",
+       s."Performance Change (%)"
+FROM holdings AS h JOIN stock_performance AS s ON s."Stock" = h.ticker;
+"""
+
+
+def _long(frame, date_name, key_name, value_name):
+    dates = frame.index.strftime('%Y-%m-%d').to_numpy()
+    values = frame.to_numpy(dtype=float)
+    rows = pd.DataFrame({
+        date_name: np.repeat(dates, values.shape[1]),
+        key_name: np.tile(frame.columns.to_numpy(), len(dates)),
+        value_name: values.ravel(),
+    })
+    return rows.astype(object).where(rows.notna(), None).itertuples(index=False, name=None)
+
+
+# In-memory database over the current data, built once per data version. SQLite
+# connections are not safe to share between threads, so queries take a lock.
+class SqlStore:
+    def __init__(self):
+        self.connection = sqlite3.connect(':memory:', check_same_thread=False)
+        self.lock = threading.Lock()
+        self.connection.executescript(SCHEMA)
+
+        prices = load_price_matrix()
+        values = load_portfolio_values().set_index('Day')
+        portfolios, tickers, positions = load_positions()
+        rows, columns = np.nonzero(positions)
+        with self.connection:
+            self.connection.executemany("INSERT INTO prices VALUES (?, ?, ?)", _long(prices, 'date', 'ticker', 'close'))
+            self.connection.executemany("INSERT INTO portfolio_values VALUES (?, ?, ?)",
+                                        _long(values, 'day', 'portfolio', 'value'))
+            self.connection.executemany("INSERT INTO holdings VALUES (?, ?, ?)", [
+                (portfolio, ticker, weight)
+                for portfolio, allocation in ALLOCATIONS.items() for ticker, weight in allocation.items()
+            ])
+            self.connection.executemany("INSERT INTO positions VALUES (?, ?, ?)", [
+                (portfolios[i], tickers[j], positions[i, j]) for i, j in zip(rows, columns)
+            ])
+            self.connection.executemany("INSERT INTO sectors VALUES (?, ?)", SECTORS.items())
+        self.connection.executescript(VIEWS)
+        self.connection.execute("ANALYZE")
+
+    def query(self, sql, params=()):
+        with self.lock:
+            cursor = self.connection.execute(sql, params)
+            columns = [column[0] for column in cursor.description]
+            return pd.DataFrame(cursor.fetchall(), columns=columns)
+
+
+@lru_cache(maxsize=1)
+def _sql_store(version):
+    return SqlStore()
+
+
+def load_sql_store():
+    return _sql_store(tuple(file_version(path) for path in ledger_files()))
+
+
+# Run a query against the current data and return the result as a DataFrame
+def query(sql, params=()):
+    return load_sql_store().query(sql, params)
+
+
+# Ad-hoc queries from the command line, e.g.
+#   python sql_store.py "SELECT DISTINCT h.portfolio FROM holdings h JOIN last_week_performance w
+#                        ON w.Stock = h.ticker WHERE w.\"Performance Change (%)\" < -10"
+if __name__ == '__main__':
+    with pd.option_context('display.max_rows', None, 'display.width', 200):
+        print(query(' '.join(sys.argv[1:]) or "SELECT * FROM best_stocks"))
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+from portfolios import SECTORS
+from ledger import load_positions
+from price_store import load_price_matrix
+
+# Scenarios are dicts with a name and any of:
+#   'sectors': {sector: return}  - shock every ticker of a sector
+#   'tickers': {ticker: return}  - shock single tickers (applied after sector shocks)
+#   'replay': (start, end)       - replay each ticker's stored return between two dates
+PREDEFINED_SCENARIOS = [
+    {'name': "Election rally (hypothetical)",
+     'sectors': {'Energy': 0.08, 'Industrials': 0.05, 'Financials': 0.06}},
+    {'name': "Holiday retail slump (hypothetical)",
+     'sectors': {'Consumer Discretionary': -0.08, 'Consumer Staples': -0.05}},
+    {'name': "Tech selloff (hypothetical)",
+     'sectors': {'Technology': -0.15, 'Communication Services': -0.10}},
+    {'name': "Crypto crash (hypothetical)",
+     'sectors': {'Crypto': -0.30}, 'tickers': {'COIN': -0.25}},
+    {'name': "NVDA -10% (hypothetical)",
+     'tickers': {'NVDA': -0.10}},
+    {'name': "Replay: 2024 post-election weeks",
+     'replay': ('2024-11-05', '2024-11-29')},
+    {'name': "Replay: December 2024 holidays",
+     'replay': ('2024-12-09', '2024-12-31')},
+]
+
+
+# Return of every ticker in one scenario
+def scenario_returns(scenario, tickers, prices):
+    shocks = np.zeros(len(tickers))
+
+    if 'replay' in scenario:
+        start, end = (np.datetime64(day) for day in scenario['replay'])
+        dates = prices.index.to_numpy()
+        first = min(np.searchsorted(dates, start, side='left'), len(dates) - 1)
+        last = max(np.searchsorted(dates, end, side='right') - 1, 0)
+        values = prices.to_numpy()
+        shocks = np.nan_to_num(values[last] / values[first] - 1)
+
+    if 'sectors' in scenario:
+        sectors = np.array([SECTORS.get(ticker, '') for ticker in tickers])
+        for sector, shock in scenario['sectors'].items():
+            shocks = np.where(sectors == sector, shock, shocks)
+
+    if 'tickers' in scenario:
+        positions = pd.Index(tickers).get_indexer(list(scenario['tickers']))
+        found = positions >= 0
+        shocks[positions[found]] = np.array(list(scenario['tickers'].values()))[found]
+
+    return shocks
+
+
+# (scenarios x tickers) matrix of shocked returns
+def shock_matrix(scenarios, tickers, prices):
+    return np.vstack([scenario_returns(scenario, tickers, prices) for scenario in scenarios])
+
+
+# P&L of every portfolio under every scenario in one matrix product.
+# Returns dollar and percentage impact tables (portfolios x scenarios).
+def run_stress_test(scenarios, portfolios=None, tickers=None, positions=None):
+    if positions is None:
+        portfolios, tickers, positions = load_positions()
+    shocks = shock_matrix(scenarios, tickers, load_price_matrix())
+    pnl = positions @ shocks.T
+    portfolio_values = positions.sum(axis=1)
+
+    names = [scenario['name'] for scenario in scenarios]
+    pnl_df = pd.DataFrame(pnl, index=portfolios, columns=names)
+    pct_df = pd.DataFrame(pnl / portfolio_values[:, None] * 100, index=portfolios, columns=names)
+    return pnl_df, pct_df
+
+
+# Impact of one scenario on each holding of one portfolio
+def holding_impact(portfolio, scenario):
+    portfolios, tickers, positions = load_positions()
+    row = positions[portfolios.index(portfolio)]
+    held = np.nonzero(row)[0]
+    shocks = scenario_returns(scenario, tickers, load_price_matrix())
+    return pd.DataFrame({
+        'Stock': tickers[held],
+        'Position ($)': row[held],
+        'Shock (%)': shocks[held] * 100,
+        'P&L ($)': row[held] * shocks[held],
+    }).sort_values('P&L ($)', kind='stable').reset_index(drop=True)
@@ -0,0 +1,71 @@
+from functools import lru_cache
+
+import numpy as np
+import streamlit as st
+
+from portfolio_data import PORTFOLIO_VALUES_FILE, file_version, load_portfolio_values
+from portfolios import BASE_CURRENCY
+from price_store import FX_RATES_FILE, load_portfolio_values_in
+
+PAGE_SIZE_OPTIONS = [10, 25, 50, 100]
+
+
+# Row positions inside the selected date range, in the requested sort order.
+# Days are stored in order, so the range is a contiguous slice found by binary search.
+@lru_cache(maxsize=64)
+def _row_order(path, version, currency, sort_column, ascending, start_day, end_day):
+    df = load_portfolio_values_in(currency, path)
+    days = df['Day'].to_numpy()
+    lo = np.searchsorted(days, np.datetime64(start_day), side='left')
+    hi = np.searchsorted(days, np.datetime64(end_day), side='right')
+
+    if sort_column == 'Day':
+        order = np.arange(lo, hi)
+        return order if ascending else order[::-1]
+
+    values = df[sort_column].to_numpy()[lo:hi]
+    order = np.argsort(values if ascending else -values, kind='stable')
+    return order + lo
+
+
+# A single page of the table, restricted to the projected columns
+@lru_cache(maxsize=256)
+def _table_page(path, version, currency, columns, sort_column, ascending, start_day, end_day, page, page_size):
+    df = load_portfolio_values_in(currency, path)
+    order = _row_order(path, version, currency, sort_column, ascending, start_day, end_day)
+    rows = order[page * page_size:(page + 1) * page_size]
+    return df.iloc[rows][['Day', *columns]].reset_index(drop=True)
+
+
+# Server-side paginated view: only the visible window is sent to the browser.
+# Values are shown (and sorted) in the display currency.
+def render_paginated_table(columns, path=PORTFOLIO_VALUES_FILE, key="portfolio_table", currency=BASE_CURRENCY):
+    version = (file_version(path), file_version(FX_RATES_FILE))
+    df = load_portfolio_values(path)
+    first_day, last_day = df['Day'].iloc[0].date(), df['Day'].iloc[-1].date()
+
+    col1, col2, col3, col4 = st.columns([2, 1, 2, 1])
+    with col1:
+        sort_column = st.selectbox("Sort by", ['Day', *columns], key=f"{key}_sort")
+    with col2:
+        ascending = st.toggle("Ascending", value=True, key=f"{key}_ascending")
+    with col3:
+        date_range = st.date_input("Date range", value=(first_day, last_day),
+                                   min_value=first_day, max_value=last_day, key=f"{key}_range")
+    with col4:
+        page_size = st.selectbox("Rows per page", PAGE_SIZE_OPTIONS, index=1, key=f"{key}_page_size")
+
+    # The date picker returns a single date while a range is still being selected
+    start_day, end_day = date_range if len(date_range) == 2 else (date_range[0], date_range[0])
+
+    n_rows = len(_row_order(path, version, currency, sort_column, ascending, str(start_day), str(end_day)))
+    n_pages = max(1, -(-n_rows // page_size))
+    page = st.number_input("Page", min_value=1, max_value=n_pages, value=1, key=f"{key}_page") - 1
+    page = min(page, n_pages - 1)
+
+    page_df = _table_page(path, version, currency, tuple(columns), sort_column, ascending,
+                          str(start_day), str(end_day), page, page_size)
+    st.dataframe(page_df, hide_index=True, width='stretch')
+
+    first_row = page * page_size + 1 if n_rows else 0
+    st.caption(f"Rows {first_row}-{first_row + len(page_df) - 1 if n_rows else 0} of {n_rows} (page {page + 1} of {n_pages})")
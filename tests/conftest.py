@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+
+# A working directory holding the repo's data files (linked, so they are read but
+# never rewritten), for tests that replace some of them. Every loader reads
+# relative paths and caches on content versions, so nothing leaks between tests.
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    for name in os.listdir(REPO):
+        if name.endswith('.csv'):
+            os.symlink(os.path.join(REPO, name), tmp_path / name)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def repo_dir(monkeypatch):
+    monkeypatch.chdir(REPO)
+    return REPO
@@ -0,0 +1,60 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import api
+from risk import _tail_from_scenarios
+
+
+def _get(target, headers=None):
+    response = asyncio.run(api._handle_request('GET', target, headers or {}))
+    head, _, body = response.partition(b'\r\n\r\n')
+    return int(head.split(b' ')[1]), body
+
+
+def test_rankings_on_a_day(repo_dir):
+    status, body = _get('/rankings?day=2025-01-18')
+    assert status == 200
+    ranking = json.loads(body)['data']
+    assert sorted(ranking['Rank']) == list(range(1, len(ranking['Rank']) + 1))
+
+
+def test_rankings_reject_a_malformed_day(repo_dir):
+    status, body = _get('/rankings?day=notadate')
+    assert status == 400
+    assert 'day' in json.loads(body)['error']
+    assert _get('/rankings?day=1990-01-01')[0] == 404
+
+
+def test_response_cache_is_bounded_under_concurrent_renders(repo_dir, monkeypatch):
+    monkeypatch.setattr(api, 'RESPONSE_CACHE_SIZE', 8)
+    api._responses.clear()
+    version = api._data_version()
+    queries = [f"portfolios=bryan&start=2024-12-{day:02d}" for day in range(9, 31)] * 4
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda query: api._render('/portfolios/values', query, api.JSON_MEDIA_TYPE, version), queries))
+    assert len(api._responses) == 8
+
+
+def test_risk_rejects_a_horizon_past_the_history(repo_dir):
+    days = len(api.load_price_matrix())
+    assert _get(f'/risk?horizon={days - 1}')[0] == 200
+    status, body = _get(f'/risk?horizon={days}')
+    assert status == 400
+    assert 'horizon' in json.loads(body)['error']
+    assert _get('/risk?horizon=10000')[0] == 400
+
+
+def test_tail_risk_without_scenarios_raises():
+    with pytest.raises(ValueError, match="No return scenarios"):
+        _tail_from_scenarios(np.empty((0, 2)), np.ones((1, 2)), 0.95)
+
+
+def test_stock_returns_reject_an_unknown_adjustment(repo_dir):
+    assert _get('/stocks/returns?adjustment=total&tickers=AAPL')[0] == 200
+    status, body = _get('/stocks/returns?adjustment=dividends')
+    assert status == 400
+    assert 'adjustment' in json.loads(body)['error']
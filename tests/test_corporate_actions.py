@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from corporate_actions import adjustment_factors, load_corporate_actions
+from ledger import ledger_from_allocation, load_valuations
+from portfolios import INITIAL_INVESTMENT
+from price_store import load_price_matrix
+
+
+def _actions(*rows):
+    return pd.DataFrame(rows, columns=['Date', 'Ticker', 'Action', 'Value', 'In Source']).astype(
+        {'Date': 'datetime64[ns]', 'In Source': bool})
+
+
+PRICES = pd.DataFrame({'A': [100.0, 100, 50, 50, 50], 'B': [np.nan, 20, 20, 20, 10]},
+                      index=pd.bdate_range('2024-01-01', periods=5))
+
+
+def test_split_back_adjusts_earlier_prices():
+    actions = _actions(('2024-01-03', 'A', 'split', 2, False))
+    factors = adjustment_factors(PRICES, actions)
+    np.testing.assert_allclose(factors[:, 0], [0.5, 0.5, 1, 1, 1])
+    np.testing.assert_allclose((PRICES * factors)['A'], 50)
+    np.testing.assert_allclose(factors[:, 1], 1)
+
+
+def test_splits_already_in_the_source_are_not_applied():
+    actions = _actions(('2024-01-03', 'A', 'split', 2, True))
+    np.testing.assert_allclose(adjustment_factors(PRICES, actions), 1)
+
+
+def test_dividends_only_adjust_total_return_prices():
+    actions = _actions(('2024-01-04', 'B', 'dividend', 2, False), ('2024-01-05', 'B', 'split', 2, False))
+    np.testing.assert_allclose(adjustment_factors(PRICES, actions)[:, 1], [0.5, 0.5, 0.5, 0.5, 1])
+    # 1 - 2 / 20 on every close before the ex-date, compounded with the later split
+    np.testing.assert_allclose(adjustment_factors(PRICES, actions, total_return=True)[:, 1],
+                               [0.45, 0.45, 0.45, 0.5, 1])
+
+
+def test_events_outside_the_history_are_ignored():
+    actions = _actions(('2023-06-01', 'A', 'split', 4, False), ('2025-01-01', 'A', 'split', 4, False),
+                       ('2024-01-02', 'B', 'dividend', 1, False), ('2024-01-02', 'C', 'split', 2, False))
+    np.testing.assert_allclose(adjustment_factors(PRICES, actions, total_return=True), 1)
+
+
+def test_total_return_ledger_reinvests_a_dividend_inside_the_window():
+    prices = pd.DataFrame({'A': [100.0, 100, 100, 100]}, index=pd.bdate_range('2024-01-01', periods=4))
+    actions = _actions(('2024-01-03', 'A', 'dividend', 2, False))
+    total = prices * adjustment_factors(prices, actions, total_return=True)
+    ledger = ledger_from_allocation({'A': 1.0}, prices.index[0], total)
+    _, values = ledger.valuation(total)
+    np.testing.assert_allclose(values, INITIAL_INVESTMENT * np.array([1, 1, 100 / 98, 100 / 98]))
+
+
+@pytest.mark.parametrize('adjustment', ['raw', 'split', 'total'])
+def test_valuations_start_at_the_initial_investment(repo_dir, adjustment):
+    np.testing.assert_allclose(load_valuations(adjustment).iloc[0], INITIAL_INVESTMENT)
+
+
+def test_total_return_valuations_reinvest_dividends(repo_dir):
+    split, total = load_valuations('split'), load_valuations('total')
+    assert (total.iloc[-1] >= split.iloc[-1] - 1e-9).all()
+
+
+def test_raw_prices_times_split_factors_give_the_split_adjusted_history(repo_dir):
+    actions = load_corporate_actions()
+    raw, split = load_price_matrix('raw'), load_price_matrix('split')
+    every_split = actions.assign(**{'In Source': False})
+    np.testing.assert_allclose(raw * adjustment_factors(raw, every_split), split, rtol=1e-12)
+
+    # NVDA traded near $466 before its 10:1 split and continues near $120 after it
+    assert raw['NVDA'].iloc[0] == pytest.approx(10 * split['NVDA'].iloc[0])
+    assert raw.loc['2024-06-07', 'NVDA'] / raw.loc['2024-06-10', 'NVDA'] == pytest.approx(10, rel=0.05)
+    # Tickers without splits are stored as traded
+    np.testing.assert_allclose(raw['MSFT'], split['MSFT'])
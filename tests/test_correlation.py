@@ -0,0 +1,40 @@
+import numpy as np
+
+from correlation import blocked_gram, cluster_order, correlation_matrix, load_portfolio_correlation, overlap_matrix
+
+rng = np.random.default_rng(11)
+
+
+def test_blocked_gram_matches_a_single_product():
+    matrix = rng.normal(size=(40, 23))
+    np.testing.assert_allclose(blocked_gram(matrix, block_size=5), matrix.T @ matrix, rtol=1e-12)
+
+
+def test_correlation_matrix_matches_corrcoef():
+    returns = rng.normal(size=(60, 23)) + rng.normal(size=(60, 1))
+    np.testing.assert_allclose(correlation_matrix(returns, block_size=7), np.corrcoef(returns, rowvar=False),
+                               rtol=1e-10, atol=1e-12)
+
+
+def test_overlap_is_cosine_similarity():
+    weights = np.array([[0.5, 0.5, 0], [0.5, 0.5, 0], [0, 0, 1.0], [0.25, 0.75, 0]])
+    overlap = overlap_matrix(weights, block_size=3)
+    np.testing.assert_allclose(np.diag(overlap), 1)
+    np.testing.assert_allclose(overlap[0, 1:3], [1, 0], atol=1e-12)
+    np.testing.assert_allclose(overlap[0, 3], 0.5 / np.sqrt(0.5) / np.sqrt(0.625))
+
+
+def test_cluster_order_is_a_permutation_that_groups_similar_series():
+    # Two groups of series driven by different factors, interleaved
+    factors = rng.normal(size=(200, 2))
+    returns = factors[:, [0, 1, 0, 1, 0, 1]] + 0.3 * rng.normal(size=(200, 6))
+    order = cluster_order(correlation_matrix(returns))
+    assert sorted(order) == list(range(6))
+    groups = [column % 2 for column in order]
+    assert groups in ([0, 0, 0, 1, 1, 1], [1, 1, 1, 0, 0, 0])
+    assert list(cluster_order(np.ones((1, 1)))) == [0]
+
+
+def test_portfolio_correlation_order(repo_dir):
+    names, corr = load_portfolio_correlation()
+    assert sorted(cluster_order(corr)) == list(range(len(names)))
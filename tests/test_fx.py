@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+from ledger import load_valuations
+from portfolio_data import load_portfolio_values
+from portfolios import ALLOCATIONS, INITIAL_INVESTMENT
+from price_store import FX_RATES_FILE, available_currencies, load_portfolio_values_in, load_price_matrix
+
+
+def _write_rates(data_dir):
+    dates = load_price_matrix().index
+    rates = pd.DataFrame({
+        'Date': dates.strftime('%Y-%m-%d'),
+        'EUR': 1.05 + 0.001 * np.arange(len(dates)),
+        'GBP': 1.25 + 0.002 * np.arange(len(dates)),
+        'BRL': 0.16 + 0.0001 * np.arange(len(dates)),
+    })
+    # A day without any quote and a day without a GBP quote take the previous day's rate
+    missing_day, missing_gbp = dates[-3], dates[-6]
+    rates = rates[rates['Date'] != missing_day.strftime('%Y-%m-%d')]
+    rates.loc[rates['Date'] == missing_gbp.strftime('%Y-%m-%d'), 'GBP'] = np.nan
+    (data_dir / FX_RATES_FILE).unlink()
+    rates.to_csv(data_dir / FX_RATES_FILE, index=False)
+    return rates.set_index(pd.to_datetime(rates['Date'])).drop(columns='Date').ffill(), missing_day, missing_gbp
+
+
+def _on(rates, dates):
+    return rates.reindex(rates.index.union(dates)).ffill().reindex(dates)
+
+
+def test_values_convert_with_forward_filled_rates(data_dir):
+    rates, missing_day, missing_gbp = _write_rates(data_dir)
+    assert available_currencies() == ['USD', 'EUR', 'GBP', 'BRL']
+
+    usd = load_portfolio_values()
+    for currency in ('EUR', 'GBP'):
+        converted = load_portfolio_values_in(currency)
+        expected = usd.iloc[:, 1:].to_numpy() / _on(rates[currency], usd['Day']).to_numpy()[:, None]
+        np.testing.assert_allclose(converted.iloc[:, 1:].to_numpy(), expected, rtol=1e-12)
+
+    days = pd.DatetimeIndex(usd['Day'])
+    eur = load_portfolio_values_in('EUR').set_index('Day')
+    before = days[days.get_loc(missing_day) - 1]
+    np.testing.assert_allclose(eur.loc[missing_day] * rates.loc[before, 'EUR'], usd.set_index('Day').loc[missing_day])
+    gbp = load_portfolio_values_in('GBP').set_index('Day')
+    before = days[days.get_loc(missing_gbp) - 1]
+    np.testing.assert_allclose(gbp.loc[missing_gbp] * rates.loc[before, 'GBP'], usd.set_index('Day').loc[missing_gbp])
+
+
+def test_brl_holdings_convert_to_usd(data_dir):
+    rates, _, _ = _write_rates(data_dir)
+    local = load_price_matrix(currency=None)['TSMC34.SA']
+    usd = load_price_matrix()['TSMC34.SA']
+    np.testing.assert_allclose(usd, local * _on(rates['BRL'], usd.index).to_numpy(), rtol=1e-12)
+    # Dollar-quoted tickers are untouched in USD and divided by the rate in EUR
+    np.testing.assert_allclose(load_price_matrix()['AAPL'], load_price_matrix(currency=None)['AAPL'])
+    np.testing.assert_allclose(load_price_matrix(currency='EUR')['AAPL'],
+                               load_price_matrix()['AAPL'] / _on(rates['EUR'], usd.index).to_numpy(), rtol=1e-12)
+
+
+def test_valuations_in_another_currency(data_dir):
+    rates, _, _ = _write_rates(data_dir)
+    usd = load_valuations()
+    gbp = load_valuations(currency='GBP')
+    np.testing.assert_allclose(gbp.to_numpy(), usd.to_numpy() / _on(rates['GBP'], usd.index).to_numpy()[:, None],
+                               rtol=1e-12)
+
+    # Rylan's BRL holding is bought and valued at converted prices
+    allocation = ALLOCATIONS['rylan']
+    assert 'TSMC34.SA' in allocation
+    prices = load_price_matrix().loc[usd.index, list(allocation)]
+    expected = INITIAL_INVESTMENT * (prices / prices.iloc[0]).to_numpy() @ np.array(list(allocation.values()))
+    np.testing.assert_allclose(usd['rylan'], expected, rtol=1e-12)
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import intraday
+from intraday import OHLC_COLUMNS, intraday_values, load_intraday_prices, resample_intraday
+from ledger import load_valuations
+from price_store import load_price_matrix
+
+DAYS = ['2025-01-17', '2025-01-21']
+
+
+def _minute_bars(day, tickers, rng, minutes=150):
+    times = pd.Timestamp(day) + pd.Timedelta(hours=9, minutes=30) + pd.to_timedelta(np.arange(minutes), unit='min')
+    frames = []
+    for ticker in tickers:
+        close = 100 + np.cumsum(rng.normal(size=minutes))
+        open_ = close + rng.normal(scale=0.1, size=minutes)
+        frames.append(pd.DataFrame({
+            'Datetime': times, 'Ticker': ticker, 'Open': open_,
+            'High': np.maximum(open_, close) + 0.2, 'Low': np.minimum(open_, close) - 0.2, 'Close': close,
+            'Volume': rng.integers(1, 1000, size=minutes),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def _write_minutes(directory, bars_by_day, rng):
+    minute_dir = directory / 'minute'
+    minute_dir.mkdir(parents=True, exist_ok=True)
+    for day, bars in bars_by_day.items():
+        # Stored out of order, so chunk boundaries cut across buckets
+        bars.sample(frac=1, random_state=rng.integers(1 << 31)).to_csv(minute_dir / f"{day}.csv", index=False)
+
+
+def _reference(bars, freq):
+    bars = bars.sort_values('Datetime')
+    grouped = bars.groupby([bars['Ticker'], bars['Datetime'].dt.floor(freq).rename('Datetime')])
+    return grouped.agg(Open=('Open', 'first'), High=('High', 'max'), Low=('Low', 'min'),
+                       Close=('Close', 'last'), Volume=('Volume', 'sum')).reset_index()
+
+
+@pytest.fixture
+def minute_data(tmp_path, monkeypatch):
+    monkeypatch.setattr(intraday, 'CHUNK_SIZE', 37)
+    rng = np.random.default_rng(7)
+    bars = {day: _minute_bars(day, ['AAPL', 'MSFT', 'NVDA'], rng) for day in DAYS}
+    _write_minutes(tmp_path, bars, rng)
+    return tmp_path, pd.concat(bars.values(), ignore_index=True)
+
+
+@pytest.mark.parametrize('level, freq', [('hour', 'h'), ('day', 'D')])
+def test_chunked_resample_matches_a_single_pass(minute_data, level, freq):
+    directory, bars = minute_data
+    assert resample_intraday(str(directory))
+    # The hour file is written day by day
+    resampled = pd.read_csv(directory / f"{level}.csv", parse_dates=['Datetime'])
+    resampled = resampled.sort_values(['Ticker', 'Datetime'], kind='stable').reset_index(drop=True)
+    expected = _reference(bars, freq)
+    pd.testing.assert_frame_equal(resampled[['Ticker', 'Datetime'] + OHLC_COLUMNS], expected,
+                                  check_dtype=False, rtol=1e-12)
+
+
+def test_resample_is_skipped_while_the_lineage_is_current(minute_data):
+    directory, _ = minute_data
+    assert resample_intraday(str(directory))
+    assert not resample_intraday(str(directory))
+    # Changing a minute file (its content, not just its time) rebuilds both levels
+    path = directory / 'minute' / f"{DAYS[0]}.csv"
+    path.write_text(path.read_text().replace('AAPL', 'AAPX', 1))
+    assert resample_intraday(str(directory))
+    assert not resample_intraday(str(directory))
+
+
+def test_merge_partials_keeps_first_and_last_across_chunks():
+    bars = _minute_bars(DAYS[0], ['AAPL'], np.random.default_rng(3), minutes=120).sample(frac=1, random_state=1)
+    partials = [intraday._ohlc(bars.iloc[i:i + 25], 'h') for i in range(0, len(bars), 25)]
+    merged = intraday._merge_partials(partials).reset_index().rename(columns={'Bucket': 'Datetime'})
+    pd.testing.assert_frame_equal(merged[['Ticker', 'Datetime'] + OHLC_COLUMNS], _reference(bars, 'h'),
+                                  check_dtype=False)
+
+
+def test_load_intraday_prices_by_level(minute_data):
+    directory, bars = minute_data
+    minutes = load_intraday_prices('minute', DAYS[1], DAYS[1], str(directory))
+    assert minutes.index.normalize().unique().tolist() == [pd.Timestamp(DAYS[1])]
+    expected = bars[bars['Datetime'].dt.normalize() == DAYS[1]].pivot(index='Datetime', columns='Ticker', values='Close')
+    pd.testing.assert_frame_equal(minutes, expected, check_names=False)
+
+    hours = load_intraday_prices('hour', DAYS[0], DAYS[1], str(directory))
+    np.testing.assert_allclose(hours.to_numpy(), _reference(bars, 'h').pivot(
+        index='Datetime', columns='Ticker', values='Close').to_numpy())
+    assert load_intraday_prices('day', '2020-01-01', '2020-01-02', str(directory)).empty
+
+
+def test_intraday_values_at_the_daily_closes(repo_dir, tmp_path):
+    # One bar per ticker at each day's daily close values every portfolio as the ledgers do
+    prices = load_price_matrix()
+    rows = []
+    for day in DAYS:
+        closes = prices.loc[day].dropna()
+        rows.append(pd.DataFrame({'Datetime': pd.Timestamp(day) + pd.Timedelta(hours=15, minutes=59),
+                                  'Ticker': closes.index, 'Open': closes.values, 'High': closes.values,
+                                  'Low': closes.values, 'Close': closes.values, 'Volume': 1}))
+    _write_minutes(tmp_path, dict(zip(DAYS, rows)), np.random.default_rng(0))
+
+    values = intraday_values('minute', DAYS[0], DAYS[1], str(tmp_path))
+    expected = load_valuations().loc[DAYS]
+    np.testing.assert_allclose(values.to_numpy(), expected.to_numpy(), rtol=1e-12)
@@ -0,0 +1,26 @@
+import numpy as np
+
+from leaderboard import leaderboard_html
+from portfolios import INITIAL_INVESTMENT
+from simulator import entrant_metrics, synthetic_allocations, value_entrants
+
+
+def test_leaderboard_shows_the_display_currency():
+    names, values = ['a', 'b'], [1234.5, 99.0]
+    assert '$1,234.50' in leaderboard_html(names, values)
+    html = leaderboard_html(names, values, currency='EUR')
+    assert '€1,234.50' in html and '$' not in html
+    assert 'CHF 99.00' in leaderboard_html(names, np.array(values), currency='CHF')
+
+
+def test_simulated_entrants_are_valued_and_ranked_in_one_pass():
+    prices = np.array([[10.0, 20, 40], [11, 18, 40], [12, 22, 44]])
+    weights = synthetic_allocations(500, 3, min_holdings=1, max_holdings=2, seed=3)
+    np.testing.assert_allclose(weights.sum(axis=1), 1)
+    assert set(np.count_nonzero(weights, axis=1)) <= {1, 2}
+
+    values = value_entrants(prices, weights)
+    np.testing.assert_allclose(values[0], INITIAL_INVESTMENT)
+    np.testing.assert_allclose(values[:, 7], INITIAL_INVESTMENT * (prices / prices[0]) @ weights[7])
+    metrics = entrant_metrics(np.arange(500), values)
+    np.testing.assert_array_equal(metrics['Rank'], 1 + (values[-1][None, :] > values[-1][:, None]).sum(axis=1))
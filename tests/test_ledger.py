@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+from ledger import PositionLedger, ledger_from_allocation, load_valuations
+from portfolio_data import load_portfolio_values
+from portfolios import ALLOCATIONS, INITIAL_INVESTMENT
+
+
+def _prices(**columns):
+    return pd.DataFrame(columns, index=pd.bdate_range('2024-01-01', periods=len(next(iter(columns.values())))),
+                        dtype=float)
+
+
+def test_trades_and_cash():
+    prices = _prices(A=[10, 11, 12, 13], B=[20, 20, 30, 30])
+    ledger = PositionLedger(prices.columns, capacity=1)
+    ledger.deposit('2024-01-01', 1000)
+    ledger.buy('2024-01-01', 'A', 50)
+    ledger.buy('2024-01-02', 'B', 10, price=19)
+    ledger.sell('2024-01-04', 'A', 20)
+    shares, cash = ledger.replay(prices)
+    np.testing.assert_allclose(shares, [[50, 0], [50, 10], [50, 10], [30, 10]])
+    np.testing.assert_allclose(cash, [500, 310, 310, 570])
+    _, totals = ledger.valuation(prices)
+    np.testing.assert_allclose(totals, [1000, 1060, 1210, 1260])
+
+
+def test_split_scales_earlier_and_later_trades():
+    prices = _prices(A=[100, 100, 50, 50])
+    ledger = PositionLedger(prices.columns)
+    ledger.buy('2024-01-01', 'A', 10)
+    ledger.split('2024-01-03', 'A', 2)
+    ledger.buy('2024-01-04', 'A', 4)
+    shares, cash = ledger.replay(prices)
+    np.testing.assert_allclose(shares[:, 0], [10, 10, 20, 24])
+    np.testing.assert_allclose(cash, [-1000, -1000, -1000, -1200])
+
+
+def test_dividend_paid_on_previous_close_holding():
+    prices = _prices(A=[10, 10, 10])
+    ledger = PositionLedger(prices.columns)
+    ledger.buy('2024-01-01', 'A', 10)
+    ledger.dividend('2024-01-02', 'A', 0.5)
+    ledger.buy('2024-01-02', 'A', 10)
+    _, cash = ledger.replay(prices)
+    np.testing.assert_allclose(cash, [-100, -195, -195])
+
+
+def test_events_outside_the_history():
+    prices = _prices(A=[10, 10, 10])
+    ledger = PositionLedger(prices.columns)
+    # A weekend deposit lands on the next trading day
+    ledger.deposit('2023-12-30', 100)
+    ledger.buy('2024-01-01', 'A', 5)
+    # Events after the last day do not reach back into the history
+    ledger.deposit('2024-02-01', 1000)
+    ledger.buy('2024-02-01', 'A', 100)
+    ledger.split('2024-02-01', 'A', 10)
+    shares, cash = ledger.replay(prices)
+    np.testing.assert_allclose(shares[:, 0], [5, 5, 5])
+    np.testing.assert_allclose(cash, [50, 50, 50])
+
+
+def test_buy_and_hold_ledgers_start_at_the_initial_investment(repo_dir):
+    valuations = load_valuations()
+    assert valuations.index[0] == load_portfolio_values()['Day'].iloc[0]
+    np.testing.assert_allclose(valuations.iloc[0], INITIAL_INVESTMENT)
+    assert list(valuations.columns) == list(ALLOCATIONS)
+
+
+def test_allocation_ledger_buys_at_the_start_close():
+    prices = _prices(A=[10, 20], B=[50, 25])
+    ledger = ledger_from_allocation({'A': 0.25, 'B': 0.75}, prices.index[0], prices)
+    shares, cash = ledger.replay(prices)
+    np.testing.assert_allclose(shares[0], [INITIAL_INVESTMENT * 0.25 / 10, INITIAL_INVESTMENT * 0.75 / 50])
+    np.testing.assert_allclose(cash, 0, atol=1e-9)
@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+from lineage import is_current, lineage_file, lineage_report, read_lineage, write_lineage
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    source = tmp_path / 'source.csv'
+    output = tmp_path / 'output.csv'
+    source.write_text("a\n1\n")
+    output.write_text("b\n2\n")
+    write_lineage(str(output), 'tests.build', inputs=[str(source)], parameters={'freq': 'h'})
+    return str(source), str(output)
+
+
+def test_recorded_dataset_is_current(dataset):
+    source, output = dataset
+    assert is_current(output, inputs=[source], parameters={'freq': 'h'})
+    record = read_lineage(output)
+    assert record['producer'] == 'tests.build' and list(record['inputs']) == [source]
+    assert [row[2] for row in lineage_report([output, source])] == ['current', 'external']
+
+
+def test_changed_input_forces_a_rebuild(dataset):
+    source, output = dataset
+    with open(source, 'a') as f:
+        f.write("2\n")
+    assert not is_current(output)
+    assert lineage_report([output])[0][2] == 'stale'
+
+
+def test_unchanged_content_stays_current(dataset):
+    source, output = dataset
+    # Rewriting the same bytes changes the mtime but not the content version
+    with open(source) as f:
+        content = f.read()
+    os.utime(source, ns=(0, 0))
+    with open(source, 'w') as f:
+        f.write(content)
+    assert is_current(output)
+
+
+def test_changed_output_inputs_or_parameters_force_a_rebuild(dataset, tmp_path):
+    source, output = dataset
+    assert not is_current(output, parameters={'freq': 'D'})
+    assert not is_current(output, inputs=[source, str(tmp_path / 'other.csv')])
+    with open(output, 'a') as f:
+        f.write("3\n")
+    assert not is_current(output)
+
+
+def test_missing_output_or_record_forces_a_rebuild(dataset):
+    source, output = dataset
+    os.remove(lineage_file(output))
+    assert read_lineage(output) is None
+    assert not is_current(output)
+
+    write_lineage(output, 'tests.build', inputs=[source])
+    os.remove(output)
+    assert not is_current(output)
+    assert lineage_report([output])[0][2] == 'missing'
+
+
+def test_missing_input_forces_a_rebuild(dataset):
+    source, output = dataset
+    os.remove(source)
+    assert not is_current(output)
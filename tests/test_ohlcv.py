@@ -0,0 +1,31 @@
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+
+from ohlcv import bollinger, ema, rsi, sma
+
+PRICES = 100 + np.cumsum(np.random.default_rng(0).normal(size=500))
+
+
+def test_moving_averages_match_pandas():
+    series = pd.Series(PRICES)
+    np.testing.assert_allclose(sma(PRICES, 20), series.rolling(20).mean(), rtol=1e-10)
+    seeded = pd.concat([pd.Series([series[:20].mean()]), series[20:]]).ewm(span=20, adjust=False).mean()
+    np.testing.assert_allclose(ema(PRICES, 20)[19:], seeded, rtol=1e-10)
+    assert np.isnan(ema(PRICES, 20)[:19]).all()
+
+
+def test_bollinger_and_rsi_bounds():
+    mid, lower, upper = bollinger(PRICES, 20)
+    np.testing.assert_allclose(upper - mid, 2 * pd.Series(PRICES).rolling(20).std(ddof=0), rtol=1e-6)
+    values = rsi(PRICES, 14)
+    assert np.isnan(values[:14]).all()
+    assert ((values[14:] >= 0) & (values[14:] <= 100)).all()
+    assert rsi(np.arange(30.0), 14)[-1] == 100
+
+
+def test_storage_and_indicators_do_not_import_plotly(repo_dir):
+    code = "import sys, ohlcv; print('plotly' in sys.modules)"
+    assert subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout.strip() == 'False'
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from portfolios import BASE_CURRENCY, TICKER_CURRENCIES
+from price_store import FX_RATES_FILE, load_price_matrix
+from quotes import QuoteRing, QuoteService, ReplayQuotes
+
+
+def _write_rates(data_dir, currency, rate):
+    dates = load_price_matrix().index
+    (data_dir / FX_RATES_FILE).unlink()
+    pd.DataFrame({'Date': dates.strftime('%Y-%m-%d'), currency: rate}).to_csv(data_dir / FX_RATES_FILE, index=False)
+
+
+def test_ring_keeps_latest_quotes_in_order():
+    ring = QuoteRing(['A', 'B'], capacity=3)
+    for t in range(5):
+        ring.append(float(t), np.array([t, np.nan if t % 2 else 10.0 * t]))
+    assert list(ring.history('A')) == [2, 3, 4]
+    assert list(ring.history('B')) == [0, 20, 40]
+    assert list(ring.latest) == [4, 40]
+
+
+def test_replayed_last_close_values_portfolios_at_their_close(data_dir):
+    # A quote currency with a rate far from 1 makes any double conversion visible
+    _write_rates(data_dir, 'BRL', 0.2)
+    assert 'BRL' in TICKER_CURRENCIES.values()
+
+    service = QuoteService(ReplayQuotes.from_price_matrix(days=1))
+    service.update(0.0, ReplayQuotes.from_price_matrix(days=1).frame.iloc[0].to_numpy(dtype=float))
+    _, values = service.current_values()
+    np.testing.assert_allclose(values.to_numpy(), service.close_values, rtol=1e-12)
+
+    quoted = ~np.isnan(service.ring.latest)
+    stored = load_price_matrix(currency=BASE_CURRENCY).iloc[-1].to_numpy()
+    np.testing.assert_allclose((service.ring.latest * service.conversion)[quoted], stored[quoted], rtol=1e-12)
+
+
+def test_replay_is_in_quote_currency(data_dir):
+    _write_rates(data_dir, 'BRL', 0.2)
+    local = ReplayQuotes.from_price_matrix(days=1).frame.iloc[-1]
+    base = load_price_matrix().iloc[-1]
+    for ticker, currency in TICKER_CURRENCIES.items():
+        assert np.isclose(local[ticker] * 0.2, base[ticker])
@@ -0,0 +1,41 @@
+import numpy as np
+
+from leaderboard import competition_ranks, load_rank_matrix, rank_history, top_n
+from portfolio_data import load_portfolio_values
+
+
+def _reference_ranks(row):
+    return np.array([1 + np.count_nonzero(row > value) for value in row])
+
+
+def test_competition_ranks_share_the_best_rank_of_a_tie():
+    np.testing.assert_array_equal(competition_ranks([5, 7, 7, 1, 5]), [3, 1, 1, 5, 3])
+    np.testing.assert_array_equal(competition_ranks([2.0]), [1])
+
+
+def test_competition_ranks_by_row_match_a_reference():
+    rng = np.random.default_rng(1)
+    # Few distinct values, so most rows have ties
+    matrix = rng.integers(0, 6, size=(200, 40)).astype(float)
+    ranks = rank_history(matrix)
+    assert ranks.shape == matrix.shape
+    for row, row_ranks in zip(matrix, ranks):
+        np.testing.assert_array_equal(row_ranks, _reference_ranks(row))
+
+
+def test_top_n_keeps_ties_at_the_cut_off():
+    values = np.array([3.0, 9, 5, 5, 1, 5])
+    selected, ranks = top_n(values, 2)
+    assert list(values[selected]) == [9, 5, 5, 5]
+    np.testing.assert_array_equal(ranks, [1, 2, 2, 2])
+    selected, ranks = top_n(values, 10)
+    np.testing.assert_array_equal(ranks, competition_ranks(values)[selected])
+    assert len(top_n(values, 0)[0]) == 0
+
+
+def test_rank_matrix_of_the_portfolio_values(repo_dir):
+    values = load_portfolio_values().iloc[:, 1:].to_numpy(dtype=float)
+    ranks = load_rank_matrix()
+    assert ranks.shape == values.shape
+    for row, row_ranks in zip(values, ranks):
+        np.testing.assert_array_equal(row_ranks, _reference_ranks(row))
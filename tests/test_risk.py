@@ -0,0 +1,55 @@
+from statistics import NormalDist
+
+import numpy as np
+import pytest
+
+from ledger import load_positions
+from price_store import load_price_matrix
+from risk import METHODS, portfolio_risk, tail_risk
+
+
+@pytest.fixture
+def positions(repo_dir):
+    return load_positions()[2]
+
+
+def _daily_moments():
+    values = load_price_matrix().to_numpy()
+    returns = np.nan_to_num(values[1:] / values[:-1] - 1)
+    return returns.mean(axis=0), np.cov(returns, rowvar=False)
+
+
+@pytest.mark.parametrize('confidence, horizon', [(0.95, 1), (0.99, 5)])
+def test_parametric_matches_the_normal_closed_form(positions, confidence, horizon):
+    mean, cov = _daily_moments()
+    normal = NormalDist(0, 1)
+    z = normal.inv_cdf(confidence)
+    for row, (var, es) in zip(positions, zip(*tail_risk(positions, 'Parametric', confidence, horizon))):
+        mu = row @ mean * horizon
+        sd = np.sqrt(row @ cov @ row * horizon)
+        assert var == pytest.approx(-NormalDist(mu, sd).inv_cdf(1 - confidence), rel=1e-9)
+        assert var == pytest.approx(z * sd - mu, rel=1e-9)
+        assert es == pytest.approx(sd * normal.pdf(z) / (1 - confidence) - mu, rel=1e-9)
+
+
+def test_monte_carlo_converges_to_parametric(positions):
+    parametric_var, parametric_es = tail_risk(positions, 'Parametric', 0.95)
+    mc_var, mc_es = tail_risk(positions, 'Monte Carlo', 0.95)
+    np.testing.assert_allclose(mc_var, parametric_var, rtol=0.05)
+    np.testing.assert_allclose(mc_es, parametric_es, rtol=0.05)
+    # The draws are seeded, so repeated runs agree exactly
+    np.testing.assert_array_equal(tail_risk(positions, 'Monte Carlo', 0.95)[0], mc_var)
+
+
+@pytest.mark.parametrize('method', METHODS)
+def test_expected_shortfall_is_at_least_value_at_risk(positions, method):
+    for confidence in (0.9, 0.95, 0.99):
+        var, es = tail_risk(positions, method, confidence)
+        assert (es >= var - 1e-9).all()
+        assert (var > 0).all()
+
+
+def test_portfolio_risk_table(repo_dir):
+    table = portfolio_risk(0.95, 1)
+    assert [column for column in table.columns if column.endswith('VaR ($)')] == [f'{m} VaR ($)' for m in METHODS]
+    np.testing.assert_allclose(table['Value ($)'], load_positions()[2].sum(axis=1))
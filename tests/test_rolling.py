@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from rolling import rolling_stats
+
+rng = np.random.default_rng(5)
+VALUES = 100 * np.cumprod(1 + rng.normal(0, 0.02, size=(120, 3)), axis=0)
+BENCHMARK = 100 * np.cumprod(1 + rng.normal(0, 0.01, size=120))
+
+
+@pytest.mark.parametrize('window', [2, 5, 20])
+def test_rolling_stats_match_pandas(window):
+    stats = rolling_stats(VALUES, BENCHMARK, window)
+    frame = pd.DataFrame(VALUES)
+    returns = frame.pct_change()
+    benchmark_returns = pd.Series(BENCHMARK).pct_change()
+
+    np.testing.assert_allclose(stats['Return (%)'], frame.pct_change(window) * 100, rtol=1e-10)
+    # The first return is missing, so the first full window of values holds window - 1 returns
+    expected_volatility = returns.rolling(window, min_periods=1).std() * 100
+    expected_correlation = returns.rolling(window, min_periods=1).corr(benchmark_returns)
+    full = slice(window - 1, None)
+    np.testing.assert_allclose(stats['Volatility (%)'][full], expected_volatility[full], rtol=1e-8)
+    np.testing.assert_allclose(stats['Correlation to S&P 500'][full], expected_correlation[full], rtol=1e-8, atol=1e-12)
+    # Documented NaNs before the first full window
+    assert np.isnan(stats['Volatility (%)'][:window - 1]).all()
+    assert np.isnan(stats['Correlation to S&P 500'][:window - 1]).all()
+    assert np.isnan(stats['Return (%)'][:window]).all()
+
+
+def test_constant_series_has_zero_volatility_and_no_correlation():
+    values = np.column_stack([np.full(30, 50.0), VALUES[:30, 0]])
+    stats = rolling_stats(values, BENCHMARK[:30], 10)
+    np.testing.assert_array_equal(stats['Volatility (%)'][9:, 0], 0)
+    np.testing.assert_array_equal(stats['Return (%)'][10:, 0], 0)
+    assert np.isnan(stats['Correlation to S&P 500'][9:, 0]).all()
+    assert np.isfinite(stats['Correlation to S&P 500'][9:, 1]).all()
+
+
+def test_missing_values_are_skipped_inside_the_window():
+    values = VALUES[:, :1].copy()
+    values[40] = np.nan
+    volatility = rolling_stats(values, BENCHMARK, 10)['Volatility (%)'][:, 0]
+    expected = pd.Series(values[:, 0]).pct_change(fill_method=None).rolling(10, min_periods=2).std() * 100
+    np.testing.assert_allclose(volatility[9:], expected[9:], rtol=1e-8)
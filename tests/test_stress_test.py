@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+from ledger import load_positions
+from portfolios import SECTORS
+from price_store import load_price_matrix
+from stress_test import PREDEFINED_SCENARIOS, run_stress_test, scenario_returns, shock_matrix
+
+PRICES = pd.DataFrame({'AAPL': [100.0, 104, 110, 99], 'NVDA': [50.0, 40, 45, 60], 'COIN': [np.nan, 10, 12, 9]},
+                      index=pd.to_datetime(['2024-11-01', '2024-11-04', '2024-11-05', '2024-11-08']))
+TICKERS = PRICES.columns
+
+
+def test_historical_replay_uses_the_trading_days_inside_the_window():
+    # Starts on a weekend, so the first trading day after it is the base
+    shocks = scenario_returns({'replay': ('2024-11-02', '2024-11-06')}, TICKERS, PRICES)
+    np.testing.assert_allclose(shocks, [110 / 104 - 1, 45 / 40 - 1, 12 / 10 - 1])
+    # A ticker without a price at the start of the window is not shocked
+    shocks = scenario_returns({'replay': ('2024-11-01', '2024-11-08')}, TICKERS, PRICES)
+    np.testing.assert_allclose(shocks, [-0.01, 0.2, 0])
+
+
+def test_ticker_shocks_override_sector_and_replay_shocks():
+    assert SECTORS['NVDA'] == SECTORS['AAPL'] == 'Technology'
+    scenario = {'replay': ('2024-11-01', '2024-11-08'), 'sectors': {'Technology': -0.15},
+                'tickers': {'NVDA': 0.05, 'XXXX': 1.0}}
+    np.testing.assert_allclose(scenario_returns(scenario, TICKERS, PRICES), [-0.15, 0.05, 0])
+
+
+def test_portfolio_pnl_is_one_product_of_every_scenario(repo_dir):
+    portfolios, tickers, positions = load_positions()
+    pnl, pct = run_stress_test(PREDEFINED_SCENARIOS)
+    prices = load_price_matrix()
+    for i, portfolio in enumerate(portfolios):
+        for scenario in PREDEFINED_SCENARIOS:
+            shocks = scenario_returns(scenario, tickers, prices)
+            expected = sum(value * shock for value, shock in zip(positions[i], shocks))
+            assert np.isclose(pnl.loc[portfolio, scenario['name']], expected, rtol=1e-12, atol=1e-9)
+    np.testing.assert_allclose(pct.to_numpy(), pnl.to_numpy() / positions.sum(axis=1)[:, None] * 100)
+    assert shock_matrix(PREDEFINED_SCENARIOS, tickers, prices).shape == (len(PREDEFINED_SCENARIOS), len(tickers))
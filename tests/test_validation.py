@@ -0,0 +1,37 @@
+import pandas as pd
+import pytest
+
+from portfolio_data import FINAL_PORTFOLIO_VALUES_FILE
+from validation import ERROR, DataValidationError, check_frame, dataset_kinds, normalize_name, quality_report, read_validated
+
+
+def test_normalize_name():
+    assert normalize_name('\ufeffDay') == 'Day'
+    assert normalize_name(' Makeenie ') == 'makeenie'
+    assert normalize_name('SMP-500') == 'SMP-500'
+
+
+def test_byte_order_mark_file_is_checked(repo_dir):
+    kinds = dataset_kinds()
+    assert kinds[FINAL_PORTFOLIO_VALUES_FILE] == 'final_portfolio_values'
+    report = quality_report({FINAL_PORTFOLIO_VALUES_FILE: kinds[FINAL_PORTFOLIO_VALUES_FILE]})
+    assert {'byte-order mark', 'names'} <= set(report['Check'])
+    assert not (report['Severity'] == ERROR).any()
+
+    frame = read_validated(FINAL_PORTFOLIO_VALUES_FILE, 'final_portfolio_values')
+    assert frame.columns[0] == 'Day' and 'makeenie' in frame.columns
+    assert frame['Day'].iloc[0] == pd.Timestamp('2024-12-09')
+
+
+def test_errors_stop_the_load(tmp_path):
+    path = tmp_path / 'values.csv'
+    pd.DataFrame({'Day': ['2024-01-02', '2024-01-01'], 'a': [1, 'x']}).to_csv(path, index=False)
+    with pytest.raises(DataValidationError) as error:
+        read_validated(path, 'portfolio_values')
+    checks = {check for severity, check, _ in error.value.issues if severity == ERROR}
+    assert checks == {'schema', 'monotonic dates'}
+
+
+def test_duplicate_timestamps():
+    frame = pd.DataFrame({'Day': ['2024-01-01', '2024-01-01'], 'a': [1.0, 2.0]})
+    assert (ERROR, 'duplicate timestamps', '1, e.g. 2024-01-01') in check_frame(frame, 'portfolio_values')
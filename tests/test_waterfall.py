@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+
+from portfolio_data import load_stock_values
+from waterfall import MAX_BARS, choose_bucket, stock_deltas
+
+
+def test_choose_bucket_counts_dates_with_data():
+    assert choose_bucket(pd.bdate_range('2024-01-01', periods=MAX_BARS)) == 'D'
+    assert choose_bucket(pd.bdate_range('2024-01-01', periods=MAX_BARS + 1)) == 'W'
+    assert choose_bucket(pd.bdate_range('2022-01-01', '2024-12-31')) == 'M'
+    assert choose_bucket(pd.bdate_range('2000-01-01', '2024-12-31')) == 'Q'
+
+
+def test_long_window_over_short_history_is_daily(repo_dir):
+    stock_values = load_stock_values('bryan')
+    dates = stock_values['Date']
+    # A year-long window around a competition of a few weeks
+    start_value, labels, deltas, end_value = stock_deltas('bryan', 'BRK-B', dates.iloc[-1] - pd.DateOffset(years=1),
+                                                          dates.iloc[-1])
+    assert choose_bucket(dates.iloc[1:]) == 'D'
+    assert len(deltas) == len(dates) - 1 <= MAX_BARS
+    assert list(labels) == list(dates.iloc[1:].dt.strftime('%Y-%m-%d'))
+    assert start_value == stock_values['BRK-B'].iloc[0]
+    assert end_value == stock_values['BRK-B'].iloc[-1]
+    np.testing.assert_allclose(deltas, np.diff(stock_values['BRK-B'].to_numpy()))
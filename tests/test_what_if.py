@@ -0,0 +1,32 @@
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+
+from ledger import load_valuations
+from portfolios import ALLOCATIONS, INITIAL_INVESTMENT
+from price_store import allocation_values, load_normalized_prices, weight_vector
+
+
+def test_real_allocations_match_the_ledger_valuations(repo_dir):
+    days, tickers, normalized = load_normalized_prices()
+    valuations = load_valuations()
+    assert list(days) == list(valuations.index)
+    for portfolio, allocation in ALLOCATIONS.items():
+        values = allocation_values(weight_vector(allocation, tickers), normalized)
+        np.testing.assert_allclose(values, valuations[portfolio].to_numpy(), rtol=1e-12)
+
+
+def test_weight_vector_ignores_unknown_tickers():
+    weights = weight_vector({'B': 0.25, 'X': 0.5, 'A': 0.25}, pd.Index(['A', 'B', 'C']))
+    np.testing.assert_allclose(weights, [0.25, 0.25, 0])
+    np.testing.assert_allclose(allocation_values(weights, np.array([[1.0, 1, 1], [2, 0, 5]])),
+                               [INITIAL_INVESTMENT / 2, INITIAL_INVESTMENT / 2])
+
+
+def test_headless_modules_do_not_import_ui_libraries(repo_dir):
+    code = ("import sys, api, generate_reports, warmup; warmup.warm_up(); "
+            "print(sorted({m.split('.')[0] for m in sys.modules} & {'streamlit', 'plotly'}))")
+    modules = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    assert 'streamlit' not in modules
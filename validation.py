@@ -0,0 +1,238 @@
+import argparse
+import logging
+import re
+
+import numpy as np
+import pandas as pd
+
+from portfolios import ALLOCATIONS
+
+logger = logging.getLogger(__name__)
+
+# What each kind of stored table must look like. 'date' is the date column, in
+# 'date_format' (default DATE_FORMAT); 'text' columns are kept as strings and every
+# other column must be numeric. Ordered tables
+# are time series: one row per date, ascending. 'positive' tables hold prices or
+# values, where non-positive numbers and extreme daily moves are suspicious.
+SCHEMAS = {
+    'portfolio_values': {'date': 'Day', 'required': ['Day'], 'ordered': True, 'positive': True},
+    'final_portfolio_values': {'date': 'Day', 'date_format': '%m/%d/%Y', 'required': ['Day'], 'ordered': True,
+                               'positive': True},
+    'stock_prices': {'date': 'Date', 'required': ['Date'], 'text': ['Index'], 'ordered': True, 'positive': True},
+    'stock_values': {'date': 'Date', 'required': ['Date'], 'text': ['Index'], 'ordered': True, 'positive': True},
+    'universe': {'date': 'Date', 'required': ['Date'], 'ordered': True, 'positive': True},
+    'fx_rates': {'date': 'Date', 'required': ['Date'], 'ordered': True, 'positive': True},
+    'corporate_actions': {'date': 'Date', 'required': ['Date', 'Ticker', 'Action', 'Value', 'In Source'],
+                          'text': ['Ticker', 'Action'], 'key': ['Date', 'Ticker', 'Action'],
+                          'allowed': {'Action': ['split', 'dividend']}},
+}
+
+DATE_FORMAT = '%Y-%m-%d'
+
+# A daily move larger than this (as a fraction) is reported as an outlier
+OUTLIER_RETURN = 0.5
+
+# Runs of more missing weekdays than this between two rows are reported as gaps
+# (single exchange holidays are expected)
+MAX_GAP_WEEKDAYS = 2
+
+ERROR, WARNING, INFO = 'error', 'warning', 'info'
+
+# Participant names are matched case-insensitively and stored in lower case, like
+# the per-participant file names
+_PARTICIPANTS = {participant.lower() for participant in ALLOCATIONS}
+
+
+class DataValidationError(ValueError):
+    def __init__(self, path, issues):
+        self.path = path
+        self.issues = issues
+        errors = [f"{check}: {detail}" for severity, check, detail in issues if severity == ERROR]
+        super().__init__(f"{path} failed validation: " + "; ".join(errors))
+
+
+# Column name without a byte-order mark or surrounding whitespace; participant names in lower case
+def normalize_name(name):
+    name = str(name).lstrip('\ufeff').strip()
+    return name.lower() if name.lower() in _PARTICIPANTS else name
+
+
+def _counts(mask, columns, limit=5):
+    counts = mask.sum(axis=0)
+    flagged = [(column, int(count)) for column, count in zip(columns, counts) if count]
+    listed = ", ".join(f"{column} ({count})" for column, count in flagged[:limit])
+    return listed + (f" and {len(flagged) - limit} more" if len(flagged) > limit else "")
+
+
+# Dates without any time or timezone that follows them
+def _parse_dates(column, schema, errors='raise'):
+    return pd.to_datetime(column.astype(str).str[:10], format=schema.get('date_format', DATE_FORMAT), errors=errors)
+
+
+# Every check on one table, as (severity, check, detail) tuples. `frame` is the table as
+# read (names already normalized); `calendar` is an optional set of trading days the
+# table is expected to cover between its first and last date.
+def check_frame(frame, kind, calendar=None):
+    schema = SCHEMAS[kind]
+    issues = []
+
+    mangled = [column for column in frame.columns
+               if re.fullmatch(r'.+\.\d+', column) and column.rsplit('.', 1)[0] in frame.columns]
+    if mangled or frame.columns.duplicated().any():
+        issues.append((ERROR, 'duplicate columns', ", ".join(mangled or frame.columns[frame.columns.duplicated()])))
+    missing = [column for column in schema['required'] if column not in frame.columns]
+    if missing:
+        issues.append((ERROR, 'schema', f"missing columns {', '.join(missing)}"))
+        return issues
+
+    date_column = schema['date']
+    dates = _parse_dates(frame[date_column], schema, errors='coerce')
+    bad_dates = dates.isna() & frame[date_column].notna()
+    if bad_dates.any():
+        issues.append((ERROR, 'dates', f"{int(bad_dates.sum())} unparseable, e.g. {frame[date_column][bad_dates].iloc[0]!r}"))
+
+    text = set(schema.get('text', [])) | {date_column}
+    numeric_columns = [column for column in frame.columns if column not in text]
+    raw = frame[numeric_columns]
+    values = raw.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+    not_numeric = np.isnan(values) & raw.notna().to_numpy()
+    if not_numeric.any():
+        issues.append((ERROR, 'schema', "non-numeric values in " + _counts(not_numeric, numeric_columns)))
+
+    for column, allowed in schema.get('allowed', {}).items():
+        unexpected = ~frame[column].isin(allowed)
+        if unexpected.any():
+            issues.append((ERROR, 'schema', f"unexpected {column} {sorted(frame[column][unexpected].unique())}"))
+
+    key = schema.get('key')
+    duplicated = frame.assign(**{date_column: dates}).duplicated(key) if key else dates.duplicated()
+    if duplicated.any():
+        issues.append((ERROR, 'duplicate timestamps', f"{int(duplicated.sum())}, e.g. {dates[duplicated].iloc[0]:%Y-%m-%d}"))
+
+    if schema.get('ordered'):
+        day_numbers = dates.to_numpy(dtype='datetime64[D]')
+        backwards = day_numbers[1:] < day_numbers[:-1]
+        if backwards.any():
+            issues.append((ERROR, 'monotonic dates', f"{int(backwards.sum())} rows go back in time, "
+                                                     f"first at {dates.iloc[1:][backwards].iloc[0]:%Y-%m-%d}"))
+        elif len(day_numbers) > 1:
+            skipped = np.busday_count(day_numbers[:-1], day_numbers[1:]) - 1
+            gaps = skipped > MAX_GAP_WEEKDAYS
+            if gaps.any():
+                first = int(np.argmax(gaps))
+                issues.append((WARNING, 'calendar gaps', f"{int(gaps.sum())} gaps, the first {int(skipped[first])} "
+                                                         f"weekdays after {dates.iloc[first]:%Y-%m-%d}"))
+        if calendar is not None and len(dates):
+            expected = calendar[(calendar >= dates.min()) & (calendar <= dates.max())]
+            absent = expected[~expected.isin(dates)]
+            if len(absent):
+                issues.append((WARNING, 'calendar gaps', f"{len(absent)} trading days missing, "
+                                                         f"e.g. {absent[0]:%Y-%m-%d}"))
+
+    if schema.get('positive') and len(values):
+        # Values before a series starts (e.g. a ticker not yet listed) are not counted
+        started = np.cumsum(~np.isnan(values), axis=0) > 0
+        non_positive = values <= 0
+        if non_positive.any():
+            issues.append((WARNING, 'non-positive values', _counts(non_positive, numeric_columns)))
+        interior_missing = np.isnan(values) & started
+        if interior_missing.any():
+            issues.append((WARNING, 'missing values', _counts(interior_missing, numeric_columns)))
+        positive = pd.DataFrame(np.where(values > 0, values, np.nan)).ffill().to_numpy()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            moves = np.abs(positive[1:] / positive[:-1] - 1) > OUTLIER_RETURN
+        if moves.any():
+            issues.append((WARNING, 'outliers', f"daily moves over {OUTLIER_RETURN:.0%}: " + _counts(moves, numeric_columns)))
+    return issues
+
+
+# Read a stored table, normalize its column names, parse its date column and check it.
+# Errors raise DataValidationError so bad data fails once, at ingest; warnings are
+# logged once per read (callers cache the result per file version).
+def read_validated(path, kind, calendar=None):
+    with open(path, 'rb') as f:
+        has_bom = f.read(3) == b'\xef\xbb\xbf'
+    frame = pd.read_csv(path, encoding='utf-8-sig')
+    original = list(frame.columns)
+    frame.columns = [normalize_name(column) for column in original]
+
+    issues = check_frame(frame, kind, calendar)
+    renamed = [f"{old.strip()}->{new}" for old, new in zip(original, frame.columns) if old.strip() != new]
+    if has_bom:
+        issues.append((INFO, 'byte-order mark', "removed"))
+    if renamed:
+        issues.append((INFO, 'names', ", ".join(renamed)))
+
+    if any(severity == ERROR for severity, _, _ in issues):
+        raise DataValidationError(path, issues)
+    for severity, check, detail in issues:
+        if severity == WARNING:
+            logger.warning("%s: %s: %s", path, check, detail)
+
+    schema = SCHEMAS[kind]
+    date_column = schema['date']
+    frame[date_column] = _parse_dates(frame[date_column], schema)
+    numeric_columns = [column for column in frame.columns if column not in {date_column, *schema.get('text', [])}]
+    frame[numeric_columns] = frame[numeric_columns].apply(pd.to_numeric).astype(float)
+    return frame
+
+
+# Kind of every stored table the dashboard reads
+def dataset_kinds():
+    from corporate_actions import CORPORATE_ACTIONS_FILE
+    from portfolio_data import FINAL_PORTFOLIO_VALUES_FILE, PORTFOLIO_VALUES_FILE, participant_file
+    from price_store import FX_RATES_FILE, UNIVERSE_FILE
+
+    kinds = {PORTFOLIO_VALUES_FILE: 'portfolio_values', FINAL_PORTFOLIO_VALUES_FILE: 'final_portfolio_values'}
+    for participant in ALLOCATIONS:
+        kinds[participant_file(participant, 'individual_stock_prices')] = 'stock_prices'
+        kinds[participant_file(participant, 'stock_daily_returns')] = 'stock_values'
+    kinds.update({UNIVERSE_FILE: 'universe', CORPORATE_ACTIONS_FILE: 'corporate_actions', FX_RATES_FILE: 'fx_rates'})
+    return kinds
+
+
+# One row per finding over every stored table. Holding values are also checked
+# against the competition calendar of the portfolio values file.
+def quality_report(kinds=None):
+    from portfolio_data import PORTFOLIO_VALUES_FILE
+
+    kinds = kinds or dataset_kinds()
+    calendar = None
+    rows = []
+    for path, kind in kinds.items():
+        try:
+            frame = pd.read_csv(path, encoding='utf-8-sig')
+        except FileNotFoundError:
+            rows.append((path, ERROR, 'missing file', ''))
+            continue
+        with open(path, 'rb') as f:
+            if f.read(3) == b'\xef\xbb\xbf':
+                rows.append((path, INFO, 'byte-order mark', "removed at ingest"))
+        original = list(frame.columns)
+        frame.columns = [normalize_name(column) for column in original]
+        renamed = [f"{old.strip()}->{new}" for old, new in zip(original, frame.columns) if old.strip() != new]
+        if renamed:
+            rows.append((path, INFO, 'names', ", ".join(renamed)))
+
+        if kind == 'stock_values' and calendar is None:
+            days = pd.read_csv(PORTFOLIO_VALUES_FILE, encoding='utf-8-sig', usecols=[0]).iloc[:, 0]
+            calendar = pd.DatetimeIndex(pd.to_datetime(days.str[:10]))
+        issues = check_frame(frame, kind, calendar if kind == 'stock_values' else None)
+        rows += [(path, severity, check, detail) for severity, check, detail in issues]
+    return pd.DataFrame(rows, columns=['File', 'Severity', 'Check', 'Detail'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check every stored table and print a data quality report.")
+    parser.add_argument('--strict', action='store_true', help="Exit with an error on warnings too")
+    args = parser.parse_args()
+
+    report = quality_report()
+    with pd.option_context('display.max_rows', None, 'display.max_colwidth', 100, 'display.width', 200):
+        print(report.to_string(index=False) if len(report) else "No issues found.")
+    failing = {ERROR, WARNING} if args.strict else {ERROR}
+    raise SystemExit(int(report['Severity'].isin(failing).any()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from portfolio_data import file_version, load_stock_values, participant_file
+
+# Upper bound on the number of bars drawn between the start and end totals
+MAX_BARS = 40
+
+# Bucket codes understood by pandas periods, from finest to coarsest
+BUCKETS = {'Daily': 'D', 'Weekly': 'W', 'Monthly': 'M', 'Quarterly': 'Q'}
+
+
+# Day-over-day changes in a holding's value inside a window, summed per bucket (chosen
+# from the changes in the window when None). Dates are sorted, so each bucket is a
+# contiguous run reduced with np.add.reduceat.
+@lru_cache(maxsize=512)
+def _stock_deltas(participant, version, stock, start_day, end_day, bucket):
+    stock_values = load_stock_values(participant)
+    dates = stock_values['Date'].to_numpy()
+    start = np.searchsorted(dates, np.datetime64(start_day), side='left')
+    end = np.searchsorted(dates, np.datetime64(end_day), side='right')
+    start = min(start, len(dates) - 1)
+    end = max(end, start + 1)
+
+    values = stock_values[stock].to_numpy(dtype=float)[start:end]
+    deltas = np.diff(values)
+    delta_dates = stock_values['Date'].iloc[start + 1:end]
+    periods = delta_dates.dt.to_period(bucket or choose_bucket(delta_dates))
+
+    if len(deltas) == 0:
+        return values[0], np.empty(0, dtype=object), deltas, values[-1]
+
+    codes = periods.to_numpy()
+    boundaries = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    bucket_deltas = np.add.reduceat(deltas, boundaries)
+    labels = periods.iloc[boundaries].dt.start_time.dt.strftime('%Y-%m-%d').to_numpy()
+    return values[0], labels, bucket_deltas, values[-1]
+
+
+# Finest bucket that draws the changes on `dates` in at most MAX_BARS bars. Only
+# dates with data count, so a long window over a short history stays daily.
+def choose_bucket(dates):
+    dates = pd.DatetimeIndex(dates)
+    for bucket in BUCKETS.values():
+        if dates.to_period(bucket).nunique() <= MAX_BARS:
+            return bucket
+    return 'Q'
+
+
+def stock_deltas(participant, stock, start_day, end_day, bucket=None):
+    version = file_version(participant_file(participant, 'stock_daily_returns'))
+    return _stock_deltas(participant, version, stock, str(start_day), str(end_day), bucket)
+
+
+# Waterfall from the holding's value at the start of the window, through each
+# bucket's change, to its value at the end
+def stock_waterfall(participant, stock, start_day, end_day, bucket=None, title=None):
+    import plotly.graph_objects as go
+
+    start_value, labels, deltas, end_value = stock_deltas(participant, stock, start_day, end_day, bucket)
+    fig = go.Figure(go.Waterfall(
+        x=['Start', *labels, 'End'],
+        y=[start_value, *deltas, end_value],
+        measure=['absolute'] + ['relative'] * len(deltas) + ['total'],
+        increasing={'marker': {'color': 'green'}},
+        decreasing={'marker': {'color': 'red'}},
+        totals={'marker': {'color': 'steelblue'}},
+        hovertemplate='%{x}: $%{y:,.2f}<extra></extra>',
+    ))
+    fig.update_layout(title=title, xaxis_title='Date', yaxis_title='Value ($)',
+                      xaxis_type='category', showlegend=False)
+    return fig
@@ -0,0 +1,57 @@
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from portfolios import ALLOCATIONS, INITIAL_INVESTMENT
+from price_store import allocation_values, load_normalized_prices, weight_vector
+
+
+# Sliders over a participant's holdings (plus any tickers added) that revalue the
+# whole history on every change. Runs as a fragment, so an edit reruns only this
+# section; the revaluation itself is a (days x tickers) @ (tickers,) product.
+@st.fragment
+def render_what_if(participant, key="what_if"):
+    days, tickers, normalized = load_normalized_prices()
+    allocation = ALLOCATIONS[participant]
+    real_values = allocation_values(weight_vector(allocation, tickers), normalized)
+
+    extra = st.multiselect("Add stocks", [ticker for ticker in tickers if ticker not in allocation],
+                           key=f"{key}_extra")
+    edited = {}
+    columns = st.columns(3)
+    for i, ticker in enumerate([*allocation, *extra]):
+        with columns[i % 3]:
+            edited[ticker] = st.slider(f"{ticker} (%)", min_value=0.0, max_value=100.0, step=0.5,
+                                       value=float(allocation.get(ticker, 0.0) * 100), key=f"{key}_{ticker}")
+
+    total = sum(edited.values())
+    if total == 0:
+        st.warning("Give at least one stock a weight.")
+        return
+    if abs(total - 100) > 1e-9:
+        st.caption(f"Weights add up to {total:.1f}%; they are rescaled to 100%.")
+    what_if = {ticker: weight / total for ticker, weight in edited.items()}
+    what_if_values = allocation_values(weight_vector(what_if, tickers), normalized)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Real Final Value ($)", f"{real_values[-1]:,.2f}")
+    with col2:
+        st.metric("What-If Final Value ($)", f"{what_if_values[-1]:,.2f}",
+                  delta=f"{what_if_values[-1] - real_values[-1]:+,.2f}")
+    with col3:
+        st.metric("What-If Growth (%)", f"{(what_if_values[-1] / INITIAL_INVESTMENT - 1) * 100:.2f}%",
+                  delta=f"{(what_if_values[-1] - real_values[-1]) / INITIAL_INVESTMENT * 100:+.2f} pts")
+
+    fig = go.Figure([
+        go.Scatter(x=days, y=real_values, name="Real allocation", mode='lines'),
+        go.Scatter(x=days, y=what_if_values, name="What-if allocation", mode='lines'),
+    ])
+    fig.update_layout(title="Real vs What-If Portfolio Value", xaxis_title="Day", yaxis_title="Portfolio Value ($)",
+                      hovermode="x unified")
+    st.plotly_chart(fig, key=f"{key}_chart")
+
+    changes = pd.DataFrame({'Real (%)': pd.Series(allocation) * 100, 'What-If (%)': pd.Series(what_if) * 100}).fillna(0)
+    changes = changes[changes['Real (%)'].round(6) != changes['What-If (%)'].round(6)]
+    if len(changes):
+        st.dataframe(changes.style.format('{:.1f}'), width='stretch')